@@ -7,4 +7,51 @@ from iconservice import *
 #  Consts
 # ================================================
 TAG = 'SpeakyTo'
-VERSION = '0.1.1'
+VERSION = '0.2.0'
+
+# Emit the storage operations counts of every external call as an eventlog
+INSTRUMENTATION_DEBUG = False
+
+# Maximum count of entities or calls requested in a single batch query
+BATCH_MAX_COUNT = 100
+
+# Maximum count of UIDs scanned in a single state export page
+EXPORT_MAX_COUNT = 500
+
+# Expansions available on the question lists
+QUESTION_INCLUDES = ['author', 'selected_answer', 'answer_count']
+
+# Readonly methods callable through multicall
+MULTICALL_METHODS = [
+    'maintenance_enabled',
+    'version',
+    'name',
+    'get_question',
+    'get_question_data',
+    'get_questions',
+    'get_questions_by_uids',
+    'get_fanout_questions',
+    'get_language_pair_questions',
+    'get_answer',
+    'get_answer_data',
+    'get_answers',
+    'get_answers_by_uids',
+    'get_pending_question_deletions',
+    'get_migration_status',
+    'get_garbage_collector_status',
+    'get_experience_contract',
+    'get_experience_settlement_mode',
+    'get_pending_experience',
+    'get_pending_experience_users',
+    'get_supported_languages',
+    'get_user_uid',
+    'get_user_account',
+    'get_user_accounts_by_uids',
+    'get_user_level',
+    'get_user_levels',
+    'get_user_experience',
+    'get_user_profile',
+    'get_claimable_rewards',
+    'get_total_claimable_rewards',
+    'get_user_questions'
+]
@@ -0,0 +1,149 @@
+from iconservice import *
+from .checks import *
+from .consts import *
+
+
+class InstrumentedDatabase:
+    """ Database proxy counting the storage operations per container type """
+
+    # First byte of the sub database prefix of each container type
+    _CONTAINERS = {
+        b'\x00': 'ArrayDB',
+        b'\x01': 'DictDB',
+        b'\x02': 'VarDB'
+    }
+
+    def __init__(self, db: IconScoreDatabase, instrumentation: 'Instrumentation', container: str = None):
+        self._db = db
+        self.instrumentation = instrumentation
+        self._container = container
+
+    @property
+    def address(self) -> Address:
+        return self._db.address
+
+    def _count(self, operation: str) -> None:
+        self.instrumentation.count(self._container or 'unknown', operation)
+
+    def get_sub_db(self, prefix: bytes) -> 'InstrumentedDatabase':
+        container = self._container or InstrumentedDatabase._CONTAINERS.get(prefix[:1], 'unknown')
+        return InstrumentedDatabase(self._db.get_sub_db(prefix), self.instrumentation, container)
+
+    def get(self, key: bytes) -> bytes:
+        self._count('get')
+        return self._db.get(key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._count('put')
+        self._db.put(key, value)
+
+    def delete(self, key: bytes) -> None:
+        self._count('delete')
+        self._db.delete(key)
+
+    def set_observer(self, observer) -> None:
+        self._db.set_observer(observer)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class InstrumentedInterface:
+    """ InterfaceScore proxy counting the inter-contract calls """
+
+    def __init__(self, interface, instrumentation: 'Instrumentation'):
+        self._interface = interface
+        self._instrumentation = instrumentation
+
+    def __getattr__(self, name: str):
+        method = getattr(self._interface, name)
+
+        def __call(*args, **kwargs):
+            self._instrumentation.count_call()
+            return method(*args, **kwargs)
+
+        return __call
+
+
+class Instrumentation:
+    """
+        Instrumentation counts the storage operations and the inter-contract calls
+        of the external calls of a SCORE. The SCORE is given `Instrumentation(db).db`
+        instead of its database : every container goes through the instrumented database,
+        including the ones built in the SCORE constructor.
+        SpeakyTo instruments itself in debug mode, where the counts are emitted as an
+        eventlog. A test runtime instruments the SCOREs it deploys, and sets a hook.
+    """
+
+    def __init__(self, db: IconScoreDatabase, hook=None):
+        self.db = InstrumentedDatabase(db, self)
+        # Callback receiving the (method, counts) of every instrumented call
+        self.hook = hook
+        self._counts = None
+
+    @staticmethod
+    def of(db: IconScoreDatabase) -> 'Instrumentation':
+        """ Returns the instrumentation of an instrumented database, None otherwise """
+        return db.instrumentation if isinstance(db, InstrumentedDatabase) else None
+
+    def start(self) -> bool:
+        """ Starts counting a call. Returns False if a call is already counted """
+        if self._counts is not None:
+            return False
+        self._counts = {
+            'VarDB': {'get': 0, 'put': 0, 'delete': 0},
+            'DictDB': {'get': 0, 'put': 0, 'delete': 0},
+            'ArrayDB': {'get': 0, 'put': 0, 'delete': 0},
+            'unknown': {'get': 0, 'put': 0, 'delete': 0},
+            'calls': 0
+        }
+        return True
+
+    def stop(self) -> dict:
+        """ Returns the counts of the call """
+        counts = self._counts
+        self._counts = None
+        return counts
+
+    def count(self, container: str, operation: str) -> None:
+        # The operations outside of the external calls, such as on_install, aren't counted
+        if self._counts is not None:
+            self._counts[container][operation] += 1
+
+    def count_call(self) -> None:
+        if self._counts is not None:
+            self._counts['calls'] += 1
+
+    def interface(self, interface) -> InstrumentedInterface:
+        return InstrumentedInterface(interface, self)
+
+
+def instrument(func):
+    """ Count the storage operations and inter-contract calls of an external method.
+        Only counted when the SCORE database is instrumented, see `Instrumentation` """
+    if not isfunction(func):
+        raise NotAFunctionError
+
+    @wraps(func)
+    def __wrapper(self: object, *args, **kwargs):
+        instrumentation = self._instrumentation
+        # Nested calls, such as multicall entries, are counted in the outermost call
+        if instrumentation is None or not instrumentation.start():
+            return func(self, *args, **kwargs)
+
+        try:
+            result = func(self, *args, **kwargs)
+        finally:
+            counts = instrumentation.stop()
+            if instrumentation.hook is not None:
+                instrumentation.hook(func.__name__, counts)
+
+        if INSTRUMENTATION_DEBUG:
+            try:
+                # readonly methods cannot emit eventlogs
+                self.InstrumentationEvent(func.__name__, json_dumps(counts))
+            except:
+                pass
+
+        return result
+    return __wrapper
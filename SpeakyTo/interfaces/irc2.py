@@ -36,3 +36,13 @@ class IRC2Interface(InterfaceScore):
     @interface
     def treasury_deposit(self, _src: Address, _value: int):
         pass
+
+    @interface
+    def treasury_batch_withdraw(self, _addresses: str, _amounts: str):
+        """ `_addresses` and `_amounts` are JSON arrays of the same length """
+        pass
+
+    @interface
+    def treasury_batch_deposit(self, _addresses: str, _amounts: str):
+        """ `_addresses` and `_amounts` are JSON arrays of the same length """
+        pass
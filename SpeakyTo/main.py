@@ -5,11 +5,18 @@ from .checks import *
 from .version import *
 from .consts import *
 from .maintenance import *
+from .migration import *
+from .instrumentation import *
 from .speakyto.user_account import *
 from .speakyto.question import *
 from .speakyto.answer import *
 from .speakyto.level import *
+from .speakyto.call_context import *
+from .speakyto.reward import *
 from .speakyto.iso_639_1 import *
+from .speakyto.export import *
+from .speakyto.migrations import *
+from .speakyto.garbage_collector import *
 from .interfaces.irc2 import *
 
 
@@ -29,24 +36,71 @@ class SpeakyTo(IconScoreBase):
     def ShowException(self, exception: str):
         pass
 
+    # The state changes are logged with the fields needed to rebuild the
+    # questions, answers and user accounts without querying them back.
+    # The data is logged as its preview and its total length, the same as
+    # the serialized entities : the rest is read by chunks.
+    @eventlog(indexed=3)
+    def QuestionCreatedEvent(self,
+                             uid: int,
+                             user_uid: int,
+                             language_pair: str,
+                             level: int,
+                             reward: int,
+                             fanout_uid: int,
+                             data: str,
+                             data_length: int):
+        pass
+
+    @eventlog(indexed=2)
+    def QuestionCancelledEvent(self, uid: int, user_uid: int, refund: int):
+        pass
+
+    @eventlog(indexed=2)
+    def QuestionDeletedEvent(self, uid: int, user_uid: int, refund: int):
+        pass
+
+    @eventlog(indexed=3)
+    def AnswerCreatedEvent(self, uid: int, question_uid: int, user_uid: int, data: str, data_length: int):
+        pass
+
+    @eventlog(indexed=3)
+    def AnswerSelectedEvent(self, uid: int, question_uid: int, user_uid: int, reward: int):
+        pass
+
+    @eventlog(indexed=2)
+    def UserAccountCreatedEvent(self, uid: int, address: Address, username: str, avatar_uid: int):
+        pass
+
     @eventlog(indexed=1)
-    def QuestionCreatedEvent(self, uid: int):
+    def UserAccountUpdatedEvent(self, uid: int, username: str, avatar_uid: int):
         pass
 
     @eventlog(indexed=1)
-    def AnswerCreatedEvent(self, uid: int):
+    def ExperienceChangedEvent(self, user_uid: int, experience: int, level: int):
         pass
 
     @eventlog(indexed=1)
-    def UserAccountCreatedEvent(self, uid: int):
+    def RewardClaimedEvent(self, user_uid: int, amount: int):
+        pass
+
+    @eventlog
+    def GarbageCollectedEvent(self, steps: int, questions: int, bytes_freed: int):
+        pass
+
+    @eventlog
+    def InstrumentationEvent(self, method: str, counts: str):
         pass
 
     # ================================================
     #  Initialization
     # ================================================
     def __init__(self, db: IconScoreDatabase) -> None:
+        if INSTRUMENTATION_DEBUG and Instrumentation.of(db) is None:
+            db = Instrumentation(db).db
         super().__init__(db)
         self._experience_contract = VarDB(f'{SpeakyTo._NAME}_EXPERIENCE_CONTRACT', db, value_type=Address)
+        self._instrumentation = Instrumentation.of(db)
 
     def on_install(self) -> None:
         super().on_install()
@@ -57,64 +111,279 @@ class SpeakyTo(IconScoreBase):
         super().on_update()
         version = Version(self.db)
 
+        # The migrations are run afterwards by the operator, see run_migrations
+        self._migration_engine().schedule(version)
         version.update(VERSION)
 
     # ================================================
     #  Migration methods
     # ================================================
+    def _migration_engine(self) -> MigrationEngine:
+        return MigrationEngine(MIGRATIONS, self.db)
+
+    def _read_repair(self, entity: str, uid: int) -> None:
+        """ Migrates an entity written before the migrations reach it : by an owner method,
+            or by a user method if the maintenance was disabled during the migrations """
+        self._migration_engine().repair(entity, uid)
 
     # ================================================
     #  Internal methods
     # ================================================
     def _do_refund_question_reward(self, question: Question) -> None:
         if question.reward() > 0:
-            question_user = UserAccount(question.user_uid(), self.db)
-            self.icx.transfer(question_user.address(), question.reward())
+            RewardLedger(self.db).credit(question.user_uid(), question.reward())
 
-    def _do_remove_experience_create_question(self, question: Question) -> None:
-        experience_interface = self._experience_interface()
-        experience_system = ExperienceSystem(experience_interface, self.db)
+    def _do_remove_experience_create_question(self, context: CallContext, question: Question) -> None:
+        experience_system = context.experience_system()
         experience_system.remove_experience(question.user_uid(), Experience.CREATE_QUESTION)
 
-    def _do_cancel_question(self, question: Question) -> None:
+    def _do_cancel_question(self, context: CallContext, question: Question) -> None:
 
         # Refund the reward (if any) to OP
         self._do_refund_question_reward(question)
         # Remove experience
-        self._do_remove_experience_create_question(question)
+        self._do_remove_experience_create_question(context, question)
 
         # Change question state
-        question.cancel()
+        question.cancel(self.now())
         UserQuestionDB(question.user_uid(), self.db).remove(question.uid())
         UserOpenedQuestionDB(question.user_uid(), self.db).remove(question.uid())
+        self.QuestionCancelledEvent(question.uid(), question.user_uid(), question.reward())
 
-    def _do_delete_question(self, question: Question) -> None:
+    def _do_delete_question(self, context: CallContext, question: Question) -> None:
 
         # Refund the reward (if any) to OP
         self._do_refund_question_reward(question)
         # Remove experience
-        self._do_remove_experience_create_question(question)
+        self._do_remove_experience_create_question(context, question)
 
-        # Delete question and all associated answers
+        # Hide the question from the listings right away
         UserQuestionDB(question.user_uid(), self.db).remove(question.uid())
         UserOpenedQuestionDB(question.user_uid(), self.db).remove(question.uid())
         QuestionDB(self.db).remove(question.uid())
-
-        answers = list(AnswerDB(question.uid(), self.db))
-        for answer_uid in answers:
-            AnswerDB(question.uid(), self.db).remove(answer_uid)
-            answer = Answer(answer_uid, self.db)
-            answer.delete()
-
-        question.delete()
-
-    def _create_question_in_databases(self, question_uid: int, user_uid: int) -> None:
+        # The questions created before the language pairs index aren't indexed
+        pair_questions = LanguagePairQuestionDB(question.from_language(), question.to_language(), self.db)
+        if pair_questions.contains(question.uid()):
+            pair_questions.remove(question.uid())
+        if question.fanout_uid():
+            fanout_questions = FanoutQuestionDB(question.fanout_uid(), self.db)
+            fanout_questions.remove(question.uid())
+            if len(fanout_questions) == 0:
+                fanout_questions.delete()
+
+        # The answers are deleted incrementally, as they may not fit in a single transaction
+        question.set_deleting()
+        self.QuestionDeletedEvent(question.uid(), question.user_uid(), question.reward())
+        QuestionDeletionQueue(self.db).append(question.uid())
+        self._do_process_question_deletions(QUESTION_DELETION_MAX_ANSWERS)
+
+    def _do_process_question_deletions(self, max_answers: int) -> int:
+        """ Delete up to `max_answers` answers of the questions pending deletion.
+            The progress is stored in the deletion queue and the answers lists,
+            so the work can be resumed in the next call.
+            Returns the count of deleted answers """
+        deletion_queue = QuestionDeletionQueue(self.db)
+        deleted = 0
+
+        while len(deletion_queue) > 0:
+            # Once all its answers have been deleted, the question is deleted too
+            if len(AnswerDB(deletion_queue.head_value(), self.db)) > 0:
+                if deleted >= max_answers:
+                    return deleted
+                deleted += 1
+            GarbageCollector.delete_pending(deletion_queue, self.db)
+
+        return deleted
+
+    def _create_question_in_databases(self,
+                                      question_uid: int,
+                                      user_uid: int,
+                                      from_language: str,
+                                      to_language: str) -> None:
         QuestionDB(self.db).append(question_uid)
+        LanguagePairQuestionDB(from_language, to_language, self.db).append(question_uid)
         UserQuestionDB(user_uid, self.db).append(question_uid)
         UserOpenedQuestionDB(user_uid, self.db).append(question_uid)
 
+    def _do_create_question(self,
+                            context: CallContext,
+                            data: str,
+                            from_language: str,
+                            to_language: str,
+                            reward: int,
+                            level: int) -> int:
+        user = context.user()
+
+        # -- Checks
+        ISO_639_1.check_valid_code(from_language)
+        ISO_639_1.check_valid_code(to_language)
+
+        # -- OK from here
+        question_uid = QuestionFactory(self.db).create(
+            user.uid(),
+            data,
+            from_language,
+            to_language,
+            reward,
+            level)
+        self.QuestionCreatedEvent(question_uid, user.uid(), f'{from_language}-{to_language}',
+                                  level, reward, 0, data[:DATA_PREVIEW_LENGTH], len(data))
+
+        self._create_question_in_databases(question_uid, user.uid(), from_language, to_language)
+
+        # Give XP to OP
+        context.experience_system().give_experience(user.uid(), Experience.CREATE_QUESTION)
+
+        return question_uid
+
+    def _log_experience_changes(self, changes: dict) -> None:
+        for user_uid, (experience, level) in changes.items():
+            self.ExperienceChangedEvent(user_uid, experience, level)
+
+    def _settle(self, context: CallContext) -> None:
+        """ Settle the experience changes of the call, and log them """
+        self._log_experience_changes(context.settle())
+
+    def _parse_batch(self, items: str) -> list:
+        items = json_loads(items)
+        if not isinstance(items, list) or len(items) > BATCH_MAX_COUNT:
+            raise InvalidCallParameters(items)
+        return items
+
+    def _parse_batch_uids(self, uids: str) -> list:
+        uids = self._parse_batch(uids)
+        for uid in uids:
+            if type(uid) != int:
+                raise InvalidCallParameters(uid)
+        return uids
+
+    def _state_export(self, count: int) -> StateExport:
+        if not 0 < count <= EXPORT_MAX_COUNT:
+            raise InvalidCallParameters(count)
+        return StateExport(ExperienceSystem(self._experience_interface(), self.db), self.block_height, self.db)
+
+    def _parse_includes(self, include: str) -> list:
+        includes = [name for name in include.split(',') if name]
+        for name in includes:
+            if name not in QUESTION_INCLUDES:
+                raise InvalidCallParameters(name)
+        return includes
+
+    def _serialize_questions(self, question_uids: list, include: str) -> list:
+        """ Serialize a page of questions with the requested expansions.
+            Every author is loaded only once per page """
+        includes = self._parse_includes(include)
+        authors = {}
+        experience_system = None
+        result = []
+
+        for question_uid in question_uids:
+            question = Question(question_uid, self.db)
+            serialized = question.serialize()
+
+            if 'author' in includes:
+                user_uid = serialized['user_uid']
+                if user_uid not in authors:
+                    if experience_system is None:
+                        experience_system = ExperienceSystem(self._experience_interface(), self.db)
+                    author = UserAccount(user_uid, self.db).serialize()
+                    author['level'] = experience_system.get_level(user_uid)
+                    authors[user_uid] = author
+                serialized['author'] = authors[user_uid]
+
+            if 'selected_answer' in includes:
+                answer_uid = serialized['answer_uid']
+                serialized['selected_answer'] = Answer(answer_uid, self.db).serialize() if answer_uid else None
+
+            if 'answer_count' in includes:
+                serialized['answer_count'] = len(AnswerDB(question_uid, self.db))
+
+            result.append(serialized)
+
+        return result
+
+    def _do_multicall_entry(self, method: str, params: dict):
+        if method not in MULTICALL_METHODS:
+            raise InvalidCallParameters(method)
+
+        function = getattr(self, method)
+        annotations = function.__annotations__
+        # Convert the parameters the same way as the JSON-RPC API
+        kwargs = {}
+        for name, value in params.items():
+            if annotations.get(name) == Address and isinstance(value, str):
+                value = Address.from_string(value)
+            elif annotations.get(name) == int and isinstance(value, str):
+                value = int(value, 0)
+            kwargs[name] = value
+
+        return function(**kwargs)
+
+    def _do_create_question_fanout(self,
+                                   context: CallContext,
+                                   data: str,
+                                   from_language: str,
+                                   to_languages: list,
+                                   reward: int,
+                                   level: int) -> list:
+        user = context.user()
+
+        # -- Checks
+        ISO_639_1.check_valid_code(from_language)
+        for to_language in to_languages:
+            ISO_639_1.check_valid_code(to_language)
+
+        # -- OK from here
+        question_uids = QuestionFactory(self.db).create_fanout(
+            user.uid(),
+            data,
+            from_language,
+            to_languages,
+            reward,
+            level)
+
+        fanout_questions = FanoutQuestionDB(question_uids[0], self.db)
+        for question_uid, to_language in zip(question_uids, to_languages):
+            self.QuestionCreatedEvent(question_uid, user.uid(), f'{from_language}-{to_language}',
+                                      level, reward, question_uids[0], data[:DATA_PREVIEW_LENGTH], len(data))
+            self._create_question_in_databases(question_uid, user.uid(), from_language, to_language)
+            fanout_questions.append(question_uid)
+            # Give XP to OP
+            context.experience_system().give_experience(user.uid(), Experience.CREATE_QUESTION)
+
+        return question_uids
+
+    def _check_can_create_questions(self, context: CallContext, required_level: int, count: int) -> None:
+        level_system = context.level_system()
+        level_system.check_can_create_question(context.user_uid(), context.level(), required_level, count)
+
+    def _parse_question_item(self, item: dict) -> tuple:
+        """ Returns the (level, data, from_language, to_language, reward) of a question of a batch """
+        if not isinstance(item, dict):
+            raise InvalidCallParameters(item)
+
+        level, data = item.get('level'), item.get('data')
+        from_language, to_language = item.get('from_language'), item.get('to_language')
+        reward = item.get('reward', 0)
+        if isinstance(reward, str):
+            reward = int(reward, 0)
+
+        if (type(level) != int or type(reward) != int or reward < 0 or
+                not isinstance(data, str) or
+                not isinstance(from_language, str) or
+                not isinstance(to_language, str)):
+            raise InvalidCallParameters(item)
+
+        return level, data, from_language, to_language, reward
+
     def _experience_interface(self):
-        return self.create_interface_score(self._experience_contract.get(), IRC2Interface)
+        interface = self.create_interface_score(self._experience_contract.get(), IRC2Interface)
+        if self._instrumentation is not None:
+            return self._instrumentation.interface(interface)
+        return interface
+
+    def _call_context(self) -> CallContext:
+        return CallContext(self.db, self.msg.sender, self._experience_interface)
 
     # ================================================
     #  Checks
@@ -124,6 +393,7 @@ class SpeakyTo(IconScoreBase):
     #  External methods (write access)
     # ================================================
     @catch_error
+    @instrument
     @check_maintenance
     @external
     @payable
@@ -136,187 +406,161 @@ class SpeakyTo(IconScoreBase):
         # -- OK from here
         user_uid = UserAccountFactory(self.db).create(user_address, avatar_uid, username)
         UserAccounts(self.db).add(user_uid, self.msg.sender)
+        # A new account starts without experience : no need to read the token balance
+        ExperienceSystem(None, self.db).add_user(user_uid)
 
-        self.UserAccountCreatedEvent(user_uid)
+        self.UserAccountCreatedEvent(user_uid, user_address, username, avatar_uid)
 
     @catch_error
+    @instrument
     @check_maintenance
     @external
     @payable
     def create_question_level1(self, data: str, from_language: str, to_language: str) -> None:
         """ How To Say ... from ... in ... ? """
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
-        user = UserAccount(user_uid, self.db)
-        reward = self.msg.value
-        experience_interface = self._experience_interface()
+        context = self._call_context()
 
         # -- Checks
-        level_system = LevelSystem(experience_interface, self.db)
-        level_system.check_can_create_question(user.uid(), 1)
         Question.check_level1_data(data)
-        ISO_639_1.check_valid_code(from_language)
-        ISO_639_1.check_valid_code(to_language)
+        self._check_can_create_questions(context, 1, 1)
 
         # -- OK from here
-        question_uid = QuestionFactory(self.db).create(
-            user.uid(),
-            data,
-            from_language,
-            to_language,
-            reward,
-            1)
-        self.QuestionCreatedEvent(question_uid)
-
-        self._create_question_in_databases(question_uid, user.uid())
-
-        # Give XP to OP
-        experience_system = ExperienceSystem(experience_interface, self.db)
-        experience_system.give_experience(user.uid(), Experience.CREATE_QUESTION)
+        self._do_create_question(context, data, from_language, to_language, self.msg.value, 1)
+        self._settle(context)
 
     @catch_error
+    @instrument
     @check_maintenance
     @external
     @payable
     def create_question_level2(self, data: str, from_language: str, to_language: str) -> None:
         """ What does ... means from ... in ... ? """
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
-        user = UserAccount(user_uid, self.db)
-        reward = self.msg.value
-        experience_interface = self._experience_interface()
+        context = self._call_context()
 
         # -- Checks
-        level_system = LevelSystem(experience_interface, self.db)
-        level_system.check_can_create_question(user.uid(), 2)
         Question.check_level2_data(data)
-        ISO_639_1.check_valid_code(from_language)
-        ISO_639_1.check_valid_code(to_language)
+        self._check_can_create_questions(context, 2, 1)
 
         # -- OK from here
-        question_uid = QuestionFactory(self.db).create(
-            user.uid(),
-            data,
-            from_language,
-            to_language,
-            reward,
-            2)
-        self.QuestionCreatedEvent(question_uid)
-
-        self._create_question_in_databases(question_uid, user.uid())
-
-        # Give XP to OP
-        experience_system = ExperienceSystem(experience_interface, self.db)
-        experience_system.give_experience(user.uid(), Experience.CREATE_QUESTION)
+        self._do_create_question(context, data, from_language, to_language, self.msg.value, 2)
+        self._settle(context)
 
     @catch_error
+    @instrument
     @check_maintenance
     @external
     @payable
     def create_question_level3(self, data: str, from_language: str, to_language: str) -> None:
         """ What's the difference between ... and ... in ... ? """
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
-        user = UserAccount(user_uid, self.db)
-        reward = self.msg.value
-        experience_interface = self._experience_interface()
+        context = self._call_context()
 
         # -- Checks
-        level_system = LevelSystem(experience_interface, self.db)
-        level_system.check_can_create_question(user.uid(), 3)
         Question.check_level3_data(data)
-        ISO_639_1.check_valid_code(from_language)
-        ISO_639_1.check_valid_code(to_language)
+        self._check_can_create_questions(context, 3, 1)
 
         # -- OK from here
-        question_uid = QuestionFactory(self.db).create(
-            user.uid(),
-            data,
-            from_language,
-            to_language,
-            reward,
-            3)
-        self.QuestionCreatedEvent(question_uid)
-
-        self._create_question_in_databases(question_uid, user.uid())
-
-        # Give XP to OP
-        experience_system = ExperienceSystem(experience_interface, self.db)
-        experience_system.give_experience(user.uid(), Experience.CREATE_QUESTION)
+        self._do_create_question(context, data, from_language, to_language, self.msg.value, 3)
+        self._settle(context)
 
     @catch_error
+    @instrument
     @check_maintenance
     @external
     @payable
     def create_question_level4(self, data: str, from_language: str, to_language: str) -> None:
         """ Show me an example (from ... in ...) """
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
-        user = UserAccount(user_uid, self.db)
-        reward = self.msg.value
-        experience_interface = self._experience_interface()
+        context = self._call_context()
 
         # -- Checks
-        level_system = LevelSystem(experience_interface, self.db)
-        level_system.check_can_create_question(user.uid(), 4)
         Question.check_level4_data(data)
-        ISO_639_1.check_valid_code(from_language)
-        ISO_639_1.check_valid_code(to_language)
+        self._check_can_create_questions(context, 4, 1)
 
         # -- OK from here
-        question_uid = QuestionFactory(self.db).create(
-            user.uid(),
-            data,
-            from_language,
-            to_language,
-            reward,
-            4)
-        self.QuestionCreatedEvent(question_uid)
-
-        self._create_question_in_databases(question_uid, user.uid())
-
-        # Give XP to OP
-        experience_system = ExperienceSystem(experience_interface, self.db)
-        experience_system.give_experience(user.uid(), Experience.CREATE_QUESTION)
+        self._do_create_question(context, data, from_language, to_language, self.msg.value, 4)
+        self._settle(context)
 
     @catch_error
+    @instrument
     @check_maintenance
     @external
     @payable
     def create_question_level5(self, data: str, from_language: str, to_language: str) -> None:
         """ Ask me anything (from ... in ...) """
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
-        user = UserAccount(user_uid, self.db)
-        reward = self.msg.value
-        experience_interface = self._experience_interface()
+        context = self._call_context()
 
         # -- Checks
-        level_system = LevelSystem(experience_interface, self.db)
-        level_system.check_can_create_question(user.uid(), 5)
         Question.check_level5_data(data)
-        ISO_639_1.check_valid_code(from_language)
-        ISO_639_1.check_valid_code(to_language)
+        self._check_can_create_questions(context, 5, 1)
 
         # -- OK from here
-        question_uid = QuestionFactory(self.db).create(
-            user.uid(),
-            data,
-            from_language,
-            to_language,
-            reward,
-            5)
-        self.QuestionCreatedEvent(question_uid)
+        self._do_create_question(context, data, from_language, to_language, self.msg.value, 5)
+        self._settle(context)
+
+    @catch_error
+    @instrument
+    @check_maintenance
+    @external
+    @payable
+    def create_questions(self, items: str) -> None:
+        """ Create several questions of any level at once.
+            `items` is a JSON array of questions, such as
+            [{"level": 1, "data": "...", "from_language": "en", "to_language": "fr", "reward": "0x0"}]
+            The rewards are optional, and their sum must be equal to the ICX sent """
+        context = self._call_context()
+        items = [self._parse_question_item(item) for item in self._parse_batch(items)]
 
-        self._create_question_in_databases(question_uid, user.uid())
+        # -- Checks
+        if len(items) == 0:
+            raise InvalidCallParameters(items)
 
-        # Give XP to OP
-        experience_system = ExperienceSystem(experience_interface, self.db)
-        experience_system.give_experience(user.uid(), Experience.CREATE_QUESTION)
+        for level, data, from_language, to_language, reward in items:
+            Question.check_data(level, data)
+
+        if sum(item[4] for item in items) != self.msg.value:
+            raise InvalidCallParameters(self.msg.value)
+
+        self._check_can_create_questions(context, max(item[0] for item in items), len(items))
+
+        # -- OK from here
+        for level, data, from_language, to_language, reward in items:
+            self._do_create_question(context, data, from_language, to_language, reward, level)
+        self._settle(context)
+
+    @catch_error
+    @instrument
+    @check_maintenance
+    @external
+    @payable
+    def create_question_fanout(self, level: int, data: str, from_language: str, to_languages: str) -> None:
+        """ Ask the same question in several target languages.
+            `to_languages` is a JSON array of language codes.
+            The data is stored once, and each target language gets its own question,
+            with its own answers. The ICX sent is split evenly between them """
+        context = self._call_context()
+        to_languages = self._parse_batch(to_languages)
+
+        # -- Checks
+        if len(to_languages) == 0 or len(set(to_languages)) != len(to_languages):
+            raise InvalidCallParameters(to_languages)
+        if self.msg.value % len(to_languages) != 0:
+            raise InvalidCallParameters(self.msg.value)
+
+        Question.check_data(level, data)
+        self._check_can_create_questions(context, level, len(to_languages))
+
+        # -- OK from here
+        reward = self.msg.value // len(to_languages)
+        self._do_create_question_fanout(context, data, from_language, to_languages, reward, level)
+        self._settle(context)
 
     @catch_error
+    @instrument
     @check_maintenance
     @external
     def answer_question(self, question_uid: int, data: str) -> None:
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
-        user = UserAccount(user_uid, self.db)
+        context = self._call_context()
+        user = context.user()
         question = Question(question_uid, self.db)
-        experience_interface = self._experience_interface()
 
         # -- Checks
         user.check_answer_cooldown(self.now())
@@ -327,7 +571,7 @@ class SpeakyTo(IconScoreBase):
             user.uid(),
             question_uid,
             data)
-        self.AnswerCreatedEvent(answer_uid)
+        self.AnswerCreatedEvent(answer_uid, question_uid, user.uid(), data[:DATA_PREVIEW_LENGTH], len(data))
 
         answers = AnswerDB(question_uid, self.db)
         answers.append(answer_uid)
@@ -336,46 +580,52 @@ class SpeakyTo(IconScoreBase):
         user.set_last_answer_timestamp(self.now())
 
         # Give XP to answer poster
-        experience_system = ExperienceSystem(experience_interface, self.db)
+        experience_system = context.experience_system()
         experience_system.give_experience(user.uid(), Experience.ANSWER_QUESTION)
+        self._settle(context)
 
     @catch_error
+    @instrument
     @check_maintenance
     @external
     def select_answer(self, answer_uid: int) -> None:
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
-        user = UserAccount(user_uid, self.db)
+        context = self._call_context()
+        user = context.user()
         answer = Answer(answer_uid, self.db)
         question = Question(answer.question_uid(), self.db)
-        experience_interface = self._experience_interface()
 
         # -- Checks
         question.check_opened()
         question.check_is_op(user.uid())
 
         # -- OK from here
+        self._read_repair('answer', answer_uid)
+        self._read_repair('question', question.uid())
         # Set the question as answered
         question.select_answer(answer_uid)
         UserOpenedQuestionDB(question.user_uid(), self.db).remove(question.uid())
+        self.AnswerSelectedEvent(answer_uid, question.uid(), answer.user_uid(), question.reward())
 
         # Give XP to OP and answer poster
-        experience_system = ExperienceSystem(experience_interface, self.db)
+        experience_system = context.experience_system()
         experience_system.give_experience(user.uid(), Experience.SELECT_ANSWER)
         experience_system.give_experience(answer.user_uid(), Experience.ANSWER_SELECTED)
 
-        # Send ICX reward if any
+        # Credit the ICX reward if any
         if question.reward() > 0:
-            answer_user = UserAccount(answer.user_uid(), self.db)
-            self.icx.transfer(answer_user.address(), question.reward())
+            RewardLedger(self.db).credit(answer.user_uid(), question.reward())
             # Bonus XP
             experience_system.give_experience(user.uid(), Experience.SELECT_ANSWER_BONUS_REWARD)
 
+        self._settle(context)
+
     @catch_error
+    @instrument
     @check_maintenance
     @external
     def cancel_question(self, question_uid: int) -> None:
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
-        user = UserAccount(user_uid, self.db)
+        context = self._call_context()
+        user = context.user()
         question = Question(question_uid, self.db)
 
         # -- Checks
@@ -384,28 +634,52 @@ class SpeakyTo(IconScoreBase):
         AnswerDB(question_uid, self.db).check_empty()
 
         # -- OK from here
-        self._do_cancel_question(question)
+        self._read_repair('question', question_uid)
+        self._do_cancel_question(context, question)
+        self._settle(context)
+
+    @catch_error
+    @instrument
+    @check_maintenance
+    @external
+    def claim_rewards(self) -> None:
+        """ Withdraw the ICX rewards and refunds credited to the sender """
+        context = self._call_context()
+        ledger = RewardLedger(self.db)
+
+        # -- Checks
+        ledger.check_claimable(context.user_uid())
+
+        # -- OK from here
+        amount = ledger.claim(context.user_uid())
+        self.icx.transfer(context.sender(), amount)
+        self.RewardClaimedEvent(context.user_uid(), amount)
 
     @payable
     def fallback(self):
         pass
 
     @catch_error
-    @check_maintenance
+    @instrument
     @external
     def tokenFallback(self, _from: Address, _value: int, _data: bytes) -> None:
-        pass
+        # The experience deposited back to the treasury is settled by the owner
+        # calls allowed during the maintenance : only the other tokens are refused
+        if self.msg.sender != self._experience_contract.get() and SCOREMaintenance(self.db).is_enabled():
+            raise SCOREInMaintenanceException
 
     # ================================================
     #  External methods (readonly)
     # ================================================
     # --- Meta methods
     @catch_error
+    @instrument
     @external(readonly=True)
     def maintenance_enabled(self) -> bool:
         return SCOREMaintenance(self.db).is_enabled()
 
     @catch_error
+    @instrument
     @external(readonly=True)
     def version(self) -> str:
         return Version(self.db).get()
@@ -414,29 +688,97 @@ class SpeakyTo(IconScoreBase):
     def name(self) -> str:
         return SpeakyTo._NAME
 
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def multicall(self, calls: str) -> list:
+        """ `calls` is a JSON array of [method, params] entries, such as
+            [["get_question", {"question_uid": "0x1"}], ["get_answers", {"question_uid": 1, "offset": 0}]]
+            Every entry returns either {"result": ...} or {"error": ...} """
+        results = []
+
+        for call in self._parse_batch(calls):
+            try:
+                method, params = call
+                results.append({'result': self._do_multicall_entry(method, params)})
+            except IconScoreException as e:
+                results.append({'error': e.message})
+            except Exception as e:
+                results.append({'error': repr(e)})
+
+        return results
+
     # ========= App methods =========
     # ------ Q&A System ------
     @catch_error
+    @instrument
     @external(readonly=True)
     def get_question(self, question_uid: int) -> dict:
         question = Question(question_uid, self.db)
         return question.serialize()
 
     @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_question_data(self, question_uid: int, chunk: int) -> str:
+        question = Question(question_uid, self.db)
+        return question.data_chunk(chunk)
+
+    @catch_error
+    @instrument
     @external(readonly=True)
-    def get_questions(self, offset: int) -> list:
+    def get_questions(self, offset: int, include: str = '') -> list:
+        """ `include` is a comma separated list of expansions : author, selected_answer, answer_count """
+        return self._serialize_questions(QuestionDB(self.db).select(offset), include)
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_questions_by_uids(self, uids: str, include: str = '') -> list:
+        """ `uids` is a JSON array of question UIDs """
+        return self._serialize_questions(self._parse_batch_uids(uids), include)
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_fanout_questions(self, question_uid: int) -> list:
+        """ Returns the questions of the fan-out of a given question """
+        fanout_uid = Question(question_uid, self.db).fanout_uid()
+        if not fanout_uid:
+            return [Question(question_uid, self.db).serialize()]
         return [
-            Question(question_uid, self.db).serialize()
-            for question_uid in QuestionDB(self.db).select(offset)
+            Question(uid, self.db).serialize()
+            for uid in FanoutQuestionDB(fanout_uid, self.db).select(0)
         ]
 
     @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_language_pair_questions(self,
+                                    from_language: str,
+                                    to_language: str,
+                                    offset: int,
+                                    include: str = '') -> list:
+        """ `include` is a comma separated list of expansions : author, selected_answer, answer_count """
+        question_uids = LanguagePairQuestionDB(from_language, to_language, self.db).select(offset)
+        return self._serialize_questions(question_uids, include)
+
+    @catch_error
+    @instrument
     @external(readonly=True)
     def get_answer(self, answer_uid: int) -> dict:
         answer = Answer(answer_uid, self.db)
         return answer.serialize()
 
     @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_answer_data(self, answer_uid: int, chunk: int) -> str:
+        answer = Answer(answer_uid, self.db)
+        return answer.data_chunk(chunk)
+
+    @catch_error
+    @instrument
     @external(readonly=True)
     def get_answers(self, question_uid: int, offset: int) -> list:
         return [
@@ -445,74 +787,232 @@ class SpeakyTo(IconScoreBase):
         ]
 
     @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_answers_by_uids(self, uids: str) -> list:
+        """ `uids` is a JSON array of answer UIDs """
+        return [
+            Answer(answer_uid, self.db).serialize()
+            for answer_uid in self._parse_batch_uids(uids)
+        ]
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_pending_question_deletions(self, offset: int) -> list:
+        return QuestionDeletionQueue(self.db).select(offset)
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_garbage_collector_status(self) -> dict:
+        return GarbageCollector(self.db).status()
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_migration_status(self) -> dict:
+        return self._migration_engine().status()
+
+    @catch_error
+    @instrument
     @external(readonly=True)
     def get_experience_contract(self) -> Address:
         return self._experience_contract.get()
 
     @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_experience_settlement_mode(self) -> int:
+        return ExperienceSystem(self._experience_interface(), self.db).get_mode()
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_pending_experience(self, user_uid: int) -> int:
+        return ExperienceSystem(self._experience_interface(), self.db).get_pending(user_uid)
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_pending_experience_users(self, offset: int) -> list:
+        return ExperiencePendingQueue(self.db).select(offset)
+
+    @catch_error
+    @instrument
     @external(readonly=True)
     def get_supported_languages(self) -> list:
         return ISO_639_1.supported_languages
 
     @catch_error
+    @instrument
     @external(readonly=True)
     def get_user_uid(self, user_address: Address) -> int:
         return UserAccounts(self.db).get_user_uid(user_address)
 
     # ------ User System ------
     @catch_error
+    @instrument
     @external
     def set_user_avatar(self, avatar_uid: int) -> None:
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
+        context = self._call_context()
 
         # -- Checks
         UserAccount.check_avatar(avatar_uid)
         # -- OK from here
-        user = UserAccount(user_uid, self.db)
+        user = context.user()
         user.set_avatar(avatar_uid)
+        self.UserAccountUpdatedEvent(user.uid(), user.username(), avatar_uid)
 
     @catch_error
+    @instrument
     @external
     def set_user_username(self, username: str) -> None:
-        user_uid = UserAccounts(self.db).get_user_uid(self.msg.sender)
+        context = self._call_context()
 
         # -- Checks
         UserAccount.check_username(username)
 
         # -- OK from here
-        user = UserAccount(user_uid, self.db)
+        user = context.user()
         user.set_username(username)
+        self.UserAccountUpdatedEvent(user.uid(), username, user.avatar_uid())
 
     @catch_error
+    @instrument
     @external(readonly=True)
     def get_user_account(self, user_uid: int) -> dict:
         user = UserAccount(user_uid, self.db)
         return user.serialize()
 
     @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_user_accounts_by_uids(self, uids: str) -> list:
+        """ `uids` is a JSON array of user UIDs """
+        return [
+            UserAccount(user_uid, self.db).serialize()
+            for user_uid in self._parse_batch_uids(uids)
+        ]
+
+    @catch_error
+    @instrument
     @external(readonly=True)
     def get_user_level(self, user_uid: int) -> int:
         experience_system = ExperienceSystem(self._experience_interface(), self.db)
         return experience_system.get_level(user_uid)
 
     @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_user_levels(self, uids: str) -> list:
+        """ `uids` is a JSON array of user UIDs """
+        experience_system = ExperienceSystem(self._experience_interface(), self.db)
+        return [
+            experience_system.get_level(user_uid)
+            for user_uid in self._parse_batch_uids(uids)
+        ]
+
+    @catch_error
+    @instrument
     @external(readonly=True)
     def get_user_experience(self, user_uid: int) -> int:
         experience_system = ExperienceSystem(self._experience_interface(), self.db)
         return experience_system.get_experience(user_uid)
 
     @catch_error
+    @instrument
     @external(readonly=True)
-    def get_user_questions(self, user_uid: int, offset: int) -> list:
-        return [
-            Question(question_uid, self.db).serialize()
-            for question_uid in UserQuestionDB(user_uid, self.db).select(offset)
-        ]
+    def get_claimable_rewards(self, user_uid: int) -> int:
+        return RewardLedger(self.db).balance(user_uid)
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_total_claimable_rewards(self) -> int:
+        return RewardLedger(self.db).total()
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_user_profile(self, user_uid: int) -> dict:
+        """ Returns the account, the experience and the questions of a user in a single query.
+            The questions are sorted from the most recent """
+        account = UserAccount(user_uid, self.db).serialize()
+        experience_system = ExperienceSystem(self._experience_interface(), self.db)
+        experience = experience_system.get_experience(user_uid)
+        questions = UserQuestionDB(user_uid, self.db)
+        questions_count = len(questions)
+        opened_questions_count = len(UserOpenedQuestionDB(user_uid, self.db))
+
+        return {
+            'account': account,
+            'experience': experience,
+            'level': experience_system.get_level(user_uid),
+            'questions_count': questions_count,
+            'opened_questions_count': opened_questions_count,
+            'answered_questions_count': questions_count - opened_questions_count,
+            'claimable_rewards': RewardLedger(self.db).balance(user_uid),
+            'questions': [
+                Question(question_uid, self.db).serialize()
+                for question_uid in questions.select_reversed(0)
+            ]
+        }
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def get_user_questions(self, user_uid: int, offset: int, include: str = '') -> list:
+        """ `include` is a comma separated list of expansions : author, selected_answer, answer_count """
+        return self._serialize_questions(UserQuestionDB(user_uid, self.db).select(offset), include)
+
+    # ------ State Export ------
+    # The entities are scanned by UID : `cursor` is the last UID of the previous page (0 to start),
+    # the export is complete once the `cursor` of a page reaches its `last_uid`
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def export_users(self, cursor: int, count: int) -> dict:
+        return self._state_export(count).users(cursor, count)
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def export_questions(self, cursor: int, count: int) -> dict:
+        return self._state_export(count).questions(cursor, count)
+
+    @catch_error
+    @instrument
+    @external(readonly=True)
+    def export_answers(self, cursor: int, count: int) -> dict:
+        return self._state_export(count).answers(cursor, count)
 
     # ================================================
     #  Operator methods
     # ================================================
     @catch_error
+    @instrument
+    @external
+    @only_owner
+    def collect_garbage(self, max_steps: int) -> None:
+        """ Walks up to `max_steps` entities, and reclaims the storage of the expired ones """
+        report = GarbageCollector(self.db).sweep(max_steps, self.now())
+
+        # The questions reclaimed leave the lists, as the deleted ones
+        for question_uid, user_uid in report['purged']:
+            self.QuestionDeletedEvent(question_uid, user_uid, 0)
+        self.GarbageCollectedEvent(report['steps'], len(report['purged']), report['bytes_freed'])
+
+    @catch_error
+    @instrument
+    @external
+    @only_owner
+    def run_migrations(self, max_items: int) -> None:
+        """ Migrates up to `max_items` entities, the maintenance ends with the last migration """
+        self._migration_engine().run(max_items)
+
+    @catch_error
+    @instrument
     @external
     @only_owner
     def set_maintenance_mode(self, mode: int) -> None:
@@ -522,22 +1022,64 @@ class SpeakyTo(IconScoreBase):
             SCOREMaintenance(self.db).disable()
 
     @catch_error
+    @instrument
     @external
     @only_owner
     def admin_cancel_question(self, question_uid: int) -> None:
         question = Question(question_uid, self.db)
         question.check_initialized()
-        self._do_cancel_question(question)
+        question.check_not_deleting()
+        context = self._call_context()
+        self._read_repair('question', question_uid)
+        self._do_cancel_question(context, question)
+        self._settle(context)
 
     @catch_error
+    @instrument
     @external
     @only_owner
     def admin_delete_question(self, question_uid: int) -> None:
         question = Question(question_uid, self.db)
         question.check_initialized()
-        self._do_delete_question(question)
+        question.check_not_deleting()
+        context = self._call_context()
+        self._do_delete_question(context, question)
+        self._settle(context)
+
+    @catch_error
+    @instrument
+    @external
+    @only_owner
+    def process_question_deletions(self, max_answers: int) -> None:
+        self._do_process_question_deletions(max_answers)
+
+    @catch_error
+    @instrument
+    @external
+    @only_owner
+    def reconcile_experience(self, max_users: int) -> None:
+        experience_system = ExperienceSystem(self._experience_interface(), self.db)
+        experience_system.reconcile(max_users)
+        self._log_experience_changes(experience_system.pop_changes())
+
+    @catch_error
+    @instrument
+    @external
+    @only_owner
+    def set_experience_settlement_mode(self, mode: int) -> None:
+        experience_system = ExperienceSystem(self._experience_interface(), self.db)
+        experience_system.set_mode(mode)
+
+    @catch_error
+    @instrument
+    @external
+    @only_owner
+    def flush_experience(self, max_users: int) -> None:
+        experience_system = ExperienceSystem(self._experience_interface(), self.db)
+        experience_system.flush(max_users)
 
     @catch_error
+    @instrument
     @external
     @only_owner
     def set_experience_contract(self, address: Address) -> None:
@@ -0,0 +1,159 @@
+from iconservice import *
+from .maintenance import *
+from .version import *
+
+
+class MigrationNotFound(Exception):
+    pass
+
+
+class Migration(ABC):
+    """ A storage layout change, applied to the entities one UID at a time.
+        The entities created after the update already use the new layout, and
+        `migrate` may be called more than once for an entity : it must be idempotent. """
+
+    # Applied by the updates from a version less than TARGET_VERSION
+    NAME = ''
+    TARGET_VERSION = ''
+    # Kind of entity migrated, for the read-repair
+    ENTITY = ''
+
+    def __init__(self, db: IconScoreDatabase):
+        self._db = db
+
+    @abstractmethod
+    def last_uid(self) -> int:
+        """ Highest UID of the entities to migrate """
+        pass
+
+    @abstractmethod
+    def migrate(self, uid: int) -> None:
+        pass
+
+
+class MigrationEngine(object):
+    """
+        Runs the migrations scheduled by an update in bounded batches, resumed across
+        operator calls. The SCORE stays in maintenance until every migration is done,
+        then the previous maintenance mode is restored.
+
+        The entities not reached yet must stay readable with the previous layout.
+        The maintenance blocks the user methods, so the entities are written ahead of
+        the batches by the owner methods (admin_cancel_question), or by the user methods
+        if the operator ends the maintenance before the migrations : these write paths
+        repair the entities they touch.
+    """
+
+    # ================================================
+    #  DB Variables
+    # ================================================
+    _NAME = 'MIGRATION_ENGINE'
+
+    # ================================================
+    #  Private Methods
+    # ================================================
+    def __init__(self, migrations: list, db: IconScoreDatabase):
+        self._name = MigrationEngine._NAME
+        self._migrations = {migration.NAME: migration for migration in migrations}
+        # Pending migrations, as a JSON list of [name, last uid], the first one being in progress
+        self._queue = VarDB(f'{self._name}_QUEUE', db, value_type=str)
+        # Last UID migrated by the migration in progress
+        self._cursor = VarDB(f'{self._name}_CURSOR', db, value_type=int)
+        self._maintenance_enabled = VarDB(f'{self._name}_MAINTENANCE_ENABLED', db, value_type=bool)
+        self._db = db
+
+    def _load_queue(self) -> list:
+        queue = self._queue.get()
+        return json_loads(queue) if queue else []
+
+    def _save_queue(self, queue: list) -> None:
+        if queue:
+            self._queue.set(json_dumps(queue))
+        else:
+            self._queue.remove()
+
+    def _migration(self, name: str) -> Migration:
+        if name not in self._migrations:
+            raise MigrationNotFound(self._name, name)
+        return self._migrations[name](self._db)
+
+    def _finish(self) -> None:
+        self._cursor.remove()
+        if not self._maintenance_enabled.get():
+            SCOREMaintenance(self._db).disable()
+        self._maintenance_enabled.remove()
+
+    # ================================================
+    #  Public Methods
+    # ================================================
+    def schedule(self, version: Version) -> list:
+        """ Queues the migrations needed by an update from the stored version,
+            and enables the maintenance. Returns the names of the scheduled migrations """
+        queue = self._load_queue()
+        queued = [name for name, _ in queue]
+        scheduled = []
+
+        for name, migration in self._migrations.items():
+            if name in queued or not version.is_less_than_target_version(migration.TARGET_VERSION):
+                continue
+            queue.append([name, migration(self._db).last_uid()])
+            scheduled.append(name)
+
+        if not scheduled:
+            return scheduled
+
+        maintenance = SCOREMaintenance(self._db)
+        if not queued:
+            self._maintenance_enabled.set(maintenance.is_enabled())
+        maintenance.enable()
+        self._save_queue(queue)
+        return scheduled
+
+    def is_running(self) -> bool:
+        return bool(self._queue.get())
+
+    def run(self, max_items: int) -> int:
+        """ Migrates up to `max_items` entities, returns the count of entities migrated """
+        queue = self._load_queue()
+        if not queue:
+            return 0
+
+        processed = 0
+        cursor = self._cursor.get()
+        while queue and processed < max_items:
+            name, last_uid = queue[0]
+            migration = self._migration(name)
+            while cursor < last_uid and processed < max_items:
+                cursor += 1
+                migration.migrate(cursor)
+                processed += 1
+
+            if cursor >= last_uid:
+                queue.pop(0)
+                cursor = 0
+
+        self._cursor.set(cursor)
+        self._save_queue(queue)
+        if not queue:
+            self._finish()
+        return processed
+
+    def is_pending(self, name: str, uid: int) -> bool:
+        """ Returns True if the migration hasn't reached the entity yet """
+        for index, (queued, last_uid) in enumerate(self._load_queue()):
+            if queued == name:
+                return uid <= last_uid and (index > 0 or uid > self._cursor.get())
+        return False
+
+    def repair(self, entity: str, uid: int) -> None:
+        """ Migrates an entity ahead of the batches """
+        for name, _ in self._load_queue():
+            migration = self._migration(name)
+            if migration.ENTITY == entity and self.is_pending(name, uid):
+                migration.migrate(uid)
+
+    def status(self) -> dict:
+        return {
+            'pending': [{'name': name, 'last_uid': last_uid} for name, last_uid in self._load_queue()],
+            'cursor': self._cursor.get()
+        }
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 ICONation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from iconservice import *
+from .codec import *
+from .consts import *
+
+
+class BlobChunkNotFound(Exception):
+    pass
+
+
+class BlobDB:
+    """
+    BlobDB stores a string of any size split into fixed-size chunks,
+    so it can be read by ranges without loading the whole string.
+    Each chunk is encoded separately, so large chunks are compressed.
+    An empty blob is made of a single empty chunk.
+    """
+
+    _NAME = '_BLOBDB'
+
+    def __init__(self, var_key: str, db: IconScoreDatabase, chunk_size: int = BLOB_CHUNK_SIZE):
+        self._name = var_key + BlobDB._NAME
+        self._length = VarDB(f'{self._name}_length', db, value_type=int)
+        self._chunks = DictDB(f'{self._name}_chunks', db, value_type=bytes)
+        self._chunk_size = chunk_size
+        self._db = db
+
+    def __len__(self) -> int:
+        return self._length.get()
+
+    @staticmethod
+    def split_count(length: int, chunk_size: int = BLOB_CHUNK_SIZE) -> int:
+        """ Returns the number of chunks of a string of a given length """
+        return max(1, (length + chunk_size - 1) // chunk_size)
+
+    @staticmethod
+    def split_chunk(value: str, index: int, chunk_size: int = BLOB_CHUNK_SIZE) -> str:
+        """ Returns a given chunk of a string, as if it was stored in a BlobDB """
+        if not (0 <= index < BlobDB.split_count(len(value), chunk_size)):
+            raise BlobChunkNotFound(index)
+        return value[index * chunk_size:(index + 1) * chunk_size]
+
+    def chunks_count(self) -> int:
+        """ Returns the number of chunks of the blob """
+        return BlobDB.split_count(self._length.get(), self._chunk_size)
+
+    def chunk(self, index: int) -> str:
+        """ Returns the content of a given chunk """
+        if not (0 <= index < self.chunks_count()):
+            raise BlobChunkNotFound(self._name, index)
+        return PayloadCodec.decode(self._chunks[index])
+
+    def preview(self, length: int) -> str:
+        """ Returns the beginning of the blob, up to the chunk size """
+        return self.chunk(0)[:length]
+
+    def get(self) -> str:
+        """ Returns the whole content of the blob """
+        return ''.join([
+            PayloadCodec.decode(self._chunks[index])
+            for index in range(self.chunks_count())
+        ])
+
+    def set(self, value: str) -> None:
+        """ Replaces the content of the blob """
+        previous_count = self.chunks_count()
+        count = BlobDB.split_count(len(value), self._chunk_size)
+
+        for index in range(count):
+            chunk = BlobDB.split_chunk(value, index, self._chunk_size)
+            if chunk:
+                self._chunks[index] = PayloadCodec.encode(chunk)
+            else:
+                self._chunks.remove(index)
+
+        # Remove the chunks remaining from a longer previous content
+        for index in range(count, previous_count):
+            self._chunks.remove(index)
+
+        self._length.set(len(value))
+
+    def delete(self) -> None:
+        for index in range(self.chunks_count()):
+            self._chunks.remove(index)
+        self._length.remove()
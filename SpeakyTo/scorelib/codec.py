@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 ICONation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from iconservice import *
+from .consts import *
+
+
+class UnknownCodec(Exception):
+    pass
+
+
+class Codec:
+    RAW = 0
+    LZSS = 1
+
+
+class LZSS:
+    """ Pure Python LZSS implementation (zlib isn't available to SCOREs).
+        Each group of 8 tokens is preceded by a flag byte, a token is either :
+         - a literal byte (flag bit = 0)
+         - a reference to a previous sequence (flag bit = 1) encoded on 2 bytes :
+           a 12 bits backward offset and a 4 bits length
+    """
+
+    _WINDOW_SIZE = (1 << 12) - 1
+    _MIN_MATCH = 3
+    _MAX_MATCH = _MIN_MATCH + (1 << 4) - 1
+    # Maximum count of previous positions tried for each match
+    _MAX_CANDIDATES = 16
+
+    @staticmethod
+    def compress(data: bytes) -> bytes:
+        result = bytearray()
+        positions = {}
+        size = len(data)
+        cur = 0
+
+        while cur < size:
+            flags_index = len(result)
+            result.append(0)
+            flags = 0
+
+            for bit in range(8):
+                if cur >= size:
+                    break
+
+                # Look for the longest match in the window
+                match_length, match_offset = 0, 0
+                max_length = min(LZSS._MAX_MATCH, size - cur)
+                if max_length >= LZSS._MIN_MATCH:
+                    candidates = positions.get(data[cur:cur + LZSS._MIN_MATCH], ())
+                    for position in reversed(candidates[-LZSS._MAX_CANDIDATES:]):
+                        offset = cur - position
+                        if offset > LZSS._WINDOW_SIZE:
+                            break
+                        length = LZSS._MIN_MATCH
+                        while length < max_length and data[position + length] == data[cur + length]:
+                            length += 1
+                        if length > match_length:
+                            match_length, match_offset = length, offset
+                            if length == max_length:
+                                break
+
+                if match_length:
+                    flags |= 1 << bit
+                    result.append(match_offset >> 4)
+                    result.append(((match_offset & 0x0f) << 4) | (match_length - LZSS._MIN_MATCH))
+                    step = match_length
+                else:
+                    result.append(data[cur])
+                    step = 1
+
+                # Index the positions consumed
+                for position in range(cur, min(cur + step, size - LZSS._MIN_MATCH + 1)):
+                    positions.setdefault(data[position:position + LZSS._MIN_MATCH], []).append(position)
+                cur += step
+
+            result[flags_index] = flags
+
+        return bytes(result)
+
+    @staticmethod
+    def decompress(data: bytes) -> bytes:
+        result = bytearray()
+        size = len(data)
+        cur = 0
+
+        while cur < size:
+            flags = data[cur]
+            cur += 1
+
+            for bit in range(8):
+                if cur >= size:
+                    break
+
+                if flags & (1 << bit):
+                    offset = (data[cur] << 4) | (data[cur + 1] >> 4)
+                    length = (data[cur + 1] & 0x0f) + LZSS._MIN_MATCH
+                    start = len(result) - offset
+                    # The referenced sequence may overlap the bytes being written
+                    for index in range(start, start + length):
+                        result.append(result[index])
+                    cur += 2
+                else:
+                    result.append(data[cur])
+                    cur += 1
+
+        return bytes(result)
+
+
+class PayloadCodec:
+    """ Encodes a payload for the storage, compressing it if it is large enough.
+        The first byte of an encoded payload records the codec used. """
+
+    @staticmethod
+    def encode(payload: str, threshold: int = COMPRESSION_THRESHOLD) -> bytes:
+        data = payload.encode('utf-8')
+
+        if len(data) >= threshold:
+            compressed = LZSS.compress(data)
+            # Only keep the compressed payload if it is worth it
+            if len(compressed) < len(data):
+                return bytes([Codec.LZSS]) + compressed
+
+        return bytes([Codec.RAW]) + data
+
+    @staticmethod
+    def decode(value: bytes) -> str:
+        if not value:
+            return ''
+
+        codec, data = value[0], value[1:]
+
+        if codec == Codec.RAW:
+            return data.decode('utf-8')
+        elif codec == Codec.LZSS:
+            return LZSS.decompress(data).decode('utf-8')
+
+        raise UnknownCodec(codec)
@@ -20,3 +20,9 @@ from iconservice import *
 #  Consts
 # ================================================
 MAX_ITERATION_LOOP = 100
+
+# Payloads smaller than this size (in bytes) are stored uncompressed
+COMPRESSION_THRESHOLD = 256
+
+# Size (in characters) of the chunks of a BlobDB
+BLOB_CHUNK_SIZE = 2048
@@ -32,3 +32,7 @@ class IdFactory:
         # Starts with UID 1
         self._uid.set(self._uid.get() + 1)
         return self._uid.get()
+
+    def last_uid(self) -> int:
+        """ Returns the latest UID generated, or 0 if none """
+        return self._uid.get()
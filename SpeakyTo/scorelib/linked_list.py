@@ -35,6 +35,14 @@ class LinkedNodeCannotMoveItself(Exception):
     pass
 
 
+def _remove_zero(var_key: str, db: IconScoreDatabase) -> None:
+    """ Removes an integer VarDB stored to 0. Read as bytes, an absent key is None :
+        it isn't written again """
+    value = VarDB(var_key, db, bytes).get()
+    if value is not None and not any(value):
+        VarDB(var_key, db, int).remove()
+
+
 class _NodeDB:
     """ NodeDB is an item of the LinkedListDB
         Its structure is internal and shouldn't be manipulated outside of this module
@@ -61,6 +69,11 @@ class _NodeDB:
     def get_value(self):
         return self._value.get()
 
+    def compact(self) -> None:
+        """ Removes the links stored to 0 """
+        _remove_zero(f'{self._name}_next', self._db)
+        _remove_zero(f'{self._name}_prev', self._db)
+
     def set_value(self, value) -> None:
         self._init.set(1)
         self._value.set(value)
@@ -69,13 +82,20 @@ class _NodeDB:
         return self._next.get()
 
     def set_next(self, next_id: int) -> None:
-        self._next.set(next_id)
+        # No link is the default value : it isn't stored
+        if next_id:
+            self._next.set(next_id)
+        else:
+            self._next.remove()
 
     def get_prev(self) -> int:
         return self._prev.get()
 
     def set_prev(self, prev_id: int) -> None:
-        self._prev.set(prev_id)
+        if prev_id:
+            self._prev.set(prev_id)
+        else:
+            self._prev.remove()
 
 
 class LinkedListDB:
@@ -91,7 +111,8 @@ class LinkedListDB:
         self._name = var_key + LinkedListDB._NAME
         self._head_id = VarDB(f'{self._name}_head_id', db, int)
         self._tail_id = VarDB(f'{self._name}_tail_id', db, int)
-        self._length = VarDB(f'{self._name}_length', db, int)
+        self._length_key = f'{self._name}_length'
+        self._length = VarDB(self._length_key, db, int)
         self._value_type = value_type
         self._db = db
 
@@ -122,6 +143,24 @@ class LinkedListDB:
             yield (cur_id, node.get_value())
             tail_id = self._tail_id.get()
 
+    def __reversed__(self):
+        cur_id = self._tail_id.get()
+
+        # Empty linked list
+        if not cur_id:
+            return iter(())
+
+        node = self._get_node(cur_id)
+        yield (cur_id, node.get_value())
+        head_id = self._head_id.get()
+
+        # Iterate until head
+        while cur_id != head_id:
+            cur_id = node.get_prev()
+            node = self._get_node(cur_id)
+            yield (cur_id, node.get_value())
+            head_id = self._head_id.get()
+
     def _node(self, node_id) -> _NodeDB:
         return _NodeDB(str(node_id) + self._name, self._db, self._value_type)
 
@@ -156,6 +195,10 @@ class LinkedListDB:
             raise EmptyLinkedListException(self._name)
         return self._get_node(head_id)
 
+    def contains(self, node_id: int) -> bool:
+        """ Returns True if a given node id is in the linkedlist """
+        return self._node(node_id).exists()
+
     def node_value(self, cur_id: int):
         """ Returns the value of a given node id """
         return self._get_node(cur_id).get_value()
@@ -209,7 +252,23 @@ class LinkedListDB:
 
         self._tail_id.remove()
         self._head_id.remove()
-        self._length.set(0)
+        self._length.remove()
+
+    def compact(self) -> None:
+        """ Removes the default values stored by the previous versions : the links
+            out of the head and the tail, and the length of an empty linkedlist """
+        head_id = self._head_id.get()
+        if head_id:
+            self._node(head_id).compact()
+            tail_id = self._tail_id.get()
+            if tail_id != head_id:
+                self._node(tail_id).compact()
+        else:
+            _remove_zero(self._length_key, self._db)
+
+    def is_tail(self, node_id: int) -> bool:
+        """ Returns True if a given node id is the tail of the linkedlist """
+        return self._tail_id.get() == node_id
 
     def append(self, value, node_id: int = None) -> int:
         """ Append an element at the end of the linkedlist """
@@ -480,7 +539,13 @@ class LinkedListDB:
 
     def select(self, offset: int, cond=None, **kwargs) -> list:
         """ Returns a limited amount of items in the LinkedListDB that optionally fulfills a condition """
-        items = iter(self)
+        return self._select(iter(self), offset, cond, **kwargs)
+
+    def select_reversed(self, offset: int, cond=None, **kwargs) -> list:
+        """ Same as select, starting from the tail of the LinkedListDB """
+        return self._select(reversed(self), offset, cond, **kwargs)
+
+    def _select(self, items, offset: int, cond=None, **kwargs) -> list:
         result = []
 
         # Skip N items until offset
@@ -537,3 +602,7 @@ class UIDLinkedListDB(LinkedListDB):
     def __iter__(self):
         for node_id, uid in super().__iter__():
             yield uid
+
+    def __reversed__(self):
+        for node_id, uid in super().__reversed__():
+            yield uid
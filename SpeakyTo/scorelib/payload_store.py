@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 ICONation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from iconservice import *
+from .id_factory import *
+from .blob import *
+
+
+class PayloadNotFound(Exception):
+    pass
+
+
+class PayloadStoreDB:
+    """
+    PayloadStoreDB is a content-addressed collection of payloads.
+    Identical payloads are stored once : a payload is looked up by its hash,
+    and referenced by a compact unique ID, as a 32 bytes hash would often
+    be longer than the payload itself.
+    Each reference is counted : the payload is freed when its last reference is removed.
+    The hash of each payload is stored along with it, so freeing it doesn't read the payload.
+    Payloads are stored in chunks, so large ones can be read by ranges.
+    Large chunks are stored compressed, and only decompressed when read.
+    """
+
+    _NAME = '_PAYLOAD_STOREDB'
+
+    def __init__(self, var_key: str, db: IconScoreDatabase):
+        self._name = var_key + PayloadStoreDB._NAME
+        self._hash_to_uid = DictDB(f'{self._name}_hash_to_uid', db, value_type=int)
+        self._uid_to_hash = DictDB(f'{self._name}_uid_to_hash', db, value_type=bytes)
+        self._refcounts = DictDB(f'{self._name}_refcounts', db, value_type=int)
+        self._db = db
+
+    @staticmethod
+    def payload_hash(payload: str) -> bytes:
+        """ Returns the content address of a given payload """
+        return sha3_256(payload.encode('utf-8'))
+
+    def _payload(self, payload_uid: int) -> BlobDB:
+        return BlobDB(f'{self._name}_{payload_uid}', self._db)
+
+    def check_exists(self, payload_uid: int) -> None:
+        if self._refcounts[payload_uid] == 0:
+            raise PayloadNotFound(self._name, payload_uid)
+
+    def refcount(self, payload_uid: int) -> int:
+        """ Returns the number of references to a given payload """
+        return self._refcounts[payload_uid]
+
+    def get(self, payload_uid: int) -> str:
+        """ Returns the payload identified by a given UID """
+        return self._payload(payload_uid).get()
+
+    def length(self, payload_uid: int) -> int:
+        """ Returns the length of a given payload """
+        return len(self._payload(payload_uid))
+
+    def chunks_count(self, payload_uid: int) -> int:
+        """ Returns the number of chunks of a given payload """
+        return self._payload(payload_uid).chunks_count()
+
+    def chunk(self, payload_uid: int, index: int) -> str:
+        """ Returns a chunk of a given payload """
+        return self._payload(payload_uid).chunk(index)
+
+    def preview(self, payload_uid: int, length: int) -> str:
+        """ Returns the beginning of a given payload """
+        return self._payload(payload_uid).preview(length)
+
+    def add(self, payload: str) -> int:
+        """ Adds a reference to a payload, and stores it if it isn't known yet.
+            Returns the payload UID """
+        payload_hash = PayloadStoreDB.payload_hash(payload)
+        payload_uid = self._hash_to_uid[payload_hash]
+
+        if payload_uid == 0:
+            payload_uid = IdFactory(self._name, self._db).get_uid()
+            self._hash_to_uid[payload_hash] = payload_uid
+            self._uid_to_hash[payload_uid] = payload_hash
+            self._payload(payload_uid).set(payload)
+
+        self._refcounts[payload_uid] += 1
+        return payload_uid
+
+    def retain(self, payload_uid: int) -> None:
+        """ Adds a reference to an already stored payload, without hashing it again """
+        self.check_exists(payload_uid)
+        self._refcounts[payload_uid] += 1
+
+    def remove(self, payload_uid: int) -> None:
+        """ Removes a reference to a payload, and frees it if it was the last one """
+        refcount = self._refcounts[payload_uid]
+        if refcount == 0:
+            raise PayloadNotFound(self._name, payload_uid)
+
+        if refcount == 1:
+            payload_hash = self._uid_to_hash[payload_uid]
+            if payload_hash is None:
+                raise PayloadNotFound(self._name, payload_uid)
+            self._hash_to_uid.remove(payload_hash)
+            self._uid_to_hash.remove(payload_uid)
+            self._payload(payload_uid).delete()
+            self._refcounts.remove(payload_uid)
+        else:
+            self._refcounts[payload_uid] = refcount - 1
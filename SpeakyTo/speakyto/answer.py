@@ -3,6 +3,7 @@
 
 from iconservice import *
 from .consts import *
+from .payload import *
 from ..scorelib.id_factory import *
 from ..scorelib.utils import *
 from ..scorelib.linked_list import *
@@ -49,7 +50,7 @@ class Answer:
         self._name = f'{Answer._NAME}_{uid}'
         self._user_uid = VarDB(f'{self._name}_USER_UID', db, value_type=int)
         self._question_uid = VarDB(f'{self._name}_QUESTION_UID', db, value_type=int)
-        self._data = VarDB(f'{self._name}_DATA', db, value_type=str)
+        self._data = PayloadField(f'{self._name}_DATA', db)
         self._db = db
         self._uid = uid
 
@@ -70,18 +71,27 @@ class Answer:
     def question_uid(self) -> int:
         return self._question_uid.get()
 
+    def data(self) -> str:
+        return self._data.get()
+
+    def data_chunk(self, index: int) -> str:
+        return self._data.chunk(index)
+
+    def data_preview(self) -> dict:
+        return self._data.serialize()
+
     def serialize(self) -> dict:
         return {
             'uid': self._uid,
             'user_uid': self._user_uid.get(),
             'question_uid': self._question_uid.get(),
-            'data': self._data.get()
+            **self._data.serialize()
         }
 
     def delete(self) -> None:
         self._user_uid.remove()
         self._question_uid.remove()
-        self._data.remove()
+        self._data.delete()
 
 
 class AnswerDB(UIDLinkedListDB):
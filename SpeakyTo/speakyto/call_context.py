@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+
+from iconservice import *
+from .user_account import *
+from .experience import *
+from .level import *
+
+
+class CallContext:
+    """
+        CallContext holds the objects related to the sender of an external call.
+        They are resolved lazily, at most once per call, so the helpers
+        can share them instead of reading the storage again.
+    """
+
+    def __init__(self, db: IconScoreDatabase, sender: Address, experience_interface_factory):
+        self._db = db
+        self._sender = sender
+        self._experience_interface_factory = experience_interface_factory
+        self._user_uid = None
+        self._user = None
+        self._experience_interface = None
+        self._experience_system = None
+        self._experience = None
+        self._level = None
+
+    def sender(self) -> Address:
+        return self._sender
+
+    def user_uid(self) -> int:
+        """ Returns the UID of the sender account. Raises if the sender doesn't have an account """
+        if self._user_uid is None:
+            self._user_uid = UserAccounts(self._db).get_user_uid(self._sender)
+        return self._user_uid
+
+    def user(self) -> UserAccount:
+        """ Returns the account of the sender """
+        if self._user is None:
+            self._user = UserAccount(self.user_uid(), self._db)
+        return self._user
+
+    def experience_interface(self):
+        if self._experience_interface is None:
+            self._experience_interface = self._experience_interface_factory()
+        return self._experience_interface
+
+    def experience_system(self) -> ExperienceSystem:
+        """ The experience changes are netted until the context is settled """
+        if self._experience_system is None:
+            self._experience_system = ExperienceSystem(self.experience_interface(), self._db)
+        return self._experience_system
+
+    def level_system(self) -> LevelSystem:
+        return LevelSystem(self.experience_interface(), self._db)
+
+    def experience(self) -> int:
+        """ Returns the experience of the sender """
+        if self._experience is None:
+            self._experience = self.experience_system().get_experience(self.user_uid())
+        return self._experience
+
+    def level(self) -> int:
+        """ Returns the level of the sender """
+        if self._level is None:
+            self._level = self.experience_system().get_level(self.user_uid())
+        return self._level
+
+    def settle(self) -> dict:
+        """ Settle the experience changes done during the call.
+            Returns the (experience, level) of the users whose experience changed """
+        if self._experience_system is None:
+            return {}
+        return self._experience_system.settle()
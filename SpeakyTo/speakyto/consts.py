@@ -12,6 +12,15 @@ QUESTION_LEVEL_1_MAX_DATA_LENGTH = 50
 QUESTION_LEVEL_2_MAX_DATA_LENGTH = 200
 QUESTION_LEVEL_3_MAX_DATA_LENGTH = 50
 
+# Maximum count of answers deleted in a single question deletion step
+QUESTION_DELETION_MAX_ANSWERS = 50
+
+# Length of the question and answer data previews returned when serialized
+DATA_PREVIEW_LENGTH = 256
+
+# Time a cancelled question is kept before the garbage collector reclaims it : 30 days
+QUESTION_CANCELLED_RETENTION = 30 * 24 * 3600 * 1000 * 1000
+
 # Answer cooldown : 10 seconds
 ANSWER_COOLDOWN = 10 * 1000 * 1000
 
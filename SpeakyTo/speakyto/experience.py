@@ -1,6 +1,10 @@
-
 from iconservice import *
 from .user_account import *
+from ..scorelib.linked_list import *
+
+
+class InvalidExperienceSettlementMode(Exception):
+    pass
 
 
 class Experience:
@@ -30,11 +34,41 @@ class ExperienceTable:
         if experience < 0:
             return 0
 
-        for i in range(len(cls._table) - 1):
-            if (cls._table[i] <= experience < cls._table[i + 1]):
-                return i + 1
+        # Binary search of the count of thresholds reached
+        low, high = 0, len(cls._table)
+        while low < high:
+            middle = (low + high) // 2
+            if cls._table[middle] <= experience:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    @classmethod
+    def is_in_level(cls, experience: int, level: int) -> bool:
+        """ Returns True if the experience doesn't cross the boundaries of a given level """
+        if level < 1 or experience < cls._table[level - 1]:
+            return False
+        return level == cls.MAX_LEVEL or experience < cls._table[level]
 
-        return cls.MAX_LEVEL
+
+class ExperienceSettlementMode:
+    # Settle the experience changes with the experience contract at the end of each call
+    IMMEDIATE = 0
+    # Keep the experience changes in a pending ledger, settled in bulk by the operator
+    DEFERRED = 1
+
+
+class ExperiencePendingQueue(UIDLinkedListDB):
+    """ Users with experience changes not settled with the experience contract yet """
+    _NAME = 'EXPERIENCE_PENDING_QUEUE'
+
+    def __init__(self, db: IconScoreDatabase):
+        name = ExperiencePendingQueue._NAME
+        super().__init__(name, db)
+        self._name = name
+        self._db = db
 
 
 class ExperienceSystem:
@@ -44,27 +78,182 @@ class ExperienceSystem:
     def __init__(self, interface, db: IconScoreDatabase):
         name = f'{ExperienceSystem._NAME}'
         self._interface = interface
+        # Local mirror of the experience token balances
+        self._experience = DictDB(f'{name}_EXPERIENCE', db, value_type=int)
+        self._mirrored = DictDB(f'{name}_MIRRORED', db, value_type=bool)
+        # Level of the mirrored users, only updated when crossing a level boundary
+        self._level = DictDB(f'{name}_LEVEL', db, value_type=int)
+        self._reconcile_cursor = VarDB(f'{name}_RECONCILE_CURSOR', db, value_type=int)
+        self._mode = VarDB(f'{name}_MODE', db, value_type=int)
+        # Experience changes pending in deferred mode
+        self._pending = DictDB(f'{name}_PENDING', db, value_type=int)
+        # Experience changes of the current call, netted per user until settled
+        self._deltas = {}
+        self._loaded = {}
+        # Experience and level of the users whose mirror changed, until popped
+        self._changes = {}
         self._name = name
         self._db = db
 
-    def get_experience(self, user_uid: int) -> int:
-        Logger.warning(f"user_uid={user_uid}")
+    # ================================================
+    #  Private Methods
+    # ================================================
+    def _token_experience(self, user_uid: int) -> int:
         user_address = UserAccount(user_uid, self._db).address()
-        Logger.warning(f"user_address={user_address}")
         return self._interface.balanceOf(user_address)
 
+    def _load(self, user_uid: int) -> int:
+        """ Returns the stored experience of a user """
+        if user_uid not in self._loaded:
+            self._loaded[user_uid] = self._experience[user_uid]
+        return self._loaded[user_uid]
+
+    def _mirror(self, user_uid: int, experience: int) -> int:
+        """ Returns the level of the user """
+        self._experience[user_uid] = experience
+
+        level = self._level[user_uid]
+        if not ExperienceTable.is_in_level(experience, level):
+            level = ExperienceTable.get_level(experience)
+            self._level[user_uid] = level
+        return level
+
+    def _add_pending(self, user_uid: int, delta: int) -> None:
+        if delta == 0:
+            return
+
+        pending = self._pending[user_uid]
+        if pending == 0:
+            ExperiencePendingQueue(self._db).append(user_uid)
+
+        if pending + delta == 0:
+            ExperiencePendingQueue(self._db).remove(user_uid)
+            self._pending.remove(user_uid)
+        else:
+            self._pending[user_uid] = pending + delta
+
+    def _transfer(self, deltas: dict) -> None:
+        """ Settle experience changes with the experience contract.
+            The experience given and removed are settled with at most one batch call each """
+        withdrawals, deposits = ([], []), ([], [])
+
+        for user_uid, delta in deltas.items():
+            if delta != 0:
+                addresses, amounts = withdrawals if delta > 0 else deposits
+                addresses.append(str(UserAccount(user_uid, self._db).address()))
+                amounts.append(abs(delta))
+
+        for (addresses, amounts), batch in [(withdrawals, self._interface.treasury_batch_withdraw),
+                                            (deposits, self._interface.treasury_batch_deposit)]:
+            if addresses:
+                batch(json_dumps(addresses), json_dumps(amounts))
+
+    # ================================================
+    #  Public Methods
+    # ================================================
+    def get_mode(self) -> int:
+        return self._mode.get()
+
+    def set_mode(self, mode: int) -> None:
+        if mode not in (ExperienceSettlementMode.IMMEDIATE, ExperienceSettlementMode.DEFERRED):
+            raise InvalidExperienceSettlementMode(mode)
+        self._mode.set(mode)
+
+    def get_pending(self, user_uid: int) -> int:
+        return self._pending[user_uid]
+
+    def is_mirrored(self, user_uid: int) -> bool:
+        return self._mirrored[user_uid]
+
+    def add_user(self, user_uid: int) -> None:
+        """ A new account starts mirrored, without any experience """
+        self._mirrored[user_uid] = True
+
+    def get_experience(self, user_uid: int) -> int:
+        return self._load(user_uid) + self._deltas.get(user_uid, 0)
+
     def get_level(self, user_uid: int) -> int:
-        experience = self.get_experience(user_uid)
-        return ExperienceTable.get_level(experience)
+        level = self._level[user_uid]
+        if level and user_uid not in self._deltas:
+            return level
+        return ExperienceTable.get_level(self.get_experience(user_uid))
 
     def give_experience(self, user_uid: int, amount: int) -> None:
-        user_address = UserAccount(user_uid, self._db).address()
-        self._interface.treasury_withdraw(user_address, amount)
+        """ The experience is given once settled """
+        self._deltas[user_uid] = self._deltas.get(user_uid, 0) + amount
 
     def remove_experience(self, user_uid: int, amount: int) -> None:
-        user_experience = self.get_experience(user_uid)
-        user_address = UserAccount(user_uid, self._db).address()
-        if user_experience > amount:
-            self._interface.treasury_deposit(user_address, amount)
-        else:
-            self._interface.treasury_deposit(user_address, user_experience)
+        """ The experience is removed once settled """
+        amount = min(self.get_experience(user_uid), amount)
+        self._deltas[user_uid] = self._deltas.get(user_uid, 0) - amount
+
+    def pop_changes(self) -> dict:
+        """ Returns the (experience, level) of the users whose experience changed
+            since the last call, by user uid """
+        changes = self._changes
+        self._changes = {}
+        return changes
+
+    def settle(self) -> dict:
+        """ Apply the experience changes netted per user to the mirror.
+            In deferred mode, they are added to the pending ledger instead of
+            being settled with the experience contract.
+            Returns the changes, see `pop_changes` """
+        deferred = self.get_mode() == ExperienceSettlementMode.DEFERRED
+
+        for user_uid, delta in self._deltas.items():
+            experience = self._load(user_uid) + delta
+            level = self._mirror(user_uid, experience)
+            if delta != 0:
+                self._changes[user_uid] = (experience, level)
+            if deferred:
+                self._add_pending(user_uid, delta)
+
+        if not deferred:
+            self._transfer(self._deltas)
+
+        self._deltas = {}
+        self._loaded = {}
+        return self.pop_changes()
+
+    def flush(self, max_users: int) -> int:
+        """ Settle the pending experience changes of up to `max_users` users.
+            Returns the count of settled users """
+        queue = ExperiencePendingQueue(self._db)
+        deltas = {}
+
+        while len(deltas) < max_users and len(queue) > 0:
+            user_uid = queue.head_value()
+            deltas[user_uid] = self._pending[user_uid]
+            queue.remove(user_uid)
+            self._pending.remove(user_uid)
+
+        self._transfer(deltas)
+        return len(deltas)
+
+    def reconcile(self, max_users: int) -> int:
+        """ Re-sync the mirror of up to `max_users` users from the token balances.
+            This is also how the accounts created before the mirror existed get mirrored.
+            The progress is stored, so the next call resumes after the last reconciled user.
+            The corrected users are kept in the changes, see `pop_changes`.
+            Returns the count of reconciled users """
+        last_uid = UserAccountFactory(self._db).last_uid()
+        cursor = self._reconcile_cursor.get()
+        count = 0
+
+        while count < max_users and cursor < last_uid:
+            cursor += 1
+            # The pending changes aren't part of the token balance yet
+            experience = self._token_experience(cursor) + self._pending[cursor]
+            mirrored = self.is_mirrored(cursor)
+            previous = self._experience[cursor] if mirrored else None
+            level = self._mirror(cursor, experience)
+            if not mirrored:
+                self._mirrored[cursor] = True
+            if experience != previous:
+                self._changes[cursor] = (experience, level)
+            count += 1
+
+        # Start a new pass once every user has been reconciled
+        self._reconcile_cursor.set(cursor if cursor < last_uid else 0)
+        return count
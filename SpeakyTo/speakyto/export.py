@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+
+from iconservice import *
+from .question import *
+from .answer import *
+from .user_account import *
+from .experience import *
+from .reward import *
+
+
+class ExportList:
+    """ Bits of the `lists` column : the lists containing an exported entity """
+
+    # Users
+    USER_ACCOUNTS = 1
+
+    # Questions
+    QUESTIONS = 1
+    LANGUAGE_PAIR_QUESTIONS = 2
+    USER_QUESTIONS = 4
+    USER_OPENED_QUESTIONS = 8
+    FANOUT_QUESTIONS = 16
+    QUESTION_DELETION_QUEUE = 32
+
+    # Answers
+    ANSWERS = 1
+
+
+class StateExport:
+    """ Pages of entities, scanned by UID from a cursor.
+        A page is compact : the columns are listed once, the rows are arrays.
+        `block_height` is the height the page was read at.
+        The `data` column is a preview : the longer data are read by chunks
+        with get_question_data and get_answer_data.
+        The UIDs of the deleted entities are skipped, and the lists are in UID order
+        as the entities are appended to their lists when created """
+
+    USER_COLUMNS = ['uid', 'address', 'username', 'avatar_uid', 'experience', 'level', 'pending_experience',
+                    'claimable_rewards', 'lists']
+    QUESTION_COLUMNS = ['uid', 'user_uid', 'answer_uid', 'state', 'from_language', 'to_language', 'reward',
+                        'level', 'fanout_uid', 'lists', 'data', 'data_length', 'data_chunks']
+    ANSWER_COLUMNS = ['uid', 'question_uid', 'user_uid', 'lists', 'data', 'data_length', 'data_chunks']
+
+    def __init__(self, experience_system: ExperienceSystem, block_height: int, db: IconScoreDatabase):
+        self._experience_system = experience_system
+        self._block_height = block_height
+        self._db = db
+
+    # ================================================
+    #  Private Methods
+    # ================================================
+    def _page(self, columns: list, rows: list, cursor: int, last_uid: int) -> dict:
+        """ The export is complete once `cursor` reaches `last_uid` """
+        return {
+            'columns': columns,
+            'rows': rows,
+            'cursor': cursor,
+            'last_uid': last_uid,
+            'block_height': self._block_height
+        }
+
+    @staticmethod
+    def _scan(cursor: int, count: int, last_uid: int) -> range:
+        return range(cursor + 1, min(cursor + count, last_uid) + 1)
+
+    def _user_row(self, uid: int):
+        user = UserAccount(uid, self._db)
+        address = user.address()
+        if address is None:
+            return None
+
+        lists = ExportList.USER_ACCOUNTS if UserAccounts(self._db).contains(uid) else 0
+        return [
+            uid,
+            address,
+            user.username(),
+            user.avatar_uid(),
+            self._experience_system.get_experience(uid),
+            self._experience_system.get_level(uid),
+            self._experience_system.get_pending(uid),
+            RewardLedger(self._db).balance(uid),
+            lists
+        ]
+
+    def _question_row(self, uid: int):
+        question = Question(uid, self._db)
+        state = question.state()
+        if state == QuestionState.UNINITIALIZED:
+            return None
+
+        user_uid, fanout_uid = question.user_uid(), question.fanout_uid()
+        from_language, to_language = question.from_language(), question.to_language()
+        memberships = [
+            (ExportList.QUESTIONS, QuestionDB(self._db)),
+            (ExportList.LANGUAGE_PAIR_QUESTIONS, LanguagePairQuestionDB(from_language, to_language, self._db)),
+            (ExportList.USER_QUESTIONS, UserQuestionDB(user_uid, self._db)),
+            (ExportList.USER_OPENED_QUESTIONS, UserOpenedQuestionDB(user_uid, self._db)),
+            (ExportList.QUESTION_DELETION_QUEUE, QuestionDeletionQueue(self._db))
+        ]
+        if fanout_uid:
+            memberships.append((ExportList.FANOUT_QUESTIONS, FanoutQuestionDB(fanout_uid, self._db)))
+        lists = sum(bit for bit, questions in memberships if questions.contains(uid))
+        preview = question.data_preview()
+
+        return [
+            uid,
+            user_uid,
+            question.answer_uid(),
+            state,
+            from_language,
+            to_language,
+            question.reward(),
+            question.level(),
+            fanout_uid,
+            lists,
+            preview['data'],
+            preview['data_length'],
+            preview['data_chunks']
+        ]
+
+    def _answer_row(self, uid: int):
+        answer = Answer(uid, self._db)
+        question_uid = answer.question_uid()
+        if not question_uid:
+            return None
+
+        lists = ExportList.ANSWERS if AnswerDB(question_uid, self._db).contains(uid) else 0
+        preview = answer.data_preview()
+        return [uid, question_uid, answer.user_uid(), lists,
+                preview['data'], preview['data_length'], preview['data_chunks']]
+
+    def _export(self, columns: list, row, cursor: int, count: int, last_uid: int) -> dict:
+        rows = []
+        for uid in self._scan(cursor, count, last_uid):
+            cursor = uid
+            exported = row(uid)
+            if exported is not None:
+                rows.append(exported)
+        return self._page(columns, rows, cursor, last_uid)
+
+    # ================================================
+    #  Public Methods
+    # ================================================
+    def users(self, cursor: int, count: int) -> dict:
+        return self._export(StateExport.USER_COLUMNS, self._user_row, cursor, count,
+                            UserAccountFactory(self._db).last_uid())
+
+    def questions(self, cursor: int, count: int) -> dict:
+        return self._export(StateExport.QUESTION_COLUMNS, self._question_row, cursor, count,
+                            QuestionFactory(self._db).last_uid())
+
+    def answers(self, cursor: int, count: int) -> dict:
+        return self._export(StateExport.ANSWER_COLUMNS, self._answer_row, cursor, count,
+                            AnswerFactory(self._db).last_uid())
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+
+from iconservice import *
+from .consts import *
+from .question import *
+from .answer import *
+from .user_account import *
+from .experience import *
+
+
+class MeteredDatabase:
+    """ Database proxy measuring the bytes reclaimed : the keys deleted and the values shrunk.
+        The keys are measured as seen by the containers, without their sub database prefixes """
+
+    def __init__(self, db: IconScoreDatabase, meter: dict):
+        self._db = db
+        self._meter = meter
+
+    @property
+    def address(self) -> Address:
+        return self._db.address
+
+    @staticmethod
+    def _size(key: bytes, value: bytes) -> int:
+        return len(key) + len(value) if value is not None else 0
+
+    def get_sub_db(self, prefix: bytes) -> 'MeteredDatabase':
+        return MeteredDatabase(self._db.get_sub_db(prefix), self._meter)
+
+    def get(self, key: bytes) -> bytes:
+        return self._db.get(key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._meter['bytes_freed'] += self._size(key, self._db.get(key)) - self._size(key, value)
+        self._db.put(key, value)
+
+    def delete(self, key: bytes) -> None:
+        self._meter['bytes_freed'] += self._size(key, self._db.get(key))
+        self._db.delete(key)
+
+
+class GarbageCollectorPhase:
+    QUESTIONS = 0
+    USERS = 1
+    LISTS = 2
+
+
+class GarbageCollector:
+    """
+        Reclaims the storage in bounded steps, resumed from a persisted cursor across calls.
+        A sweep walks every question, then every user, then the global lists, and starts over :
+         - the questions cancelled for longer than QUESTION_CANCELLED_RETENTION leave
+           the questions and language pair lists, and are queued for deletion
+         - the lists of the entities walked are compacted, the keys left to zero
+           by the removals of the previous versions are deleted
+        The language pair and fan-out lists are shared by their questions : a list is compacted
+        once per sweep, when its tail question is walked, or by its questions once empty.
+        Each entity or global list walked is a step. The questions pending deletion are deleted
+        first, an answer per step, then the question itself.
+    """
+
+    _NAME = 'GARBAGE_COLLECTOR'
+
+    def __init__(self, db: IconScoreDatabase):
+        self._name = GarbageCollector._NAME
+        self._phase = VarDB(f'{self._name}_PHASE', db, value_type=int)
+        # Last UID walked in the current phase
+        self._cursor = VarDB(f'{self._name}_CURSOR', db, value_type=int)
+        self._bytes_freed = VarDB(f'{self._name}_BYTES_FREED', db, value_type=int)
+        self._sweeps = VarDB(f'{self._name}_SWEEPS', db, value_type=int)
+        self._db = db
+
+    # ================================================
+    #  Private Methods
+    # ================================================
+    @staticmethod
+    def _is_expired(question: Question, now: int) -> bool:
+        if question.state() != QuestionState.CANCELLED:
+            return False
+        # The questions cancelled before the timestamp was stored are expired
+        return question.cancelled_timestamp() + QUESTION_CANCELLED_RETENTION <= now
+
+    @staticmethod
+    def _purge_question(question: Question, db: IconScoreDatabase) -> None:
+        """ A cancelled question is only left in the questions, language pair and fan-out lists.
+            Its answers may not fit in a single transaction : it joins the deletion queue """
+        uid = question.uid()
+        lists = [QuestionDB(db), LanguagePairQuestionDB(question.from_language(), question.to_language(), db)]
+        if question.fanout_uid():
+            lists.append(FanoutQuestionDB(question.fanout_uid(), db))
+        for questions in lists:
+            if questions.contains(uid):
+                questions.remove(uid)
+
+        if question.fanout_uid() and len(FanoutQuestionDB(question.fanout_uid(), db)) == 0:
+            FanoutQuestionDB(question.fanout_uid(), db).delete()
+        question.set_deleting()
+        QuestionDeletionQueue(db).append(uid)
+
+    def _sweep_question(self, uid: int, now: int, db: IconScoreDatabase, purged: list) -> None:
+        question = Question(uid, db)
+        if self._is_expired(question, now):
+            purged.append((uid, question.user_uid()))
+            self._purge_question(question, db)
+            return
+
+        if question.state() != QuestionState.UNINITIALIZED:
+            AnswerDB(uid, db).compact()
+            lists = [LanguagePairQuestionDB(question.from_language(), question.to_language(), db)]
+            if question.fanout_uid():
+                lists.append(FanoutQuestionDB(question.fanout_uid(), db))
+            for questions in lists:
+                if questions.is_tail(uid) or len(questions) == 0:
+                    questions.compact()
+
+    @staticmethod
+    def _sweep_user(uid: int, db: IconScoreDatabase) -> None:
+        UserQuestionDB(uid, db).compact()
+        UserOpenedQuestionDB(uid, db).compact()
+
+    @staticmethod
+    def _global_lists(db: IconScoreDatabase) -> list:
+        return [QuestionDB(db), QuestionDeletionQueue(db), UserAccounts(db), ExperiencePendingQueue(db)]
+
+    # ================================================
+    #  Public Methods
+    # ================================================
+    @staticmethod
+    def delete_pending(deletion_queue: QuestionDeletionQueue, db: IconScoreDatabase) -> None:
+        """ Deletes an answer of the first question pending deletion,
+            or the question once its answers are deleted """
+        question_uid = deletion_queue.head_value()
+        answers = AnswerDB(question_uid, db)
+
+        if len(answers) > 0:
+            answer_uid = answers.head_value()
+            answers.remove(answer_uid)
+            Answer(answer_uid, db).delete()
+            return
+
+        answers.delete()
+        Question(question_uid, db).delete()
+        deletion_queue.remove(question_uid)
+
+    def sweep(self, max_steps: int, now: int) -> dict:
+        """ Walks up to `max_steps` entities. Returns the report of the run,
+            with the (uid, user_uid) of the questions deleted """
+        meter = {'bytes_freed': 0}
+        db = MeteredDatabase(self._db, meter)
+        phase, cursor = self._phase.get(), self._cursor.get()
+        deletion_queue = QuestionDeletionQueue(db)
+        purged = []
+        steps = 0
+
+        while steps < max_steps:
+            if len(deletion_queue) > 0:
+                self.delete_pending(deletion_queue, db)
+
+            elif phase == GarbageCollectorPhase.QUESTIONS:
+                if cursor >= QuestionFactory(self._db).last_uid():
+                    phase, cursor = GarbageCollectorPhase.USERS, 0
+                    continue
+                cursor += 1
+                self._sweep_question(cursor, now, db, purged)
+
+            elif phase == GarbageCollectorPhase.USERS:
+                if cursor >= UserAccountFactory(self._db).last_uid():
+                    phase, cursor = GarbageCollectorPhase.LISTS, 0
+                    continue
+                cursor += 1
+                self._sweep_user(cursor, db)
+
+            else:
+                lists = self._global_lists(db)
+                lists[cursor].compact()
+                cursor += 1
+                if cursor == len(lists):
+                    phase, cursor = GarbageCollectorPhase.QUESTIONS, 0
+                    self._sweeps.set(self._sweeps.get() + 1)
+
+            steps += 1
+
+        self._phase.set(phase)
+        self._cursor.set(cursor)
+        self._bytes_freed.set(self._bytes_freed.get() + meter['bytes_freed'])
+        return {
+            'steps': steps,
+            'bytes_freed': meter['bytes_freed'],
+            'purged': purged
+        }
+
+    def status(self) -> dict:
+        return {
+            'phase': self._phase.get(),
+            'cursor': self._cursor.get(),
+            'sweeps': self._sweeps.get(),
+            'bytes_freed': self._bytes_freed.get()
+        }
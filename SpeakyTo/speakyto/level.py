@@ -32,10 +32,7 @@ class LevelSystem:
         self._interface = interface
         self._db = db
 
-    def check_can_create_question(self, user_uid: int, required_level: int) -> None:
-        experience_system = ExperienceSystem(self._interface, self._db)
-        user_level = experience_system.get_level(user_uid)
-
+    def check_can_create_question(self, user_uid: int, user_level: int, required_level: int, count: int = 1) -> None:
         # Check required level for the question
         if user_level < required_level:
             raise InvalidUserLevel(user_level, required_level)
@@ -44,6 +41,6 @@ class LevelSystem:
         if user_level in LevelSystem._table_max_opened_questions:
             opened_questions_count = len(UserOpenedQuestionDB(user_uid, self._db))
             max_questions_count = LevelSystem._table_max_opened_questions[user_level]
-            # Check if the user can opened a new question
-            if opened_questions_count + 1 > max_questions_count:
+            # Check if the user can open `count` new questions
+            if opened_questions_count + count > max_questions_count:
                 raise TooMuchOpenedQuestions(user_uid, max_questions_count)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+
+from iconservice import *
+from .question import *
+from .answer import *
+from ..migration import *
+
+
+class QuestionPayloadMigration(Migration):
+    """ Moves the data stored inline by the questions created before the Payloads store """
+    NAME = 'QUESTION_INLINE_PAYLOADS'
+    TARGET_VERSION = '0.2.0'
+    ENTITY = 'question'
+
+    def last_uid(self) -> int:
+        return QuestionFactory(self._db).last_uid()
+
+    def migrate(self, uid: int) -> None:
+        Question(uid, self._db)._data.migrate()
+
+
+class AnswerPayloadMigration(Migration):
+    """ Moves the data stored inline by the answers created before the Payloads store """
+    NAME = 'ANSWER_INLINE_PAYLOADS'
+    TARGET_VERSION = '0.2.0'
+    ENTITY = 'answer'
+
+    def last_uid(self) -> int:
+        return AnswerFactory(self._db).last_uid()
+
+    def migrate(self, uid: int) -> None:
+        Answer(uid, self._db)._data.migrate()
+
+
+# Registered migrations, applied in this order
+MIGRATIONS = [
+    QuestionPayloadMigration,
+    AnswerPayloadMigration
+]
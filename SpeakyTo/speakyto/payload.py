@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+
+from iconservice import *
+from .consts import *
+from ..scorelib.payload_store import *
+
+
+class Payloads(PayloadStoreDB):
+    """ Data of the questions and answers, identical data are stored once """
+    _NAME = 'PAYLOADS'
+
+    def __init__(self, db: IconScoreDatabase):
+        name = Payloads._NAME
+        super().__init__(name, db)
+        self._name = name
+        self._db = db
+
+
+class PayloadField:
+    """ Data field of a question or an answer, referencing a payload of the Payloads store.
+        The data of the entities created before the Payloads store is stored inline. """
+
+    def __init__(self, var_key: str, db: IconScoreDatabase):
+        self._payload_uid = VarDB(f'{var_key}_UID', db, value_type=int)
+        self._inline = VarDB(var_key, db, value_type=str)
+        self._db = db
+
+    def set(self, data: str) -> None:
+        self._payload_uid.set(Payloads(self._db).add(data))
+
+    def share(self, payload_uid: int) -> None:
+        """ Reference the payload of another field """
+        Payloads(self._db).retain(payload_uid)
+        self._payload_uid.set(payload_uid)
+
+    def payload_uid(self) -> int:
+        return self._payload_uid.get()
+
+    def get(self) -> str:
+        payload_uid = self._payload_uid.get()
+        if not payload_uid:
+            return self._inline.get()
+        return Payloads(self._db).get(payload_uid)
+
+    def chunks_count(self) -> int:
+        payload_uid = self._payload_uid.get()
+        if not payload_uid:
+            return BlobDB.split_count(len(self._inline.get()))
+        return Payloads(self._db).chunks_count(payload_uid)
+
+    def chunk(self, index: int) -> str:
+        payload_uid = self._payload_uid.get()
+        if not payload_uid:
+            return BlobDB.split_chunk(self._inline.get(), index)
+        return Payloads(self._db).chunk(payload_uid, index)
+
+    def serialize(self) -> dict:
+        """ Returns a preview of the data and its total size """
+        payload_uid = self._payload_uid.get()
+        if not payload_uid:
+            data = self._inline.get()
+            return {
+                'data': data[:DATA_PREVIEW_LENGTH],
+                'data_length': len(data),
+                'data_chunks': BlobDB.split_count(len(data))
+            }
+        payloads = Payloads(self._db)
+        return {
+            'data': payloads.preview(payload_uid, DATA_PREVIEW_LENGTH),
+            'data_length': payloads.length(payload_uid),
+            'data_chunks': payloads.chunks_count(payload_uid)
+        }
+
+    def migrate(self) -> None:
+        """ Moves the inline data to the Payloads store """
+        if self._payload_uid.get():
+            return
+        data = self._inline.get()
+        # Nothing is stored inline for the deleted entities
+        if not data:
+            return
+        self.set(data)
+        self._inline.remove()
+
+    def delete(self) -> None:
+        payload_uid = self._payload_uid.get()
+        if not payload_uid:
+            self._inline.remove()
+            return
+        Payloads(self._db).remove(payload_uid)
+        self._payload_uid.remove()
@@ -3,6 +3,7 @@
 
 from iconservice import *
 from .consts import *
+from .payload import *
 from ..scorelib.id_factory import *
 from ..scorelib.utils import *
 from ..scorelib.linked_list import *
@@ -16,6 +17,10 @@ class InvalidQuestionData(Exception):
     pass
 
 
+class InvalidQuestionLevel(Exception):
+    pass
+
+
 class InvalidUserUid(Exception):
     pass
 
@@ -30,6 +35,7 @@ class QuestionState:
     OPENED = 2
     ANSWERED = 3
     CANCELLED = 4
+    DELETING = 5
 
 
 class QuestionFactory(IdFactory):
@@ -61,6 +67,36 @@ class QuestionFactory(IdFactory):
         question._state.set(QuestionState.OPENED)
         return uid
 
+    def create_fanout(self,
+                      user_uid: int,
+                      data: str,
+                      from_language: str,
+                      to_languages: list,
+                      reward: int,
+                      level: int) -> list:
+        """ Create one question per target language, sharing the same data.
+            The UID of the first question identifies the fan-out """
+        uids = []
+
+        for to_language in to_languages:
+            uid = self.get_uid()
+            question = Question(uid, self._db)
+            question._user_uid.set(user_uid)
+            question._answer_uid.set(0)
+            if uids:
+                question._data.share(Question(uids[0], self._db)._data.payload_uid())
+            else:
+                question._data.set(data)
+            question._from_language.set(from_language)
+            question._to_language.set(to_language)
+            question._reward.set(reward)
+            question._level.set(level)
+            question._state.set(QuestionState.OPENED)
+            question._fanout_uid.set(uids[0] if uids else uid)
+            uids.append(uid)
+
+        return uids
+
 
 class Question:
 
@@ -73,12 +109,16 @@ class Question:
         self._name = f'{Question._NAME}_{uid}'
         self._user_uid = VarDB(f'{self._name}_USER_UID', db, value_type=int)
         self._answer_uid = VarDB(f'{self._name}_ANSWER_UID', db, value_type=int)
-        self._data = VarDB(f'{self._name}_DATA', db, value_type=str)
+        self._data = PayloadField(f'{self._name}_DATA', db)
         self._from_language = VarDB(f'{self._name}_FROM_LANGUAGE', db, value_type=str)
         self._to_language = VarDB(f'{self._name}_TO_LANGUAGE', db, value_type=str)
         self._reward = VarDB(f'{self._name}_REWARD', db, value_type=int)
         self._state = VarDB(f'{self._name}_STATE', db, value_type=int)
         self._level = VarDB(f'{self._name}_LEVEL', db, value_type=int)
+        # UID of the first question of a fan-out, 0 if the question isn't part of a fan-out
+        self._fanout_uid = VarDB(f'{self._name}_FANOUT_UID', db, value_type=int)
+        # Block timestamp of the cancellation, the storage is reclaimed after the retention period
+        self._cancelled_timestamp = VarDB(f'{self._name}_CANCELLED_TIMESTAMP', db, value_type=int)
         self._db = db
         self._uid = uid
 
@@ -93,6 +133,10 @@ class Question:
         if self._state.get() == QuestionState.UNINITIALIZED:
             raise InvalidQuestionState(self._name, Utils.get_enum_name(QuestionState, self._state.get()))
 
+    def check_not_deleting(self) -> None:
+        if self._state.get() == QuestionState.DELETING:
+            raise InvalidQuestionState(self._name, Utils.get_enum_name(QuestionState, self._state.get()))
+
     def check_is_op(self, user_uid: int) -> None:
         if user_uid != self._user_uid.get():
             raise InvalidUserUid(self._name, self._user_uid.get(), user_uid)
@@ -123,6 +167,19 @@ class Question:
     def check_level5_data(data: str) -> None:
         pass
 
+    @staticmethod
+    def check_data(level: int, data: str) -> None:
+        checks = {
+            1: Question.check_level1_data,
+            2: Question.check_level2_data,
+            3: Question.check_level3_data,
+            4: Question.check_level4_data,
+            5: Question.check_level5_data
+        }
+        if level not in checks:
+            raise InvalidQuestionLevel(level)
+        checks[level](data)
+
     # ================================================
     #  Private Methods
     # ================================================
@@ -139,8 +196,43 @@ class Question:
     def user_uid(self) -> int:
         return self._user_uid.get()
 
-    def cancel(self) -> None:
+    def from_language(self) -> str:
+        return self._from_language.get()
+
+    def to_language(self) -> str:
+        return self._to_language.get()
+
+    def fanout_uid(self) -> int:
+        return self._fanout_uid.get()
+
+    def answer_uid(self) -> int:
+        return self._answer_uid.get()
+
+    def state(self) -> int:
+        return self._state.get()
+
+    def level(self) -> int:
+        return self._level.get()
+
+    def data(self) -> str:
+        return self._data.get()
+
+    def data_chunk(self, index: int) -> str:
+        return self._data.chunk(index)
+
+    def data_preview(self) -> dict:
+        return self._data.serialize()
+
+    def cancel(self, now: int) -> None:
         self._state.set(QuestionState.CANCELLED)
+        self._cancelled_timestamp.set(now)
+
+    def cancelled_timestamp(self) -> int:
+        """ 0 for the questions cancelled before the timestamp was stored """
+        return self._cancelled_timestamp.get()
+
+    def set_deleting(self) -> None:
+        self._state.set(QuestionState.DELETING)
 
     def select_answer(self, answer_uid: int) -> None:
         self._answer_uid.set(answer_uid)
@@ -152,22 +244,25 @@ class Question:
             'user_uid': self._user_uid.get(),
             'answer_uid': self._answer_uid.get(),
             'state': Utils.get_enum_name(QuestionState, self._state.get()),
-            'data': self._data.get(),
+            **self._data.serialize(),
             'from_language': self._from_language.get(),
             'to_language': self._to_language.get(),
             'reward': self._reward.get(),
-            'level': self._level.get()
+            'level': self._level.get(),
+            'fanout_uid': self._fanout_uid.get()
         }
 
     def delete(self) -> None:
         self._user_uid.remove()
         self._answer_uid.remove()
-        self._data.remove()
+        self._data.delete()
         self._from_language.remove()
         self._to_language.remove()
         self._reward.remove()
         self._state.remove()
         self._level.remove()
+        self._fanout_uid.remove()
+        self._cancelled_timestamp.remove()
 
 
 class QuestionDB(UIDLinkedListDB):
@@ -198,3 +293,36 @@ class UserOpenedQuestionDB(UIDLinkedListDB):
         super().__init__(name, db)
         self._name = name
         self._db = db
+
+
+class LanguagePairQuestionDB(UIDLinkedListDB):
+    """ Questions asked from a language to another """
+    _NAME = 'LANGUAGE_PAIR_QUESTION_DB'
+
+    def __init__(self, from_language: str, to_language: str, db: IconScoreDatabase):
+        name = f'{LanguagePairQuestionDB._NAME}_{from_language}_{to_language}'
+        super().__init__(name, db)
+        self._name = name
+        self._db = db
+
+
+class FanoutQuestionDB(UIDLinkedListDB):
+    """ Questions of a fan-out, one per target language """
+    _NAME = 'FANOUT_QUESTION_DB'
+
+    def __init__(self, fanout_uid: int, db: IconScoreDatabase):
+        name = f'{FanoutQuestionDB._NAME}_{fanout_uid}'
+        super().__init__(name, db)
+        self._name = name
+        self._db = db
+
+
+class QuestionDeletionQueue(UIDLinkedListDB):
+    """ Questions marked as DELETING whose answers haven't been fully deleted yet """
+    _NAME = 'QUESTION_DELETION_QUEUE'
+
+    def __init__(self, db: IconScoreDatabase):
+        name = QuestionDeletionQueue._NAME
+        super().__init__(name, db)
+        self._name = name
+        self._db = db
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+
+from iconservice import *
+
+
+class NoRewardToClaim(Exception):
+    pass
+
+
+class RewardLedger:
+    """
+        RewardLedger keeps the ICX rewards and refunds owed to the users.
+        They are credited to a claimable balance, that the users withdraw
+        with a single transfer.
+    """
+    _NAME = 'REWARD_LEDGER'
+
+    # ================================================
+    #  Initialization
+    # ================================================
+    def __init__(self, db: IconScoreDatabase):
+        name = RewardLedger._NAME
+        self._balances = DictDB(f'{name}_BALANCES', db, value_type=int)
+        self._total = VarDB(f'{name}_TOTAL', db, value_type=int)
+        self._name = name
+        self._db = db
+
+    # ================================================
+    #  Checks
+    # ================================================
+    def check_claimable(self, user_uid: int) -> None:
+        if self._balances[user_uid] == 0:
+            raise NoRewardToClaim(self._name, user_uid)
+
+    # ================================================
+    #  Public Methods
+    # ================================================
+    def balance(self, user_uid: int) -> int:
+        return self._balances[user_uid]
+
+    def total(self) -> int:
+        return self._total.get()
+
+    def credit(self, user_uid: int, amount: int) -> None:
+        self._balances[user_uid] += amount
+        self._total.set(self._total.get() + amount)
+
+    def claim(self, user_uid: int) -> int:
+        """ Empty the balance of a user, and returns the amount to transfer """
+        amount = self._balances[user_uid]
+        self._balances.remove(user_uid)
+        self._total.set(self._total.get() - amount)
+        return amount
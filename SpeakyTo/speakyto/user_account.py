@@ -50,8 +50,10 @@ class UserAccounts(UIDLinkedListDB):
         self.append(user_uid)
 
     def get_user_uid(self, user_address: Address) -> int:
-        self.check_exists(user_address)
-        return self._address_to_uid_map[str(user_address)]
+        user_uid = self._address_to_uid_map[str(user_address)]
+        if user_uid == 0:
+            raise UserAccountDoesntExist(self._name, str(user_address))
+        return user_uid
 
 
 class UserAccountFactory(IdFactory):
@@ -127,6 +129,12 @@ class UserAccount:
     def address(self) -> Address:
         return self._address.get()
 
+    def username(self) -> str:
+        return self._username.get()
+
+    def avatar_uid(self) -> int:
+        return self._avatar_uid.get()
+
     def set_last_answer_timestamp(self, now: int) -> None:
         self._last_answer_timestamp.set(now)
 
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""
+Size and CPU trade-off of the payloads codec, across payload sizes.
+
+For each payload kind and size, reports the encoded size, the time spent
+encoding and decoding, and the SET steps saved on the stored value.
+ - text   : sentences in several languages, as found in level 4/5 questions and answers
+ - random : random characters, the worst case for the compression
+
+Usage : python -m SpeakyTo.tests.benchmarks.codec_benchmark [--repeat N] [--json]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from SpeakyTo.scorelib.codec import *
+from SpeakyTo.scorelib.utils import *
+
+SIZES = [16, 64, 256, 1024, 4096, 16384, 65536]
+
+SENTENCES = [
+    'Could you show me how to use this expression in a formal letter ?',
+    'In spoken French, the negation "ne" is often dropped in casual conversations.',
+    'Der Satz ist grammatikalisch richtig, aber niemand würde ihn so sagen.',
+    '이 표현은 친구 사이에서만 사용하는 것이 좋습니다.',
+    'この言葉は丁寧な場面ではあまり使われません。',
+    'Esta expresión se usa sobre todo en América Latina.',
+]
+
+# Steps charged per byte of a newly stored value (mainnet "contractSet")
+DEFAULT_SET_STEP_COST = 320
+
+
+def generate_payload(kind: str, size: int, rng: random.Random) -> str:
+    """ Returns a payload of about `size` bytes once encoded in UTF-8 """
+    chars, length = [], 0
+    while length < size:
+        if kind == 'text':
+            part = rng.choice(SENTENCES) + ' '
+        else:
+            part = chr(rng.randint(0x20, 0x7e)) if rng.random() < 0.7 else chr(rng.randint(0xac00, 0xd7a3))
+        for char in part:
+            length += len(char.encode('utf-8'))
+            if length > size:
+                return ''.join(chars)
+            chars.append(char)
+    return ''.join(chars)
+
+
+def timed(func, argument, repeat: int) -> tuple:
+    """ Returns the result of func(argument) and the average time per call in microseconds """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(argument)
+    return result, (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(repeat: int, set_step_cost: int, seed: int) -> list:
+    rng = random.Random(seed)
+    results = []
+    for kind in ('text', 'random'):
+        for size in SIZES:
+            payload = generate_payload(kind, size, rng)
+            raw_size = len(payload.encode('utf-8'))
+            encoded, encode_us = timed(PayloadCodec.encode, payload, repeat)
+            decoded, decode_us = timed(PayloadCodec.decode, encoded, repeat)
+            assert decoded == payload
+            results.append({
+                'kind': kind,
+                'size': raw_size,
+                'codec': Utils.get_enum_name(Codec, encoded[0]),
+                'encoded_size': len(encoded),
+                'ratio': round(len(encoded) / raw_size, 4) if raw_size else 1,
+                'encode_us': round(encode_us, 1),
+                'decode_us': round(decode_us, 1),
+                'steps_saved': (raw_size - len(encoded)) * set_step_cost,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--set-step-cost', type=int, default=DEFAULT_SET_STEP_COST)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='Machine readable output')
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.set_step_cost, args.seed)
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    columns = ['kind', 'size', 'codec', 'encoded_size', 'ratio', 'encode_us', 'decode_us', 'steps_saved']
+    print(''.join(f'{column:>14}' for column in columns))
+    for result in results:
+        print(''.join(f'{str(result[column]):>14}' for column in columns))
+
+
+if __name__ == '__main__':
+    main()
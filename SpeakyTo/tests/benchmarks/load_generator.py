@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+"""
+Load generator for SpeakyTo against a local tbears node (see start_tbears.sh).
+
+Deploys SpeakyTo and its IRC2 experience contract (unless --score is given),
+creates and funds a set of wallets, then runs rounds of :
+ - create_question_level1 : every wallet asks a question
+ - answer_question        : every question is answered by the next wallet
+ - select_answer          : every asker selects the answer
+
+The transactions of each phase are generated and signed beforehand, then
+replayed concurrently to the node, while the receipts are polled in the
+background. Each round grows the dataset, so the report shows how the
+throughput and the p50/p95/p99 latencies of each method evolve with the
+number of questions stored.
+
+The latency is measured from the submission of a transaction to its receipt,
+its resolution is the receipts polling interval.
+
+Usage : python -m SpeakyTo.tests.benchmarks.load_generator [--wallets 100] [--rounds 10] [--workers 32] [--json]
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from iconsdk.exception import JSONRPCException
+from iconsdk.icon_service import IconService
+from iconsdk.libs.in_memory_zip import gen_deploy_data_content
+from iconsdk.providers.http_provider import HTTPProvider
+from SpeakyTo.speakyto.consts import ANSWER_COOLDOWN
+from SpeakyTo.tests.utils import *
+
+ROOT_PATH = path.abspath(path.join(path.dirname(__file__), '..', '..', '..'))
+SCORE_PATH = path.join(ROOT_PATH, 'SpeakyTo')
+IRC2_PATH = path.join(SCORE_PATH, 'tests', 'irc2')
+CLI_CONFIG_PATH = path.join(ROOT_PATH, 'config', 'localhost', 'tbears_cli_config.json')
+
+ICX = 10 ** 18
+POLL_INTERVAL = 0.2
+RECEIPT_TIMEOUT = 120
+
+
+def percentile(values: list, percent: int) -> float:
+    """ Nearest-rank percentile """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = max(int(round(percent / 100 * len(values))) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def event_uids(tx_result: dict, event: str) -> list:
+    """ Returns the uids indexed by the given event of a transaction result """
+    return [int(log['indexed'][1], 16) for log in tx_result.get('eventLogs', [])
+            if log['indexed'][0].startswith(f'{event}(')]
+
+
+class ReceiptTracker(object):
+    """ Polls the node in the background for the receipts of the submitted transactions """
+
+    def __init__(self, icon_service: IconService, workers: int):
+        self._icon_service = icon_service
+        self._executor = ThreadPoolExecutor(workers)
+        self._pending = {}
+        self._receipts = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+
+    def track(self, tx_hash: str, sent: float) -> None:
+        with self._lock:
+            self._pending[tx_hash] = sent
+
+    def _fetch(self, tx_hash: str):
+        try:
+            return tx_hash, self._icon_service.get_transaction_result(tx_hash)
+        except JSONRPCException:
+            # Not in a block yet
+            return tx_hash, None
+
+    def _poll(self) -> None:
+        while not self._stopped.is_set():
+            with self._lock:
+                tx_hashes = list(self._pending)
+
+            for tx_hash, tx_result in self._executor.map(self._fetch, tx_hashes):
+                if tx_result is None:
+                    continue
+                with self._lock:
+                    sent = self._pending.pop(tx_hash)
+                    self._receipts[tx_hash] = (tx_result, time.monotonic() - sent)
+
+            time.sleep(POLL_INTERVAL)
+
+    def wait(self, tx_hashes: list, timeout: float = RECEIPT_TIMEOUT) -> list:
+        """ Waits for the receipts of the given transactions, and returns their (tx_result, latency).
+            The transactions without a receipt before the timeout are returned as (None, None) """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if all(tx_hash in self._receipts for tx_hash in tx_hashes):
+                    break
+            time.sleep(POLL_INTERVAL)
+
+        with self._lock:
+            return [self._receipts.pop(tx_hash, (None, None)) for tx_hash in tx_hashes]
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        self._executor.shutdown()
+
+
+class LoadGenerator(object):
+
+    def __init__(self, icon_service: IconService, operator: KeyWallet, nid: int, workers: int):
+        self._icon_service = icon_service
+        self._operator = operator
+        self._nid = nid
+        self._executor = ThreadPoolExecutor(workers)
+        self._tracker = ReceiptTracker(icon_service, workers)
+
+    def close(self) -> None:
+        self._tracker.stop()
+        self._executor.shutdown()
+
+    def _send(self, signed_transaction: SignedTransaction) -> str:
+        sent = time.monotonic()
+        tx_hash = self._icon_service.send_transaction(signed_transaction)
+        self._tracker.track(tx_hash, sent)
+        return tx_hash
+
+    def replay(self, method: str, signed_transactions: list) -> tuple:
+        """ Submits the signed transactions concurrently, waits for their receipts.
+            Returns the transaction results and the statistics of the phase """
+        start = time.monotonic()
+        tx_hashes = list(self._executor.map(self._send, signed_transactions))
+        receipts = self._tracker.wait(tx_hashes)
+        duration = time.monotonic() - start
+
+        tx_results = [tx_result for tx_result, _ in receipts]
+        latencies = [latency for tx_result, latency in receipts if tx_result and tx_result['status'] == 1]
+        stats = {
+            'method': method,
+            'transactions': len(signed_transactions),
+            'succeeded': len(latencies),
+            'failed': sum(1 for tx_result in tx_results if tx_result and tx_result['status'] != 1),
+            'timeouts': sum(1 for tx_result in tx_results if tx_result is None),
+            'duration': round(duration, 2),
+            'tps': round(len(latencies) / duration, 1) if duration else 0.0,
+            'p50': round(percentile(latencies, 50), 3),
+            'p95': round(percentile(latencies, 95), 3),
+            'p99': round(percentile(latencies, 99), 3),
+        }
+        return tx_results, stats
+
+    def call_transactions(self, wallets: list, to_: str, method: str, params: list, value: int = 0) -> list:
+        return [sign_call_transaction(wallet, to_, method, wallet_params, value, nid=self._nid)
+                for wallet, wallet_params in zip(wallets, params)]
+
+    def deploy(self, project: str, params: dict = None) -> str:
+        transaction = DeployTransactionBuilder() \
+            .from_(self._operator.get_address()) \
+            .to(SCORE_INSTALL_ADDRESS) \
+            .step_limit(100_000_000_000) \
+            .nid(self._nid) \
+            .nonce(100) \
+            .content_type("application/zip") \
+            .content(gen_deploy_data_content(project)) \
+            .params(params) \
+            .build()
+        tx_results, _ = self.replay('deploy', [SignedTransaction(transaction, self._operator)])
+        assert tx_results[0] and tx_results[0]['status'] == 1, tx_results[0]
+        return tx_results[0]['scoreAddress']
+
+    def deploy_speakyto(self) -> str:
+        score = self.deploy(SCORE_PATH)
+        irc2 = self.deploy(IRC2_PATH, {
+            "_initialSupply": 0x100000000000,
+            "_decimals": 18,
+            "_name": 'StandardToken',
+            "_symbol": 'ST',
+        })
+        tx_results, _ = self.replay('set_experience_contract', self.call_transactions(
+            [self._operator], score, 'set_experience_contract', [{'address': irc2}]))
+        assert tx_results[0] and tx_results[0]['status'] == 1, tx_results[0]
+        # SpeakyTo moves the experience treasury held by the operator
+        tx_results, _ = self.replay('set_treasurer', self.call_transactions(
+            [self._operator], irc2, 'set_treasurer', [{'_treasurer': score}]))
+        assert tx_results[0] and tx_results[0]['status'] == 1, tx_results[0]
+        return score
+
+    def setup_wallets(self, score: str, wallets: list, funds: int) -> list:
+        transfers = [sign_transfer_transaction(self._operator, wallet.get_address(), funds, nid=self._nid)
+                     for wallet in wallets]
+        _, transfer_stats = self.replay('transfer', transfers)
+
+        params = [{'avatar_uid': 1, 'username': f'load{index}'} for index in range(len(wallets))]
+        _, account_stats = self.replay('create_user_account',
+                                       self.call_transactions(wallets, score, 'create_user_account', params))
+        return [transfer_stats, account_stats]
+
+    def run_round(self, score: str, wallets: list, reward: int) -> list:
+        params = [{'data': f'load {index}', 'from_language': 'en', 'to_language': 'fr'}
+                  for index in range(len(wallets))]
+        tx_results, question_stats = self.replay('create_question_level1', self.call_transactions(
+            wallets, score, 'create_question_level1', params, reward))
+
+        # Each question is answered by the next wallet
+        askers, answerers, params = [], [], []
+        for index, tx_result in enumerate(tx_results):
+            for question_uid in event_uids(tx_result or {}, 'QuestionCreatedEvent'):
+                askers.append(wallets[index])
+                answerers.append(wallets[(index + 1) % len(wallets)])
+                params.append({'question_uid': question_uid, 'data': f'answer {question_uid}'})
+        tx_results, answer_stats = self.replay('answer_question', self.call_transactions(
+            answerers, score, 'answer_question', params))
+
+        selectors, params = [], []
+        for index, tx_result in enumerate(tx_results):
+            for answer_uid in event_uids(tx_result or {}, 'AnswerCreatedEvent'):
+                selectors.append(askers[index])
+                params.append({'answer_uid': answer_uid})
+        _, select_stats = self.replay('select_answer', self.call_transactions(
+            selectors, score, 'select_answer', params))
+
+        return [question_stats, answer_stats, select_stats]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', type=str, default=CLI_CONFIG_PATH, help='tbears CLI configuration')
+    parser.add_argument('--score', type=str, default=None, help='Already deployed SpeakyTo address')
+    parser.add_argument('--wallets', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--json', action='store_true', help='Machine readable output')
+    args = parser.parse_args()
+
+    with open(args.config) as config_file:
+        config = json.load(config_file)
+    keystore = path.join(ROOT_PATH, config['keyStore'])
+    operator = KeyWallet.load(keystore, config['password'])
+    icon_service = IconService(HTTPProvider(config['uri']))
+
+    generator = LoadGenerator(icon_service, operator, int(config['nid'], 16), args.workers)
+    try:
+        score = args.score or generator.deploy_speakyto()
+        wallets = [KeyWallet.create() for _ in range(args.wallets)]
+        results = [{'round': 0, 'questions': 0, **stats}
+                   for stats in generator.setup_wallets(score, wallets, (args.rounds + 1) * 2 * ICX)]
+
+        questions = 0
+        for round_index in range(1, args.rounds + 1):
+            start = time.monotonic()
+            round_stats = generator.run_round(score, wallets, ICX)
+            results += [{'round': round_index, 'questions': questions, **stats} for stats in round_stats]
+            questions += round_stats[0]['succeeded']
+
+            # Every wallet answers once per round
+            time.sleep(max(ANSWER_COOLDOWN / 1e6 - (time.monotonic() - start), 0))
+    finally:
+        generator.close()
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    columns = ['round', 'questions', 'method', 'transactions', 'failed', 'timeouts', 'tps', 'p50', 'p95', 'p99']
+    print(' '.join(f'{column:>22}' for column in columns))
+    for result in results:
+        print(' '.join(f'{result[column]:>22}' for column in columns))
+
+
+if __name__ == '__main__':
+    main()
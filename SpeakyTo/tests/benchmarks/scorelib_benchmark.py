@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cost of the scorelib containers operations, across container sizes.
+
+Each container is filled up to the given size on an in-memory database,
+then every operation is timed while counting the storage operations.
+For each container, operation and size, reports the wall time per call,
+the storage reads, writes and deletes per call, and the bytes stored by
+the filled container.
+ - LinkedListDB, UIDLinkedListDB : append, remove, iterate, select, move_node_*, clear
+ - BagDB                         : add, remove, iterate, select, clear
+ - IdFactory                     : get_uid
+
+The largest sizes take several minutes to fill : use --sizes to select them.
+
+Usage : python -m SpeakyTo.tests.benchmarks.scorelib_benchmark [--sizes 10,1000] [--repeat N] [--json]
+"""
+
+import argparse
+import json
+import time
+
+from iconservice import *
+from SpeakyTo.scorelib.bag import *
+from SpeakyTo.scorelib.id_factory import *
+from SpeakyTo.scorelib.linked_list import *
+from SpeakyTo.tests.memory_db import *
+
+SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+
+SCORE_ADDRESS = Address.from_string('cx' + '0' * 40)
+
+
+def measure(storage: MemoryStorage, func, calls: int) -> dict:
+    """ Calls func(index) `calls` times, and returns the time and storage operations per call """
+    counts = dict(storage.counts)
+    start = time.perf_counter()
+    for index in range(calls):
+        func(index)
+    elapsed = time.perf_counter() - start
+    return {
+        'calls': calls,
+        'us_per_call': round(elapsed / calls * 1e6, 1),
+        'gets_per_call': round((storage.counts['get'] - counts['get']) / calls, 1),
+        'puts_per_call': round((storage.counts['put'] - counts['put']) / calls, 1),
+        'deletes_per_call': round((storage.counts['delete'] - counts['delete']) / calls, 1),
+    }
+
+
+def consume(iterable) -> None:
+    for _ in iterable:
+        pass
+
+
+def bench_linked_list(db: MemoryDatabase, size: int, repeat: int, uid: bool) -> list:
+    if uid:
+        linked_list = UIDLinkedListDB('BENCHMARK', db)
+        node_ids = list(range(1, size + 1))
+        for node_id in node_ids:
+            linked_list.append(node_id)
+        append = lambda index: linked_list.append(size + index + 1)
+    else:
+        linked_list = LinkedListDB('BENCHMARK', db, int)
+        node_ids = [linked_list.append(index) for index in range(size)]
+        append = lambda index: linked_list.append(index)
+
+    # The move_node_* operations don't support moving the head or the tail :
+    # each operation gets its own nodes, taken from the middle of the linkedlist
+    calls = min(repeat, max((size - 2) // 5, 1))
+    interior = node_ids[1:-1]
+    start = max(len(interior) // 2 - calls * 5 // 2, 0)
+    slices = [interior[start + calls * index:start + calls * (index + 1)] for index in range(5)]
+
+    stored_bytes = db.storage.stored_bytes()
+    deep_offset = max(size - MAX_ITERATION_LOOP, 0)
+    operations = [
+        ('iterate', lambda index: consume(linked_list), 1),
+        ('select', lambda index: linked_list.select(deep_offset), 1),
+        ('move_node_head', lambda index: linked_list.move_node_head(slices[0][index]), calls),
+        ('move_node_tail', lambda index: linked_list.move_node_tail(slices[1][index]), calls),
+        ('move_node_after',
+         lambda index: linked_list.move_node_after(slices[2][index], node_ids[0]), calls),
+        ('move_node_before',
+         lambda index: linked_list.move_node_before(slices[3][index], node_ids[-1]), calls),
+        ('remove', lambda index: linked_list.remove(slices[4][index]), calls),
+        ('append', append, repeat),
+        ('clear', lambda index: linked_list.clear(), 1),
+    ]
+    container = 'UIDLinkedListDB' if uid else 'LinkedListDB'
+    return run_operations(db, container, size, stored_bytes, operations)
+
+
+def bench_bag(db: MemoryDatabase, size: int, repeat: int) -> list:
+    bag = BagDB('BENCHMARK', db, int)
+    for index in range(size):
+        bag.add(index)
+
+    stored_bytes = db.storage.stored_bytes()
+    deep_offset = max(size - MAX_ITERATION_LOOP, 0)
+    operations = [
+        ('iterate', lambda index: consume(bag), 1),
+        ('select', lambda index: bag.select(deep_offset), 1),
+        ('remove', lambda index: bag.remove(size // 2 + index), min(repeat, size - size // 2)),
+        ('add', lambda index: bag.add(index), repeat),
+        ('clear', lambda index: bag.clear(), 1),
+    ]
+    return run_operations(db, 'BagDB', size, stored_bytes, operations)
+
+
+def bench_id_factory(db: MemoryDatabase, size: int, repeat: int) -> list:
+    factory = IdFactory('BENCHMARK', db)
+    for _ in range(size):
+        factory.get_uid()
+
+    stored_bytes = db.storage.stored_bytes()
+    operations = [
+        ('get_uid', lambda index: factory.get_uid(), repeat),
+    ]
+    return run_operations(db, 'IdFactory', size, stored_bytes, operations)
+
+
+def run_operations(db: MemoryDatabase,
+                   container: str,
+                   size: int,
+                   stored_bytes: int,
+                   operations: list) -> list:
+    results = []
+    for operation, func, calls in operations:
+        results.append({
+            'container': container,
+            'operation': operation,
+            'size': size,
+            'stored_bytes': stored_bytes,
+            **measure(db.storage, func, calls)
+        })
+    return results
+
+
+def run(sizes: list, repeat: int) -> list:
+    push_memory_context()
+    results = []
+    for size in sizes:
+        results += bench_linked_list(MemoryDatabase(SCORE_ADDRESS), size, repeat, uid=False)
+        results += bench_linked_list(MemoryDatabase(SCORE_ADDRESS), size, repeat, uid=True)
+        results += bench_bag(MemoryDatabase(SCORE_ADDRESS), size, repeat)
+        results += bench_id_factory(MemoryDatabase(SCORE_ADDRESS), size, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=str, default=','.join(map(str, SIZES)))
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--json', action='store_true', help='Machine readable output')
+    args = parser.parse_args()
+
+    results = run([int(size) for size in args.sizes.split(',')], args.repeat)
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    columns = ['container', 'operation', 'size', 'calls', 'us_per_call',
+               'gets_per_call', 'puts_per_call', 'deletes_per_call', 'stored_bytes']
+    print(''.join(f'{column:>18}' for column in columns))
+    for result in results:
+        print(''.join(f'{str(result[column]):>18}' for column in columns))
+
+
+if __name__ == '__main__':
+    main()
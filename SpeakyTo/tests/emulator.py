@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+
+"""
+In-process runtime for the SpeakyTo SCORE.
+
+The SCOREs classes are instantiated directly on an in-memory database, without
+packaging, signing nor a node : a call costs a few Python function calls instead
+of a full transaction processing, so workloads of hundred thousands of questions
+run in seconds.
+
+The runtime provides the stand-ins the SCOREs rely on :
+ - msg, tx sender, now() and the block height, advanced on each transaction
+ - icx.transfer / icx.send and the ICX balances
+ - eventlogs, collected in the transaction results
+ - revert : a failed transaction rolls back the storage and the balances
+ - inter-contract calls, such as the calls to the experience IRC2 contract
+
+Parameters and results go through the same conversions as the JSON-RPC path, so
+`transaction_call` and `icx_call` return what the integration tests receive from
+`tests/utils.py`. Native Python values are accepted as parameters as well.
+
+Usage :
+    emulator = Emulator()
+    speakyto, irc2 = deploy_speakyto(emulator)
+    result = emulator.transaction_call(emulator.wallet(1), speakyto, 'create_user_account',
+                                       {'avatar_uid': 1, 'username': 'user'})
+
+The tests derive from EmulatorTestCase, which deploys SpeakyTo before each test.
+"""
+
+import unittest
+
+from iconservice import *
+from iconservice.base.address import AddressPrefix
+from iconservice.base.block import Block
+from iconservice.base.exception import IconServiceBaseException
+from iconservice.base.message import Message
+from iconservice.base.type_converter import TypeConverter
+from iconservice.icon_constant import IconScoreContextType, IconScoreFuncType
+from iconservice.iconscore.icon_score_context import ContextContainer, IconScoreContext
+from iconservice.iconscore.icon_score_context_util import IconScoreContextUtil
+from iconservice.iconscore.icon_score_event_log import EventLogEmitter
+from iconservice.iconscore.internal_call import InternalCall
+from SpeakyTo.instrumentation import Instrumentation
+from SpeakyTo.main import SpeakyTo
+from SpeakyTo.tests.irc2.sample_token import SampleToken
+from SpeakyTo.tests.memory_db import *
+
+# Same parameters as the IRC2 deployed by the integration tests
+IRC2_PARAMS = {
+    '_initialSupply': 0x100000000000,
+    '_decimals': 18,
+    '_name': 'StandardToken',
+    '_symbol': 'ST',
+}
+
+# Time elapsed between two transactions, in microseconds
+BLOCK_INTERVAL = 2_000_000
+
+ICX = 10 ** 18
+
+
+class EmulatorBalanceError(IconServiceBaseException):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class JournaledStorage(MemoryStorage):
+    """ MemoryStorage keeping the previous values of the keys written during a transaction,
+        so a failed transaction can be rolled back """
+
+    def __init__(self):
+        super().__init__()
+        self._journal = None
+
+    def _record(self, key: bytes) -> None:
+        if self._journal is not None and key not in self._journal:
+            self._journal[key] = self._items.get(key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._record(key)
+        super().put(key, value)
+
+    def delete(self, key: bytes) -> None:
+        self._record(key)
+        super().delete(key)
+
+    def begin(self) -> None:
+        self._journal = {}
+
+    def commit(self) -> None:
+        self._journal = None
+
+    def rollback(self) -> None:
+        for key, value in self._journal.items():
+            if value is None:
+                self._items.pop(key, None)
+            else:
+                self._items[key] = value
+        self._journal = None
+
+
+class EmulatorIcx(object):
+    """ Stand-in for the `icx` property of the SCOREs """
+
+    def __init__(self, emulator: 'Emulator', address: Address):
+        self._emulator = emulator
+        self._address = address
+
+    def transfer(self, addr_to: Address, amount: int) -> None:
+        self._emulator.move_icx(self._address, addr_to, amount)
+
+    def send(self, addr_to: Address, amount: int) -> bool:
+        try:
+            self.transfer(addr_to, amount)
+            return True
+        except EmulatorBalanceError:
+            return False
+
+    def get_balance(self, address: Address) -> int:
+        return self._emulator.get_balance(address)
+
+
+class Emulator(object):
+    """ Runs SCOREs in-process. Only one emulator can be opened at a time,
+        as it replaces the iconservice hooks to the node while opened.
+        `instrumentation_hook` receives the (method, counts) of the external calls of the SCOREs deployed,
+        see Instrumentation """
+
+    def __init__(self, instrumentation_hook=None):
+        self.storage = JournaledStorage()
+        self._instrumentation_hook = instrumentation_hook
+        self.eventlogs = []
+        self._scores = {}
+        self._owners = {}
+        self._balances = {}
+        self._score_count = 0
+        self._height = 1
+        self._timestamp = 1_500_000_000_000_000
+        self._context = IconScoreContext(IconScoreContextType.INVOKE)
+        self._context.revision = 10
+        self._context.step_counter = MemoryStepCounter()
+        self._context.event_logs = []
+        self._context.block = self._block()
+        self._context.msg = Message(None, 0)
+        self._open()
+
+    # ================================================
+    #  Runtime hooks
+    # ================================================
+    def _open(self) -> None:
+        self._originals = (
+            IconScoreContextUtil.__dict__['get_owner'],
+            InternalCall.__dict__['other_external_call'],
+            EventLogEmitter.__dict__['emit_event_log']
+        )
+        ContextContainer._push_context(self._context)
+        IconScoreContextUtil.get_owner = staticmethod(lambda context, address: self._owners.get(address))
+        InternalCall.other_external_call = staticmethod(self._internal_call)
+        EventLogEmitter.emit_event_log = staticmethod(self._emit_event_log)
+
+    def close(self) -> None:
+        """ Restores the iconservice hooks """
+        get_owner, other_external_call, emit_event_log = self._originals
+        IconScoreContextUtil.get_owner = get_owner
+        InternalCall.other_external_call = other_external_call
+        EventLogEmitter.emit_event_log = emit_event_log
+        ContextContainer._pop_context()
+
+    def __enter__(self) -> 'Emulator':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _emit_event_log(self, context, score_address: Address, event_signature: str,
+                        arguments: list, indexed_args_count: int, fee_charge: bool = False) -> None:
+        if context.readonly:
+            raise IconServiceBaseException('The event log can not be recorded on readonly context')
+        self._context.event_logs.append({
+            'scoreAddress': score_address,
+            'indexed': [event_signature] + arguments[:indexed_args_count],
+            'data': arguments[indexed_args_count:]
+        })
+
+    def _internal_call(self, context, addr_from: Address, addr_to: Address, amount: int,
+                       func_name: str, arg_params: tuple = None, kw_params: dict = None):
+        score = self._scores[addr_to]
+        msg, current_address = self._context.msg, self._context.current_address
+        self._context.msg = Message(addr_from, amount)
+        self._context.current_address = addr_to
+        try:
+            if amount:
+                self.move_icx(addr_from, addr_to, amount)
+            return score._IconScoreBase__call(func_name or 'fallback', list(arg_params or ()), kw_params or {})
+        finally:
+            self._context.msg, self._context.current_address = msg, current_address
+
+    # ================================================
+    #  Private Methods
+    # ================================================
+    def _block(self) -> Block:
+        return Block(self._height, self._height.to_bytes(32, 'big'), self._timestamp, None)
+
+    @staticmethod
+    def _address(address) -> Address:
+        return address if isinstance(address, Address) else Address.from_string(address)
+
+    @staticmethod
+    def _convert_params(func, params: dict) -> dict:
+        """ Converts the JSON-RPC parameters (hex strings...) the same way the node does.
+            Native values are left untouched """
+        params = dict(params or {})
+        annotations = TypeConverter.make_annotations_from_method(func)
+        strings = {key: value for key, value in params.items() if isinstance(value, str)}
+        TypeConverter.convert_data_params(annotations, strings)
+        params.update(strings)
+        return params
+
+    def _run(self, score_address: Address, sender: Address, value: int, call, readonly: bool) -> dict:
+        context = self._context
+        context.type = IconScoreContextType.QUERY if readonly else IconScoreContextType.INVOKE
+        context.func_type = IconScoreFuncType.READONLY if readonly else IconScoreFuncType.WRITABLE
+        context.msg = Message(sender, value)
+        context.current_address = score_address
+        context.event_logs = []
+
+        balances = dict(self._balances)
+        self.storage.begin()
+        try:
+            if value:
+                self.move_icx(sender, score_address, value)
+            result = call()
+        except IconServiceBaseException as e:
+            self.storage.rollback()
+            self._balances = balances
+            return {
+                'status': 0,
+                'failure': {'code': hex(e.code), 'message': e.message},
+                'blockHeight': self._height,
+                'eventLogs': []
+            }
+        self.storage.commit()
+
+        if not readonly:
+            self.eventlogs += context.event_logs
+        return {
+            'status': 1,
+            'result': result,
+            'blockHeight': self._height,
+            'eventLogs': context.event_logs
+        }
+
+    # ================================================
+    #  Public Methods
+    # ================================================
+    def wallet(self, index: int) -> Address:
+        """ Returns a deterministic EOA address, index starting at 0 """
+        return Address.from_prefix_and_int(AddressPrefix.EOA, index + 1)
+
+    def score(self, address) -> IconScoreBase:
+        """ Returns the SCORE instance, for direct inspection """
+        return self._scores[self._address(address)]
+
+    def now(self) -> int:
+        return self._timestamp
+
+    def advance(self, microseconds: int = BLOCK_INTERVAL, blocks: int = 1) -> None:
+        """ Moves the time and the block height forward """
+        self._timestamp += microseconds
+        self._height += blocks
+        self._context.block = self._block()
+
+    def get_balance(self, address) -> int:
+        return self._balances.get(self._address(address), 0)
+
+    def set_balance(self, address, amount: int) -> None:
+        self._balances[self._address(address)] = amount
+
+    def move_icx(self, addr_from: Address, addr_to: Address, amount: int) -> None:
+        if amount < 0:
+            raise EmulatorBalanceError(f'Invalid amount: {amount}')
+        if self._balances.get(addr_from, 0) < amount:
+            raise EmulatorBalanceError(f'Out of balance: {addr_from}')
+        self._balances[addr_from] = self._balances.get(addr_from, 0) - amount
+        self._balances[addr_to] = self._balances.get(addr_to, 0) + amount
+
+    def deploy(self, score_class: type, deployer, params: dict = None) -> Address:
+        """ Installs a SCORE owned by the deployer, and returns its address """
+        self._score_count += 1
+        address = Address.from_prefix_and_int(AddressPrefix.CONTRACT, self._score_count)
+        deployer = self._address(deployer)
+        self._owners[address] = deployer
+
+        db = MemoryDatabase(address, self.storage)
+        if self._instrumentation_hook is not None:
+            db = Instrumentation(db, self._instrumentation_hook).db
+        score = score_class(db)
+        score._IconScoreBase__icx = EmulatorIcx(self, address)
+        self._scores[address] = score
+
+        self.advance()
+        params = self._convert_params(score.on_install, params)
+        result = self._run(address, deployer, 0, lambda: score.on_install(**params), False)
+        if result['status'] != 1:
+            del self._scores[address]
+            del self._owners[address]
+            raise IconServiceBaseException(result['failure']['message'])
+        return address
+
+    def update(self, address, params: dict = None) -> None:
+        """ Updates a SCORE in place : runs its on_update on the current storage, as its owner """
+        score = self._scores[self._address(address)]
+        self.advance()
+        params = self._convert_params(score.on_update, params)
+        result = self._run(score.address, self._owners[score.address], 0, lambda: score.on_update(**params), False)
+        if result['status'] != 1:
+            raise IconServiceBaseException(result['failure']['message'])
+
+    def invoke(self, from_, to_, method: str, params: dict = None, value: int = 0) -> dict:
+        """ Sends a transaction in a new block, and returns the transaction result with native values """
+        score = self._scores[self._address(to_)]
+        params = self._convert_params(getattr(score, method), params)
+        self.advance()
+        return self._run(score.address, self._address(from_), value,
+                         lambda: score._IconScoreBase__call(method, [], params), False)
+
+    def query(self, to_, method: str, params: dict = None, from_=None):
+        """ Calls a readonly method, and returns its native response """
+        score = self._scores[self._address(to_)]
+        params = self._convert_params(getattr(score, method), params)
+        sender = self._address(from_) if from_ is not None else None
+        result = self._run(score.address, sender, 0, lambda: score._IconScoreBase__call(method, [], params), True)
+        if result['status'] != 1:
+            raise IconServiceBaseException(result['failure']['message'])
+        return result['result']
+
+    def transaction_call(self, from_, to_, method: str, params: dict = None, value: int = 0) -> dict:
+        """ Same as `invoke`, with the transaction result formatted as the node returns it """
+        return TypeConverter.convert_type_reverse(self.invoke(from_, to_, method, params, value))
+
+    def icx_call(self, from_, to_, method: str, params: dict = None):
+        """ Same as `query`, with the response formatted as the node returns it """
+        return TypeConverter.convert_type_reverse(self.query(to_, method, params, from_))
+
+
+def deploy_speakyto(emulator: Emulator, owner: Address = None) -> tuple:
+    """ Deploys SpeakyTo and its IRC2 experience contract, the way the integration tests do.
+        SpeakyTo owns the IRC2 contract : the initial supply is its experience treasury.
+        Returns the (speakyto, irc2) addresses """
+    owner = owner or emulator.wallet(0)
+    speakyto = emulator.deploy(SpeakyTo, owner)
+    irc2 = emulator.deploy(SampleToken, speakyto, IRC2_PARAMS)
+    result = emulator.invoke(owner, speakyto, 'set_experience_contract', {'address': irc2})
+    if result['status'] != 1:
+        raise IconServiceBaseException(result['failure']['message'])
+    return speakyto, irc2
+
+
+class EmulatorTestCase(unittest.TestCase):
+    """
+        Deploys SpeakyTo on a new emulator before each test.
+
+        Available in the tests :
+         - self.emulator, self.speakyto, self.irc2
+         - self.owner : the wallet owning SpeakyTo
+         - self.users : USERS wallets, each one given USER_BALANCE and owning a user account
+         - self.db : the SpeakyTo database, for direct inspection
+    """
+
+    USERS = 0
+
+    USER_BALANCE = 100 * ICX
+
+    def setUp(self):
+        self.emulator = self._create_emulator()
+        self.owner = self.emulator.wallet(0)
+        self.users = [self.emulator.wallet(index) for index in range(1, self.USERS + 1)]
+        self.speakyto, self.irc2 = deploy_speakyto(self.emulator, self.owner)
+        self.db = self.emulator.score(self.speakyto).db
+
+        for index, user in enumerate(self.users):
+            self.emulator.set_balance(user, self.USER_BALANCE)
+            self._success(user, 'create_user_account', {'avatar_uid': 1, 'username': f'user{index}'})
+
+    def tearDown(self):
+        self.emulator.close()
+
+    def _create_emulator(self) -> Emulator:
+        return Emulator()
+
+    def _success(self, from_, method: str, params: dict = None, value: int = 0) -> dict:
+        """ Sends a transaction to SpeakyTo, and returns its result with native values """
+        result = self.emulator.invoke(from_, self.speakyto, method, params, value)
+        self.assertEqual(1, result['status'], result)
+        return result
+
+    def _transaction_success(self, from_, method: str, params: dict = None, value: int = 0) -> dict:
+        """ Same as `_success`, with the result formatted as the node returns it """
+        result = self.emulator.transaction_call(from_, self.speakyto, method, params, value)
+        self.assertEqual('0x1', result['status'], result)
+        return result
+
+    def _query(self, method: str, **params):
+        return self.emulator.query(self.speakyto, method, params)
+
+    @staticmethod
+    def _events(result: dict) -> dict:
+        """ Returns the eventlogs of a transaction result, by event name """
+        return {log['indexed'][0].split('(')[0]: log for log in result['eventLogs']}
@@ -0,0 +1,194 @@
+from os import path
+from shutil import copytree
+from unittest.mock import patch
+
+from iconcommons import IconConfig
+from iconservice.icon_config import default_icon_config
+from iconservice.icon_constant import ConfigKey
+from iconservice.icon_service_engine import IconServiceEngine
+from tbears.libs.icon_integrate_test import root_clear
+from SpeakyTo.speakyto.consts import ANSWER_COOLDOWN
+from SpeakyTo.tests.icontranslate_utils import *
+
+
+class SeedDataset(object):
+    """ Data created once per test class, before the snapshot """
+
+    def __init__(self, users: int = 0, questions: int = 0, answers_per_question: int = 0, reward: int = ICX):
+        if questions > users:
+            raise ValueError('A new user can only have a single opened question')
+        if answers_per_question >= max(users, 1):
+            raise ValueError('Each answer of a question must come from a different user than the asker')
+        self.users = users
+        self.questions = questions
+        self.answers_per_question = answers_per_question
+        self.reward = reward
+
+
+def event_uid(tx_result: dict, event: str) -> int:
+    """ Returns the uid indexed by the given event of a transaction result """
+    for log in tx_result['eventLogs']:
+        if log['indexed'][0].startswith(f'{event}('):
+            return int(log['indexed'][1], 16)
+    raise AssertionError(tx_result)
+
+
+class SeedClock(object):
+    """ Block timestamps used while seeding : every answer moves the clock past the answer
+        cooldown, so the users can answer several questions without waiting for it.
+        The clock starts in the past, and ends up around the real time. """
+
+    # Time between two blocks, in microseconds
+    BLOCK_INTERVAL = 1000
+
+    def __init__(self, blocks: int, answers: int):
+        duration = blocks * SeedClock.BLOCK_INTERVAL + answers * ANSWER_COOLDOWN
+        self._timestamp = icon_integrate_test.create_timestamp() - duration
+
+    def __call__(self) -> int:
+        self._timestamp += SeedClock.BLOCK_INTERVAL
+        return self._timestamp
+
+    def skip_answer_cooldown(self) -> None:
+        self._timestamp += ANSWER_COOLDOWN
+
+
+class SpeakyToFixtureTests(SpeakyToTests):
+    """
+        Deploys SpeakyTo and its IRC2 experience contract, and seeds the DATASET, once per test class.
+        The local state is then snapshotted, and restored before each test instead of redeploying.
+
+        Available in the tests :
+         - self._score_address, self._irc2_address
+         - self._users : the wallets of the seeded users, each one owning a user account
+         - self._question_uids : the seeded questions
+         - self._answer_uids : the seeded answers of each question, by question uid
+
+        The snapshot reopens the local engine the way IconIntegrateTestBase.setUp opens it,
+        and restores its block height. IconIntegrateTestBase has no public API for this, so the
+        fixtures rely on these private members of tbears 1.6.1, pinned in tests/requirements.txt :
+         - _score_root_path, _state_db_root_path : the local state directories
+         - _make_init_config, _mock_rc_proxy : the engine configuration and the mocked reward calculator
+         - _network_only, _tx_results : reset on a restored engine
+         - _block_height, _prev_block_hash : the last block of the snapshot
+    """
+
+    DATASET = SeedDataset()
+
+    # ICX given to each seeded user at genesis
+    USER_BALANCE = 1_000 * ICX
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._snapshot_path = f'.testsnapshot_{cls.__name__}'
+        cls._snapshot = None
+
+    @classmethod
+    def tearDownClass(cls):
+        root_clear(cls._snapshot_path, cls._snapshot_path)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.icon_service = None
+        self._operator = self._test1
+
+        if self._snapshot is None:
+            super().setUp(genesis_accounts=self._genesis_accounts())
+            self._seed()
+            self._take_snapshot()
+        else:
+            # Only initializes the test attributes, the engine is opened on the restored state
+            super().setUp(network_only=True)
+            self._restore_snapshot()
+
+        snapshot = self._snapshot
+        self._block_height, self._prev_block_hash = snapshot['block_height'], snapshot['prev_block_hash']
+        self._score_address, self._irc2_address = snapshot['score_address'], snapshot['irc2_address']
+        self._question_uids = list(snapshot['question_uids'])
+        self._answer_uids = {uid: list(answers) for uid, answers in snapshot['answer_uids'].items()}
+        self._users = self._wallet_array[:self.DATASET.users]
+
+    # ================================================
+    #  Snapshot
+    # ================================================
+    def _open_engine(self) -> None:
+        config = IconConfig("", default_icon_config)
+        config.load()
+        config.update_conf({ConfigKey.BUILTIN_SCORE_OWNER: self._test1.get_address()})
+        config.update_conf({ConfigKey.SCORE_ROOT_PATH: self._score_root_path,
+                            ConfigKey.STATE_DB_ROOT_PATH: self._state_db_root_path})
+        config.update_conf(self._make_init_config())
+
+        self.icon_service_engine = IconServiceEngine()
+        self._mock_rc_proxy()
+        self.icon_service_engine.open(config)
+
+    def _take_snapshot(self) -> None:
+        # The state DB cannot be copied while the engine holds it
+        self.icon_service_engine.close()
+        root_clear(self._snapshot_path, self._snapshot_path)
+        copytree(self._score_root_path, path.join(self._snapshot_path, 'score'))
+        copytree(self._state_db_root_path, path.join(self._snapshot_path, 'statedb'))
+        self._open_engine()
+
+        type(self)._snapshot = {
+            'block_height': self._block_height,
+            'prev_block_hash': self._prev_block_hash,
+            'score_address': self._score_address,
+            'irc2_address': self._irc2_address,
+            'question_uids': self._question_uids,
+            'answer_uids': self._answer_uids
+        }
+
+    def _restore_snapshot(self) -> None:
+        self._network_only = False
+        self._tx_results = {}
+        root_clear(self._score_root_path, self._state_db_root_path)
+        copytree(path.join(self._snapshot_path, 'score'), self._score_root_path)
+        copytree(path.join(self._snapshot_path, 'statedb'), self._state_db_root_path)
+        self._open_engine()
+
+    # ================================================
+    #  Seed
+    # ================================================
+    def _genesis_accounts(self) -> list:
+        return [Account(f'user{index}', Address.from_string(wallet.get_address()), self.USER_BALANCE)
+                for index, wallet in enumerate(self._wallet_array[:self.DATASET.users])]
+
+    def _seed(self) -> None:
+        dataset = self.DATASET
+        self._score_address = self._deploy_score(SCORE_PROJECT)['scoreAddress']
+        self._irc2_address = self._deploy_irc2(IRC2_PROJECT)['scoreAddress']
+        transaction_call_success(self, self._test1, self._score_address, 'set_experience_contract',
+                                 {'address': self._irc2_address})
+        transaction_call_success(self, self._test1, self._irc2_address, 'set_treasurer',
+                                 {'_treasurer': self._score_address})
+
+        self._question_uids = []
+        self._answer_uids = {}
+
+        answers = dataset.questions * dataset.answers_per_question
+        clock = SeedClock(dataset.users + dataset.questions + answers, answers)
+        with patch.object(icon_integrate_test, 'create_timestamp', clock):
+            users = self._wallet_array[:dataset.users]
+            for index, user in enumerate(users):
+                transaction_call_success(self, user, self._score_address, 'create_user_account',
+                                         {'avatar_uid': 1, 'username': f'user{index}'})
+
+            for index in range(dataset.questions):
+                tx_result = transaction_call_success(
+                    self, users[index], self._score_address, 'create_question_level1',
+                    {'data': f'question {index}', 'from_language': 'en', 'to_language': 'fr'}, dataset.reward)
+                question_uid = event_uid(tx_result, 'QuestionCreatedEvent')
+                self._question_uids.append(question_uid)
+                self._answer_uids[question_uid] = []
+
+            for index, question_uid in enumerate(self._question_uids):
+                for answer in range(dataset.answers_per_question):
+                    clock.skip_answer_cooldown()
+                    answerer = users[(index + 1 + answer) % len(users)]
+                    tx_result = transaction_call_success(
+                        self, answerer, self._score_address, 'answer_question',
+                        {'question_uid': question_uid, 'data': f'answer {answer}'})
+                    self._answer_uids[question_uid].append(event_uid(tx_result, 'AnswerCreatedEvent'))
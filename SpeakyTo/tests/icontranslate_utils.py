@@ -1,12 +1,20 @@
 from iconsdk.builder.transaction_builder import DeployTransactionBuilder
-from tbears.libs.icon_integrate_test import IconIntegrateTestBase, SCORE_INSTALL_ADDRESS
+from tbears.libs import icon_integrate_test
+from tbears.libs.icon_integrate_test import IconIntegrateTestBase, SCORE_INSTALL_ADDRESS, Account
 from iconsdk.libs.in_memory_zip import gen_deploy_data_content
 from iconsdk.signed_transaction import SignedTransaction
+from unittest.mock import patch
 from SpeakyTo.tests.utils import *
 import json
 
 ICX_CONTRACT = 'cx0000000000000000000000000000000000000000'
 
+DIR_PATH = path.abspath(path.dirname(__file__))
+SCORE_PROJECT = path.abspath(path.join(DIR_PATH, '..'))
+IRC2_PROJECT = path.join(DIR_PATH, 'irc2')
+
+ICX = 10 ** 18
+
 
 class SpeakyToTests(IconIntegrateTestBase):
 
@@ -65,3 +73,78 @@ class SpeakyToTests(IconIntegrateTestBase):
         self.assertTrue('scoreAddress' in result)
 
         return result
+
+    def _success(self, from_: KeyWallet, method: str, params: dict = None, value: int = 0) -> dict:
+        return transaction_call_success(self, from_, self._score_address, method, params, value, self.icon_service)
+
+    def _error(self, from_: KeyWallet, method: str, params: dict = None, value: int = 0) -> dict:
+        tx_result = transaction_call_error(self, from_, self._score_address, method, params, value, self.icon_service)
+        self.assertEqual(0, tx_result['status'], tx_result)
+        return tx_result
+
+    def _call(self, method: str, params: dict = None):
+        return icx_call(self, self._test1.get_address(), self._score_address, method, params, self.icon_service)
+
+
+class BlockClock(object):
+    """ Timestamps of the local blocks, moved forward by the tests to skip a delay """
+
+    # Time between two blocks, in microseconds
+    BLOCK_INTERVAL = 1000
+
+    def __init__(self):
+        self._timestamp = icon_integrate_test.create_timestamp()
+
+    def __call__(self) -> int:
+        self._timestamp += BlockClock.BLOCK_INTERVAL
+        return self._timestamp
+
+    def skip(self, microseconds: int) -> None:
+        self._timestamp += microseconds
+
+
+class SpeakyToIntegrateTests(SpeakyToTests):
+    """
+        Deploys SpeakyTo and its IRC2 experience contract on a new local state before each test.
+
+        Available in the tests :
+         - self._score_address, self._irc2_address
+         - self._test1 : the wallet owning both contracts, the IRC2 initial supply is its experience treasury
+         - self._users : USERS wallets, each one given USER_BALANCE and owning a user account
+         - self._clock : the timestamps of the next blocks
+    """
+
+    USERS = 0
+
+    USER_BALANCE = 1_000 * ICX
+
+    def setUp(self):
+        self.icon_service = None
+        self._operator = self._test1
+        self._users = self._wallet_array[:self.USERS]
+
+        self._clock = BlockClock()
+        clock = patch.object(icon_integrate_test, 'create_timestamp', self._clock)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+        super().setUp(genesis_accounts=[
+            Account(f'user{index}', Address.from_string(user.get_address()), self.USER_BALANCE)
+            for index, user in enumerate(self._users)
+        ])
+
+        self._score_address = self._deploy_score(SCORE_PROJECT)['scoreAddress']
+        self._irc2_address = self._deploy_irc2(IRC2_PROJECT)['scoreAddress']
+        self._success(self._test1, 'set_experience_contract', {'address': self._irc2_address})
+        transaction_call_success(self, self._test1, self._irc2_address, 'set_treasurer',
+                                 {'_treasurer': self._score_address})
+
+        for index, user in enumerate(self._users):
+            self._success(user, 'create_user_account', {'avatar_uid': 1, 'username': f'user{index}'})
+
+    def _balance(self, user: KeyWallet) -> int:
+        return get_icx_balance(self, user.get_address(), self.icon_service)
+
+    def _experience(self, user: KeyWallet) -> int:
+        """ Returns the experience token balance of a user """
+        return get_irc2_balance(self, user.get_address(), self._irc2_address, self.icon_service)
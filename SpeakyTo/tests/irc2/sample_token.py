@@ -46,6 +46,7 @@ class SampleToken(IconScoreBase, TokenStandard):
     _DECIMALS = 'decimals'
     _TOTAL_SUPPLY = 'total_supply'
     _BALANCES = 'balances'
+    _TREASURER = 'treasurer'
 
     @eventlog(indexed=3)
     def Transfer(self, _from: Address, _to: Address, _value: int, _data: bytes):
@@ -58,6 +59,7 @@ class SampleToken(IconScoreBase, TokenStandard):
         self._decimals = VarDB(self._DECIMALS, db, value_type=int)
         self._total_supply = VarDB(self._TOTAL_SUPPLY, db, value_type=int)
         self._balances = DictDB(self._BALANCES, db, value_type=int)
+        self._treasurer = VarDB(self._TREASURER, db, value_type=Address)
 
     def on_install(self, _name: str, _symbol: str, _decimals: int, _initialSupply: int) -> None:
         super().on_install()
@@ -108,6 +110,54 @@ class SampleToken(IconScoreBase, TokenStandard):
             _data = b'None'
         self._transfer(self.msg.sender, _to, _value, _data)
 
+    # The treasury is the balance of the token owner.
+    # It is moved by the owner, or by the treasurer set by the owner, such as the SpeakyTo SCORE
+    @external(readonly=True)
+    def treasurer(self) -> Address:
+        return self._treasurer.get()
+
+    @external
+    def set_treasurer(self, _treasurer: Address):
+        if self.msg.sender != self.owner:
+            revert("Only the owner can set the treasurer")
+        self._treasurer.set(_treasurer)
+
+    @external
+    def treasury_withdraw(self, _dest: Address, _value: int):
+        self._check_treasurer()
+        self._transfer(self.owner, _dest, _value, b'treasury_withdraw')
+
+    @external
+    def treasury_deposit(self, _src: Address, _value: int):
+        self._check_treasurer()
+        self._transfer(_src, self.owner, _value, b'treasury_deposit')
+
+    @external
+    def treasury_batch_withdraw(self, _addresses: str, _amounts: str):
+        self._check_treasurer()
+        for address, amount in self._batch(_addresses, _amounts):
+            self._transfer(self.owner, address, amount, b'treasury_withdraw')
+
+    @external
+    def treasury_batch_deposit(self, _addresses: str, _amounts: str):
+        self._check_treasurer()
+        for address, amount in self._batch(_addresses, _amounts):
+            self._transfer(address, self.owner, amount, b'treasury_deposit')
+
+    def _check_treasurer(self):
+        if self.msg.sender != self.owner and self.msg.sender != self._treasurer.get():
+            revert("Only the owner and the treasurer can move the treasury funds")
+
+    @staticmethod
+    def _batch(_addresses: str, _amounts: str) -> list:
+        addresses = json_loads(_addresses)
+        amounts = json_loads(_amounts)
+
+        if len(addresses) != len(amounts):
+            revert("Addresses and amounts must have the same length")
+
+        return [(Address.from_string(address), amount) for address, amount in zip(addresses, amounts)]
+
     def _transfer(self, _from: Address, _to: Address, _value: int, _data: bytes):
 
         # Checks the sending value and balance.
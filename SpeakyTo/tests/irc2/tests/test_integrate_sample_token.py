@@ -1,3 +1,4 @@
+import json
 import os
 
 from iconsdk.builder.transaction_builder import (
@@ -181,3 +182,77 @@ class TestSampleToken(IconIntegrateTestBase):
 
         # check balance of receiver
         self.assertEqual(hex(value), response)
+
+    def _send_transaction(self, from_, method: str, params: dict) -> dict:
+        # Generates an instance of transaction for calling method in SCORE.
+        transaction = CallTransactionBuilder() \
+            .from_(from_.get_address()) \
+            .to(self._score_address) \
+            .step_limit(10_000_000) \
+            .nid(3) \
+            .nonce(100) \
+            .method(method) \
+            .params(params) \
+            .build()
+
+        # Returns the signed transaction object having a signature
+        signed_transaction = SignedTransaction(transaction, from_)
+
+        # Sends the transaction to the network
+        return self.process_transaction(signed_transaction, self.icon_service)
+
+    def _balance_of(self, owner: str) -> str:
+        call = CallBuilder().from_(self._test1.get_address()) \
+            .to(self._score_address) \
+            .method("balanceOf") \
+            .params({'_owner': owner}) \
+            .build()
+
+        return self.process_call(call, self.icon_service)
+
+    def test_treasury_withdraw_by_the_treasurer(self):
+        treasurer, dest = self._wallet_array[0], self._wallet_array[1].get_address()
+
+        tx_result = self._send_transaction(self._test1, 'set_treasurer', {'_treasurer': treasurer.get_address()})
+        self.assertEqual(1, tx_result['status'])
+
+        tx_result = self._send_transaction(treasurer, 'treasury_withdraw', {'_dest': dest, '_value': 100})
+        self.assertEqual(1, tx_result['status'])
+        self.assertEqual(hex(100), self._balance_of(dest))
+
+        tx_result = self._send_transaction(treasurer, 'treasury_deposit', {'_src': dest, '_value': 40})
+        self.assertEqual(1, tx_result['status'])
+        self.assertEqual(hex(60), self._balance_of(dest))
+
+    def test_treasury_is_not_moved_by_an_outsider(self):
+        outsider = self._wallet_array[0]
+
+        tx_result = self._send_transaction(outsider, 'treasury_withdraw',
+                                           {'_dest': outsider.get_address(), '_value': 100})
+        self.assertEqual(0, tx_result['status'])
+        self.assertEqual(hex(0), self._balance_of(outsider.get_address()))
+
+        # The outsider cannot become the treasurer either
+        tx_result = self._send_transaction(outsider, 'set_treasurer', {'_treasurer': outsider.get_address()})
+        self.assertEqual(0, tx_result['status'])
+
+    def test_treasury_batch_by_the_owner(self):
+        dests = [wallet.get_address() for wallet in self._wallet_array[:2]]
+
+        tx_result = self._send_transaction(self._test1, 'treasury_batch_withdraw',
+                                           {'_addresses': json.dumps(dests), '_amounts': json.dumps([100, 200])})
+        self.assertEqual(1, tx_result['status'])
+        self.assertEqual([hex(100), hex(200)], [self._balance_of(dest) for dest in dests])
+
+        tx_result = self._send_transaction(self._test1, 'treasury_batch_deposit',
+                                           {'_addresses': json.dumps(dests), '_amounts': json.dumps([40, 200])})
+        self.assertEqual(1, tx_result['status'])
+        self.assertEqual([hex(60), hex(0)], [self._balance_of(dest) for dest in dests])
+
+    def test_treasury_batch_is_not_moved_by_an_outsider(self):
+        outsider = self._wallet_array[0]
+        params = {'_addresses': json.dumps([outsider.get_address()]), '_amounts': json.dumps([100])}
+
+        tx_result = self._send_transaction(outsider, 'treasury_batch_withdraw', params)
+        self.assertEqual(0, tx_result['status'])
+        self.assertEqual(hex(0), self._balance_of(outsider.get_address()))
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from iconservice import *
+from iconservice.icon_constant import IconScoreContextType
+from iconservice.iconscore.icon_score_context import ContextContainer, IconScoreContext
+
+
+class MemoryStorage(object):
+    """ Flat key-value storage shared by the MemoryDatabase instances """
+
+    def __init__(self):
+        self._items = {}
+        self.counts = {'get': 0, 'put': 0, 'delete': 0}
+
+    def get(self, key: bytes) -> bytes:
+        self.counts['get'] += 1
+        return self._items.get(key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self.counts['put'] += 1
+        self._items[key] = value
+
+    def delete(self, key: bytes) -> None:
+        self.counts['delete'] += 1
+        self._items.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stored_bytes(self) -> int:
+        """ Returns the size of all the keys and values stored """
+        return sum(len(key) + len(value) for key, value in self._items.items())
+
+    def value_bytes(self) -> int:
+        """ Returns the size of all the values stored.
+            This is what the SET steps are charged on : the keys are not billed """
+        return sum(len(value) for value in self._items.values())
+
+
+class MemoryDatabase(object):
+    """ In-memory stand-in for IconScoreDatabase.
+        Keys are laid out the same way IconScoreDatabase does, so the stored sizes are comparable.
+    """
+
+    def __init__(self, address: Address, storage: MemoryStorage = None, prefix: bytes = None):
+        self.address = address
+        self.storage = storage if storage is not None else MemoryStorage()
+        self._prefix = prefix
+        self._prefix_key = b'|'.join([address.to_bytes()] + ([prefix] if prefix is not None else []))
+
+    def _key(self, key: bytes) -> bytes:
+        return b'|'.join((self._prefix_key, key))
+
+    def get(self, key: bytes) -> bytes:
+        return self.storage.get(self._key(key))
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self.storage.put(self._key(key), value)
+
+    def delete(self, key: bytes) -> None:
+        self.storage.delete(self._key(key))
+
+    def get_sub_db(self, prefix: bytes) -> 'MemoryDatabase':
+        if self._prefix is not None:
+            prefix = b'|'.join((self._prefix, prefix))
+        return MemoryDatabase(self.address, self.storage, prefix)
+
+    def set_observer(self, observer) -> None:
+        pass
+
+
+class MemoryStepCounter(object):
+    """ Step counter stand-in : the SCORE APIs (sha3_256, json_dumps...) are free of charge """
+
+    def get_step_cost(self, step_type) -> int:
+        return 0
+
+    def consume_step(self, step_type, step: int) -> None:
+        pass
+
+    def apply_step(self, step_type, count: int) -> None:
+        pass
+
+
+def push_memory_context(context_type: IconScoreContextType = IconScoreContextType.INVOKE) -> IconScoreContext:
+    """ Pushes the minimal running context required by ArrayDB and the SCORE APIs """
+    context = IconScoreContext(context_type)
+    context.revision = 10
+    context.step_counter = MemoryStepCounter()
+    ContextContainer._push_context(context)
+    return context
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+Storage footprint of the question and answer payloads, with and without the payloads store.
+
+Two sizes are reported : the values size, which is what the SET steps are charged on,
+and the keys + values size, which is what the nodes actually store.
+
+The dataset mimics the SpeakyTo usage : level 1 vocabulary questions asked
+in several language pairs, mostly answered with the same few translations,
+plus generic short answers ("yes", "I don't know"...) and some free text.
+
+Usage : python -m SpeakyTo.tests.reports.payload_footprint [--questions N] [--answers N] [--json]
+"""
+
+import argparse
+import json
+import random
+
+from iconservice import *
+from SpeakyTo.speakyto.question import *
+from SpeakyTo.speakyto.answer import *
+from SpeakyTo.tests.memory_db import *
+
+SCORE_ADDRESS = Address.from_string('cx' + '0' * 40)
+
+WORDS = [
+    'hello', 'goodbye', 'thank you', 'please', 'sorry', 'water', 'bread', 'train station',
+    'how much is it', 'where is the toilet', 'good morning', 'good night', 'cheers', 'excuse me',
+    'I love you', 'nice to meet you', 'see you later', 'help', 'left', 'right',
+]
+LANGUAGES = ['en', 'es', 'zh', 'fr', 'de', 'ko', 'ru', 'ja']
+GENERIC_ANSWERS = ['yes', 'no', "I don't know", 'same as above', '+1', 'it depends on the context']
+SENTENCE = 'Could you explain when to use "{word}" in a formal conversation, with a polite example ?'
+EXPLANATION = ('"{word}" is mostly used in {language}, in both formal and casual situations. '
+               'In a formal context, prefer the full form and add a polite ending. Example #{index} : ')
+
+
+def _text(rng: random.Random, length: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(length // 8))
+
+
+def generate_dataset(questions: int, answers: int, seed: int) -> list:
+    """ Returns a list of (question data, [answers data]).
+        50% are level 1 questions (a word or an expression), mostly answered with the same
+        few translations ; 30% are level 2 questions (a sentence) answered with explanations
+        partly copied from each other ; 20% are level 4/5 free texts, answered with free texts.
+        Every question also gets a few generic short answers.
+    """
+    rng = random.Random(seed)
+    dataset = []
+    for _ in range(questions):
+        word = rng.choice(WORDS)
+        language = rng.choice(LANGUAGES)
+        level = rng.random()
+        count = rng.randint(0, 2 * answers)
+
+        if level < 0.5:
+            question_data = word
+            # A handful of accepted translations per word and language
+            candidates = [f'{word} ({language} #{index})' for index in range(3)]
+        elif level < 0.8:
+            question_data = SENTENCE.format(word=word)
+            candidates = [EXPLANATION.format(word=word, language=language, index=index) for index in range(4)]
+        else:
+            question_data = _text(rng, rng.randint(200, 2000))
+            candidates = None
+
+        question_answers = []
+        for _ in range(count):
+            if rng.random() < 0.2:
+                question_answers.append(rng.choice(GENERIC_ANSWERS))
+            elif candidates is None or rng.random() < 0.2:
+                question_answers.append(_text(rng, rng.randint(20, 400)))
+            else:
+                question_answers.append(rng.choice(candidates))
+        dataset.append((question_data, question_answers))
+    return dataset
+
+
+def store_inline(db: MemoryDatabase, dataset: list) -> None:
+    """ Layout used before the payloads store : the data is stored in each entity """
+    question_factory, answer_factory = QuestionFactory(db), AnswerFactory(db)
+    for question_data, answers in dataset:
+        question_uid = question_factory.get_uid()
+        VarDB(f'{Question._NAME}_{question_uid}_DATA', db, value_type=str).set(question_data)
+        for answer_data in answers:
+            VarDB(f'{Answer._NAME}_{answer_factory.get_uid()}_DATA', db, value_type=str).set(answer_data)
+
+
+def store_interned(db: MemoryDatabase, dataset: list) -> None:
+    """ Current layout : the entities only reference the payload UID """
+    question_factory, answer_factory = QuestionFactory(db), AnswerFactory(db)
+    for question_data, answers in dataset:
+        question_uid = question_factory.get_uid()
+        Question(question_uid, db)._data.set(question_data)
+        for answer_data in answers:
+            Answer(answer_factory.get_uid(), db)._data.set(answer_data)
+
+
+def measure(store, dataset: list) -> dict:
+    db = MemoryDatabase(SCORE_ADDRESS)
+    store(db, dataset)
+    return {
+        'keys': len(db.storage),
+        'value_bytes': db.storage.value_bytes(),
+        'stored_bytes': db.storage.stored_bytes()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=10000)
+    parser.add_argument('--answers', type=int, default=5, help='Average count of answers per question')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='Machine readable output')
+    args = parser.parse_args()
+    push_memory_context()
+
+    dataset = generate_dataset(args.questions, args.answers, args.seed)
+    payloads = [question for question, _ in dataset] + [answer for _, answers in dataset for answer in answers]
+    inline = measure(store_inline, dataset)
+    interned = measure(store_interned, dataset)
+
+    report = {
+        'payloads': len(payloads),
+        'unique_payloads': len(set(payloads)),
+        'payload_bytes': sum(len(payload.encode('utf-8')) for payload in payloads),
+        'inline': inline,
+        'interned': interned,
+    }
+    for metric in ('value_bytes', 'stored_bytes'):
+        report[f'saved_{metric}'] = inline[metric] - interned[metric]
+        report[f'saved_{metric}_ratio'] = round(1 - interned[metric] / inline[metric], 4)
+
+    if args.json:
+        print(json.dumps(report))
+        return
+
+    print(f"payloads       : {report['payloads']} ({report['unique_payloads']} unique, {report['payload_bytes']} bytes)")
+    print(f"{'':16}{'keys':>10}{'values (billed)':>18}{'keys + values':>16}")
+    for name, footprint in (('inline', inline), ('payloads store', interned)):
+        print(f"{name:16}{footprint['keys']:>10}{footprint['value_bytes']:>18}{footprint['stored_bytes']:>16}")
+    print(f"{'saved':16}{'':>10}"
+          f"{report['saved_value_bytes_ratio']:>18.1%}{report['saved_stored_bytes_ratio']:>16.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import unittest
+
+from SpeakyTo.scorelib.blob import *
+from SpeakyTo.tests.memory_db import *
+
+SCORE_ADDRESS = Address.from_string('cx' + '0' * 40)
+
+
+class TestBlob(unittest.TestCase):
+
+    def setUp(self):
+        push_memory_context()
+        self.db = MemoryDatabase(SCORE_ADDRESS)
+        self.blob = BlobDB('TEST', self.db, chunk_size=4)
+
+    def tearDown(self):
+        ContextContainer._pop_context()
+
+    def test_chunks(self):
+        self.blob.set('abcdefghij')
+        self.assertEqual((10, 3), (len(self.blob), self.blob.chunks_count()))
+        self.assertEqual(['abcd', 'efgh', 'ij'], [self.blob.chunk(index) for index in range(3)])
+        self.assertEqual('ab', self.blob.preview(2))
+        self.assertEqual('abcdefghij', self.blob.get())
+        self.assertRaises(BlobChunkNotFound, self.blob.chunk, 3)
+
+    def test_empty_blob_has_a_chunk(self):
+        keys = len(self.db.storage)
+        self.blob.set('')
+        self.assertEqual(('', 1), (self.blob.chunk(0), self.blob.chunks_count()))
+        # Only the length is stored
+        self.assertEqual(keys + 1, len(self.db.storage))
+
+    def test_shorter_content_removes_the_chunks_left(self):
+        keys = len(self.db.storage)
+        self.blob.set('abcdefghij')
+        self.blob.set('xyz')
+        self.assertEqual('xyz', self.blob.get())
+        self.assertEqual(keys + 2, len(self.db.storage))
+
+        self.blob.delete()
+        self.assertEqual(keys, len(self.db.storage))
+
+
+if __name__ == '__main__':
+    unittest.main()
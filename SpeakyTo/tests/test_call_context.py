@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import patch
+
+from SpeakyTo.speakyto.call_context import *
+from SpeakyTo.tests.memory_db import *
+
+SCORE_ADDRESS = Address.from_string('cx' + '0' * 40)
+SENDER = Address.from_string('hx' + '1' * 40)
+
+
+class FakeExperienceInterface:
+    """ Stands for the IRC2 experience token : every account has the same balance """
+
+    def __init__(self, balance: int):
+        self.balance = balance
+        self.calls = 0
+
+    def balanceOf(self, _owner: Address) -> int:
+        self.calls += 1
+        return self.balance
+
+
+class TestCallContext(unittest.TestCase):
+    """ The sender of a call is resolved once, and shared by the helpers """
+
+    def setUp(self):
+        push_memory_context()
+        self.db = MemoryDatabase(SCORE_ADDRESS)
+        self.interface = FakeExperienceInterface(0)
+        self.interfaces = 0
+
+    def tearDown(self):
+        ContextContainer._pop_context()
+
+    def _experience_interface(self):
+        self.interfaces += 1
+        return self.interface
+
+    def _context(self, sender: Address) -> CallContext:
+        return CallContext(self.db, sender, self._experience_interface)
+
+    def _create_account(self, address: Address) -> int:
+        user_uid = UserAccountFactory(self.db).create(address, 0, 'user')
+        UserAccounts(self.db).add(user_uid, address)
+        return user_uid
+
+    def test_sender_is_resolved_once(self):
+        user_uid = self._create_account(SENDER)
+        context = self._context(SENDER)
+        self.assertEqual(user_uid, context.user_uid())
+
+        with patch.object(self.db.storage, 'get', wraps=self.db.storage.get) as get:
+            self.assertEqual(user_uid, context.user_uid())
+            self.assertIs(context.user(), context.user())
+            get.assert_not_called()
+
+    def test_experience_is_read_once(self):
+        self._create_account(SENDER)
+        self.interface.balance = 4000
+        ExperienceSystem(self.interface, self.db).reconcile(1)
+        context = self._context(SENDER)
+        self.assertEqual(3, context.level())
+        self.assertEqual(4000, context.experience())
+        calls = self.interface.calls
+
+        self.assertEqual(3, context.level())
+        self.assertEqual(4000, context.experience())
+        context.experience_system()
+        context.level_system()
+        self.assertEqual(1, self.interfaces)
+        self.assertEqual(calls, self.interface.calls)
+
+    def test_sender_without_account(self):
+        context = self._context(SENDER)
+        self.assertRaises(UserAccountDoesntExist, context.user_uid)
+        self.assertEqual(0, self.interfaces)
+
+
+if __name__ == '__main__':
+    unittest.main()
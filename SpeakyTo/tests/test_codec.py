@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from SpeakyTo.scorelib.codec import *
+
+
+class TestLZSS(unittest.TestCase):
+
+    def _round_trip(self, data: bytes) -> bytes:
+        compressed = LZSS.compress(data)
+        self.assertEqual(data, LZSS.decompress(compressed))
+        return compressed
+
+    def test_short_inputs(self):
+        for data in [b'', b'a', b'ab', b'abc', b'abcabc']:
+            self._round_trip(data)
+        self.assertEqual(b'', LZSS.compress(b''))
+        # A flag byte, then the literals
+        self.assertEqual(b'\x00ab', LZSS.compress(b'ab'))
+
+    def test_overlapping_run(self):
+        compressed = self._round_trip(b'a' * 1000)
+        self.assertLess(len(compressed), 200)
+
+    def test_longest_match(self):
+        data = b'0123456789abcdefghij' * 10
+        compressed = self._round_trip(data)
+        # 20 literals, then 10 references of the maximum length, and the flag bytes
+        self.assertEqual(1 + 20 + 3 + 10 * 2, len(compressed))
+
+    def test_window_boundary(self):
+        rng = random.Random(0)
+        block = bytes(rng.randrange(256) for _ in range(32))
+        for gap in [LZSS._WINDOW_SIZE - 32, LZSS._WINDOW_SIZE - 31, LZSS._WINDOW_SIZE]:
+            filler = bytes(rng.randrange(256) for _ in range(gap))
+            self._round_trip(block + filler + block)
+
+    def test_flag_groups_end_inside_a_group(self):
+        for size in range(1, 20):
+            self._round_trip(bytes(range(size)) + bytes(range(size)))
+
+
+class TestPayloadCodec(unittest.TestCase):
+
+    def test_small_payloads_are_raw(self):
+        encoded = PayloadCodec.encode('a' * (COMPRESSION_THRESHOLD - 1))
+        self.assertEqual(Codec.RAW, encoded[0])
+        self.assertEqual('a' * (COMPRESSION_THRESHOLD - 1), PayloadCodec.decode(encoded))
+
+    def test_large_payloads_are_compressed(self):
+        payload = 'héllo wörld ' * COMPRESSION_THRESHOLD
+        encoded = PayloadCodec.encode(payload)
+        self.assertEqual(Codec.LZSS, encoded[0])
+        self.assertLess(len(encoded), len(payload.encode('utf-8')) // 4)
+        self.assertEqual(payload, PayloadCodec.decode(encoded))
+
+    def test_incompressible_payloads_stay_raw(self):
+        rng = random.Random(0)
+        payload = ''.join(chr(rng.randrange(0x4e00, 0x9fff)) for _ in range(COMPRESSION_THRESHOLD))
+        encoded = PayloadCodec.encode(payload)
+        self.assertEqual(Codec.RAW, encoded[0])
+        self.assertEqual(payload, PayloadCodec.decode(encoded))
+
+    def test_decode(self):
+        self.assertEqual('', PayloadCodec.decode(b''))
+        self.assertRaises(UnknownCodec, PayloadCodec.decode, b'\x07data')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+from SpeakyTo.speakyto.consts import DATA_PREVIEW_LENGTH
+from SpeakyTo.tests.emulator import *
+
+
+class TestEmulator(EmulatorTestCase):
+
+    USERS = 2
+
+    def setUp(self):
+        super().setUp()
+        self.asker, self.answerer = self.users
+
+    def test_question_lifecycle(self):
+        result = self._transaction_success(self.asker, 'create_question_level1',
+                                           {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        event = result['eventLogs'][0]
+        self.assertEqual('QuestionCreatedEvent(int,int,str,int,int,int,str,int)', event['indexed'][0])
+        self.assertEqual('en-fr', event['indexed'][3])
+        self.assertEqual([hex(1), hex(ICX), hex(0), 'hello', hex(5)], event['data'])
+        question_uid = event['indexed'][1]
+        self.assertEqual(99 * ICX, self.emulator.get_balance(self.asker))
+
+        self._transaction_success(self.answerer, 'answer_question', {'question_uid': question_uid, 'data': 'bonjour'})
+        answer = self.emulator.icx_call(self.asker, self.speakyto, 'get_answers',
+                                        {'question_uid': question_uid, 'offset': '0x0'})[0]
+        self._transaction_success(self.asker, 'select_answer', {'answer_uid': answer['uid']})
+
+        question = self.emulator.icx_call(self.asker, self.speakyto, 'get_question', {'question_uid': question_uid})
+        self.assertEqual('ANSWERED', question['state'])
+        self.assertEqual(answer['uid'], question['answer_uid'])
+
+        self._transaction_success(self.answerer, 'claim_rewards')
+        self.assertEqual(101 * ICX, self.emulator.get_balance(self.answerer))
+
+    def test_failed_transaction_rolls_back(self):
+        result = self.emulator.transaction_call(self.asker, self.speakyto, 'create_user_account',
+                                                {'avatar_uid': '0x1', 'username': 'again'})
+        self.assertEqual('0x0', result['status'])
+        self.assertIn('UserAccountAlreadyExists', result['failure']['message'])
+
+        result = self.emulator.transaction_call(self.asker, self.speakyto, 'create_question_level1',
+                                                {'data': 'x' * 10000, 'from_language': 'en', 'to_language': 'fr'},
+                                                ICX)
+        self.assertEqual('0x0', result['status'])
+        self.assertEqual(100 * ICX, self.emulator.get_balance(self.asker))
+        self.assertEqual([], self.emulator.query(self.speakyto, 'get_questions', {'offset': 0}))
+
+    def test_state_changes_are_logged(self):
+        events = self._events
+        result = self._transaction_success(self.asker, 'create_question_level1',
+                                           {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        question_uid = events(result)['QuestionCreatedEvent']['indexed'][1]
+        user_uid = events(result)['QuestionCreatedEvent']['indexed'][2]
+        self.assertEqual(user_uid, events(result)['ExperienceChangedEvent']['indexed'][1])
+
+        result = self._transaction_success(self.asker, 'cancel_question', {'question_uid': question_uid})
+        cancelled = events(result)['QuestionCancelledEvent']
+        self.assertEqual([question_uid, user_uid], cancelled['indexed'][1:])
+        self.assertEqual([hex(ICX)], cancelled['data'])
+        self.assertEqual([hex(0), hex(1)], events(result)['ExperienceChangedEvent']['data'])
+
+        result = self._transaction_success(self.asker, 'set_user_username', {'username': 'renamed'})
+        self.assertEqual(['renamed', hex(1)], events(result)['UserAccountUpdatedEvent']['data'])
+
+        result = self._transaction_success(self.asker, 'claim_rewards')
+        self.assertEqual([hex(ICX)], events(result)['RewardClaimedEvent']['data'])
+
+    def test_long_data_are_logged_as_a_preview(self):
+        self._success(self.asker, 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'})
+        data = 'salut ' * DATA_PREVIEW_LENGTH
+        result = self._transaction_success(self.answerer, 'answer_question', {'question_uid': 1, 'data': data})
+        self.assertEqual([data[:DATA_PREVIEW_LENGTH], hex(len(data))],
+                         self._events(result)['AnswerCreatedEvent']['data'])
+
+    def test_readonly_cannot_write(self):
+        with self.assertRaises(IconServiceBaseException):
+            self.emulator.query(self.speakyto, 'create_user_account', {'avatar_uid': 1, 'username': 'user'})
+
+
+if __name__ == '__main__':
+    unittest.main()
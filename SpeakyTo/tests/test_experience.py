@@ -0,0 +1,150 @@
+import unittest
+
+from SpeakyTo.speakyto.experience import *
+from SpeakyTo.tests.memory_db import *
+
+SCORE_ADDRESS = Address.from_string('cx' + '0' * 40)
+
+
+class FakeExperienceInterface:
+    """ Stands for the IRC2 experience token : records the calls made to it """
+
+    def __init__(self):
+        self.balances = {}
+        self.calls = []
+
+    def balanceOf(self, _owner: Address) -> int:
+        self.calls.append('balanceOf')
+        return self.balances.get(_owner, 0)
+
+    def treasury_withdraw(self, _to: Address, _value: int) -> None:
+        self.calls.append('treasury_withdraw')
+        self.balances[_to] = self.balances.get(_to, 0) + _value
+
+    def treasury_batch_withdraw(self, _addresses: str, _amounts: str) -> None:
+        self.calls.append('treasury_batch_withdraw')
+        for address, amount in zip(json_loads(_addresses), json_loads(_amounts)):
+            address = Address.from_string(address)
+            self.balances[address] = self.balances.get(address, 0) + amount
+
+    def treasury_batch_deposit(self, _addresses: str, _amounts: str) -> None:
+        self.calls.append('treasury_batch_deposit')
+        for address, amount in zip(json_loads(_addresses), json_loads(_amounts)):
+            address = Address.from_string(address)
+            self.balances[address] = self.balances.get(address, 0) - amount
+
+
+class TestExperienceTable(unittest.TestCase):
+
+    def test_get_level(self):
+        levels = {-1: 0, 0: 1, 999: 1, 1000: 2, 3999: 2, 4000: 3, 12000: 4, 23999: 4, 24000: 5, 40000: 6, 10 ** 9: 6}
+        for experience, level in levels.items():
+            self.assertEqual(level, ExperienceTable.get_level(experience), experience)
+
+    def test_is_in_level(self):
+        self.assertTrue(ExperienceTable.is_in_level(999, 1))
+        self.assertFalse(ExperienceTable.is_in_level(1000, 1))
+        self.assertFalse(ExperienceTable.is_in_level(999, 2))
+        self.assertTrue(ExperienceTable.is_in_level(10 ** 9, ExperienceTable.MAX_LEVEL))
+        # Level 0 : nothing cached yet
+        self.assertFalse(ExperienceTable.is_in_level(0, 0))
+
+
+class TestExperienceSystem(unittest.TestCase):
+
+    def setUp(self):
+        push_memory_context()
+        self.db = MemoryDatabase(SCORE_ADDRESS)
+        self.interface = FakeExperienceInterface()
+        self.experience = ExperienceSystem(self.interface, self.db)
+        self.users = []
+        for index in range(2):
+            address = Address.from_string('hx' + str(index + 1) * 40)
+            user_uid = UserAccountFactory(self.db).create(address, 0, f'user{index}')
+            UserAccounts(self.db).add(user_uid, address)
+            self.experience.add_user(user_uid)
+            self.users.append(address)
+
+    def tearDown(self):
+        ContextContainer._pop_context()
+
+    def test_level_is_cached_when_crossing_a_boundary(self):
+        for amount, level in [(510, 1), (510, 2)]:
+            self.experience.give_experience(1, amount)
+            self.experience.settle()
+            self.assertEqual(level, self.experience._level[1])
+        self.experience.remove_experience(1, 100)
+        self.experience.settle()
+        self.assertEqual(1, self.experience._level[1])
+
+    def test_experience_is_read_without_the_token(self):
+        self.experience.give_experience(1, 4000)
+        self.experience.settle()
+        calls = len(self.interface.calls)
+        self.assertEqual(4000, self.experience.get_experience(1))
+        self.assertEqual(3, self.experience.get_level(1))
+        self.assertEqual(1, self.experience.get_level(2))
+        self.assertEqual(calls, len(self.interface.calls))
+
+    def test_changes_are_settled_in_one_batch_per_direction(self):
+        self.experience.give_experience(1, 300)
+        self.experience.give_experience(2, 100)
+        self.experience.settle()
+        self.assertEqual(['treasury_batch_withdraw'], self.interface.calls)
+
+        self.experience.give_experience(1, 10)
+        self.experience.remove_experience(1, 110)
+        self.experience.remove_experience(2, 100)
+        self.experience.give_experience(2, 50)
+        self.experience.settle()
+        self.assertEqual(['treasury_batch_withdraw', 'treasury_batch_deposit'], self.interface.calls)
+        self.assertEqual((200, 50), (self.experience.get_experience(1), self.experience.get_experience(2)))
+        self.assertEqual({self.users[0]: 200, self.users[1]: 50}, self.interface.balances)
+
+    def test_netted_changes_are_not_settled(self):
+        self.experience.give_experience(1, 100)
+        self.experience.remove_experience(1, 100)
+        self.experience.settle()
+        self.assertEqual([], self.interface.calls)
+
+    def test_accounts_created_before_the_mirror_are_mirrored_by_the_reconciliation(self):
+        address = Address.from_string('hx' + '9' * 40)
+        user_uid = UserAccountFactory(self.db).create(address, 0, 'legacy')
+        UserAccounts(self.db).add(user_uid, address)
+        self.interface.balances[address] = 1000
+        self.assertFalse(self.experience.is_mirrored(user_uid))
+
+        self.experience.reconcile(user_uid)
+        self.assertTrue(self.experience.is_mirrored(user_uid))
+        self.assertEqual(1000, self.experience.get_experience(user_uid))
+        self.assertEqual(2, self.experience.get_level(user_uid))
+
+    def test_deferred_changes_netting_to_zero_leave_the_ledger(self):
+        self.experience.set_mode(ExperienceSettlementMode.DEFERRED)
+        self.experience.give_experience(1, 100)
+        self.experience.settle()
+        self.assertEqual([1], ExperiencePendingQueue(self.db).select(0))
+
+        keys = len(self.db.storage)
+        self.experience.remove_experience(1, 100)
+        self.experience.settle()
+        self.assertEqual([], ExperiencePendingQueue(self.db).select(0))
+        self.assertEqual(0, self.experience.get_pending(1))
+        self.assertLess(len(self.db.storage), keys)
+        self.assertEqual([], self.interface.calls)
+
+    def test_flush_settles_in_one_batch_per_direction(self):
+        self.experience.give_experience(1, 300)
+        self.experience.settle()
+        self.experience.set_mode(ExperienceSettlementMode.DEFERRED)
+        self.experience.remove_experience(1, 100)
+        self.experience.give_experience(2, 100)
+        self.experience.settle()
+
+        self.assertEqual(2, self.experience.flush(10))
+        self.assertEqual(['treasury_batch_withdraw'] * 2 + ['treasury_batch_deposit'], self.interface.calls)
+        self.assertEqual({self.users[0]: 200, self.users[1]: 100}, self.interface.balances)
+
+
+if __name__ == '__main__':
+    unittest.main()
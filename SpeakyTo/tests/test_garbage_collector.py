@@ -0,0 +1,149 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from SpeakyTo.speakyto.answer import *
+from SpeakyTo.speakyto.consts import QUESTION_CANCELLED_RETENTION
+from SpeakyTo.speakyto.payload import *
+from SpeakyTo.speakyto.question import *
+from SpeakyTo.scorelib.linked_list import *
+from SpeakyTo.tests.emulator import *
+
+
+class TestGarbageCollector(EmulatorTestCase):
+
+    USERS = 3
+
+    def setUp(self):
+        super().setUp()
+        for index, user in enumerate(self.users):
+            self._success(user, 'create_question_level1',
+                          {'data': f'question {index}', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        self._success(self.users[1], 'cancel_question', {'question_uid': 2})
+
+    def _collect(self, max_steps: int) -> dict:
+        return self._events(self._success(self.owner, 'collect_garbage', {'max_steps': max_steps}))
+
+    def _fanout(self, to_languages: list) -> None:
+        # Level 3 : up to 5 opened questions
+        result = self.emulator.invoke(self.speakyto, self.irc2, 'transfer', {'_to': self.users[0], '_value': 4000})
+        self.assertEqual(1, result['status'], result)
+        self._success(self.owner, 'reconcile_experience', {'max_users': 10})
+        self._success(self.users[0], 'create_question_fanout',
+                      {'level': 1, 'data': 'hello', 'from_language': 'en', 'to_languages': json.dumps(to_languages)},
+                      len(to_languages) * ICX)
+
+    def _question_uids(self) -> list:
+        return [question['uid'] for question in self._query('get_questions', offset=0)]
+
+    def test_cancelled_questions_are_kept_until_retention(self):
+        self._collect(100)
+        self.assertEqual([1, 2, 3], self._question_uids())
+
+        self.emulator.advance(QUESTION_CANCELLED_RETENTION)
+        keys = len(self.emulator.storage)
+        events = self._collect(100)
+        self.assertEqual([2, 2], events['QuestionDeletedEvent']['indexed'][1:])
+        steps, questions, bytes_freed = events['GarbageCollectedEvent']['data']
+        self.assertEqual(1, questions)
+        self.assertGreater(bytes_freed, 0)
+        self.assertLess(len(self.emulator.storage), keys)
+
+        self.assertEqual([1, 3], self._question_uids())
+        self.assertEqual([1, 3], [question['uid'] for question in self._query(
+            'get_language_pair_questions', from_language='en', to_language='fr', offset=0)])
+        self.assertEqual('UNINITIALIZED', self._query('get_question', question_uid=2)['state'])
+
+    def test_answers_are_deleted_one_per_step(self):
+        for user in self.users[:2]:
+            self._success(user, 'answer_question', {'question_uid': 3, 'data': f'answer {user}'})
+        payload_uids = [Answer(answer_uid, self.db)._data.payload_uid() for answer_uid in (1, 2)]
+        self._success(self.owner, 'admin_cancel_question', {'question_uid': 3})
+        self.emulator.advance(QUESTION_CANCELLED_RETENTION)
+
+        # The question 2 is deleted in a step, before walking the question 3
+        self._collect(4)
+        self.assertEqual([3], self._query('get_pending_question_deletions', offset=0))
+        self.assertEqual('DELETING', self._query('get_question', question_uid=3)['state'])
+        self._collect(1)
+        self.assertEqual(1, len(AnswerDB(3, self.db)))
+        self._collect(1)
+        self.assertEqual([3], self._query('get_pending_question_deletions', offset=0))
+        self._collect(1)
+        self.assertEqual([], self._query('get_pending_question_deletions', offset=0))
+
+        self.assertEqual([1], self._question_uids())
+        for answer_uid, payload_uid in zip((1, 2), payload_uids):
+            self.assertEqual(0, Answer(answer_uid, self.db).question_uid())
+            self.assertEqual(0, Payloads(self.db).refcount(payload_uid))
+        self.assertEqual([], self._query('get_answers', question_uid=3, offset=0))
+
+    def test_stale_list_keys_are_deleted(self):
+        self._collect(100)
+        # Zeros stored by the linked lists of the previous versions
+        opened = UserOpenedQuestionDB(2, self.db)
+        opened._length.set(0)
+        questions = QuestionDB(self.db)
+        questions._node(1)._prev.set(0)
+        questions._node(3)._next.set(0)
+        keys = len(self.emulator.storage)
+
+        events = self._collect(100)
+        self.assertEqual(keys - 3, len(self.emulator.storage))
+        self.assertGreater(events['GarbageCollectedEvent']['data'][2], 0)
+        self.assertEqual([1, 2, 3], self._question_uids())
+
+    def test_sweep_resumes_from_cursor(self):
+        self._collect(2)
+        self.assertEqual({'phase': 0, 'cursor': 2, 'sweeps': 0},
+                         {key: value for key, value in self._query('get_garbage_collector_status').items()
+                          if key != 'bytes_freed'})
+        # 1 question and 3 users left, then a step per global list
+        self._collect(5)
+        status = self._query('get_garbage_collector_status')
+        self.assertEqual((2, 1, 0), (status['phase'], status['cursor'], status['sweeps']))
+        self._collect(3)
+        status = self._query('get_garbage_collector_status')
+        self.assertEqual((0, 0, 1), (status['phase'], status['cursor'], status['sweeps']))
+
+    def test_shared_lists_are_compacted_once_per_sweep(self):
+        self._fanout(['de', 'es'])
+        compacted = []
+        compact = LinkedListDB.compact
+
+        def record(linked_list: LinkedListDB) -> None:
+            compacted.append(linked_list._name)
+            compact(linked_list)
+
+        # A sweep : 5 questions, 3 users and 4 global lists
+        with patch.object(LinkedListDB, 'compact', record):
+            self._collect(12)
+        self.assertEqual(1, self._query('get_garbage_collector_status')['sweeps'])
+        for shared in [LanguagePairQuestionDB('en', 'fr', self.db), LanguagePairQuestionDB('en', 'de', self.db),
+                       FanoutQuestionDB(4, self.db)]:
+            self.assertEqual(1, compacted.count(shared._name), shared._name)
+
+    def test_clean_sweep_deletes_nothing(self):
+        self._fanout(['de', 'es'])
+        self._collect(100)
+        deletes = self.emulator.storage.counts['delete']
+        self._collect(100)
+        self.assertEqual(deletes, self.emulator.storage.counts['delete'])
+
+    def test_cancelled_fanout_target_is_reclaimed(self):
+        self._fanout(['de', 'es'])
+        self._success(self.users[0], 'cancel_question', {'question_uid': 4})
+        self.emulator.advance(QUESTION_CANCELLED_RETENTION)
+        self._collect(100)
+        self.assertEqual([5], [question['uid'] for question in self._query('get_fanout_questions', question_uid=5)])
+
+        self._success(self.users[0], 'cancel_question', {'question_uid': 5})
+        self.emulator.advance(QUESTION_CANCELLED_RETENTION)
+        self._collect(100)
+        self.assertEqual(0, len(FanoutQuestionDB(4, self.db)))
+        payload_uid = Question(1, self.db)._data.payload_uid()
+        self.assertEqual(1, Payloads(self.db).refcount(payload_uid))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,258 @@
+import json
+import tempfile
+import unittest
+from os import path
+
+from indexer import *
+from indexer.export import *
+from SpeakyTo.speakyto.consts import ANSWER_COOLDOWN
+from SpeakyTo.tests.emulator import *
+
+
+class EmulatorSource(object):
+    """ NodeSource calling the SCORE on the emulator """
+
+    def __init__(self, emulator: Emulator, score_address: Address):
+        self._emulator = emulator
+        self._score_address = score_address
+
+    def close(self) -> None:
+        pass
+
+    def last_height(self) -> int:
+        return self._emulator.score(self._score_address).block_height
+
+    def call(self, method: str, params: dict = None):
+        try:
+            return self._emulator.icx_call(None, self._score_address, method, params)
+        except IconServiceBaseException as e:
+            raise NodeRequestError(f'{method}: {e}')
+
+
+class TestIndexer(EmulatorTestCase):
+    """ The read model built from the eventlogs answers the same as the SCORE """
+
+    USERS = 4
+
+    def setUp(self):
+        self.tx_results = []
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = path.join(self.directory.name, 'transactions.jsonl')
+        self.read_model = ReadModel(path.join(self.directory.name, 'speakyto.sqlite'), str(self.speakyto))
+
+    def tearDown(self):
+        self.read_model.close()
+        self.directory.cleanup()
+        super().tearDown()
+
+    def _success(self, from_, method: str, params: dict = None, value: int = 0) -> dict:
+        # The transaction results are recorded as the node returns them
+        result = self._transaction_success(from_, method, params, value)
+        self.tx_results.append(result)
+        return result
+
+    def _uid(self, result: dict, event: str) -> int:
+        return next(int(log['indexed'][1], 16) for log in result['eventLogs']
+                    if log['indexed'][0].startswith(f'{event}('))
+
+    def _record(self) -> None:
+        with open(self.log_path, 'w') as log_file:
+            for tx_result in self.tx_results:
+                log_file.write(json.dumps(tx_result) + '\n')
+
+    def _query(self, method: str, **params):
+        # The read model stores the addresses as strings
+        return json.loads(json.dumps(self.emulator.query(self.speakyto, method, params), default=str))
+
+    def _run_scenario(self) -> None:
+        asker, answerer, other, canceller = self.users
+        question = self._uid(self._success(asker, 'create_question_level1',
+                                           {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'}, ICX),
+                             'QuestionCreatedEvent')
+        deleted = self._uid(self._success(other, 'create_question_level1',
+                                          {'data': 'x' * 40, 'from_language': 'en', 'to_language': 'de'}, 2 * ICX),
+                            'QuestionCreatedEvent')
+        cancelled = self._uid(self._success(canceller, 'create_question_level1',
+                                            {'data': 'bye', 'from_language': 'en', 'to_language': 'fr'}, ICX),
+                              'QuestionCreatedEvent')
+
+        answer = self._uid(self._success(answerer, 'answer_question', {'question_uid': question, 'data': 'salut'}),
+                           'AnswerCreatedEvent')
+        self.emulator.advance(ANSWER_COOLDOWN)
+        self._success(answerer, 'answer_question', {'question_uid': deleted, 'data': 'hallo'})
+        self._success(asker, 'answer_question', {'question_uid': deleted, 'data': 'guten tag'})
+
+        self._success(asker, 'select_answer', {'answer_uid': answer})
+        self._success(canceller, 'cancel_question', {'question_uid': cancelled})
+        self._success(self.owner, 'admin_delete_question', {'question_uid': deleted})
+        self._success(answerer, 'set_user_username', {'username': 'renamed'})
+        self._success(canceller, 'claim_rewards')
+
+    def _assert_same_answers(self) -> None:
+        for method, params in [('get_questions', {'offset': 0}),
+                               ('get_questions', {'offset': 0, 'include': 'author,selected_answer,answer_count'}),
+                               ('get_language_pair_questions', {'from_language': 'en', 'to_language': 'fr',
+                                                                'offset': 0}),
+                               ('get_language_pair_questions', {'from_language': 'en', 'to_language': 'de',
+                                                                'offset': 0})]:
+            self.assertEqual(self._query(method, **params), getattr(self.read_model, method)(**params), method)
+
+        for question_uid in range(1, 4):
+            self.assertEqual(self._query('get_answers', question_uid=question_uid, offset=0),
+                             self.read_model.get_answers(question_uid, 0))
+
+        for user_uid in range(1, len(self.users) + 1):
+            for method in ['get_user_experience', 'get_user_level', 'get_claimable_rewards']:
+                self.assertEqual(self._query(method, user_uid=user_uid),
+                                 getattr(self.read_model, method)(user_uid), method)
+            self.assertEqual(self._query('get_user_account', user_uid=user_uid),
+                             self.read_model.get_user_account(user_uid))
+            self.assertEqual(self._query('get_user_questions', user_uid=user_uid, offset=0),
+                             self.read_model.get_user_questions(user_uid, 0))
+
+            self.assertEqual(self._query('get_user_profile', user_uid=user_uid),
+                             self.read_model.get_user_profile(user_uid))
+
+    def test_read_model_matches_score(self):
+        self._run_scenario()
+        self._record()
+
+        indexed = Indexer(self.read_model, LogFileSource(self.log_path), batch_blocks=3).sync()
+        self.assertEqual(len(self.tx_results), indexed)
+        self._assert_same_answers()
+
+        answered = self.read_model.find_questions(0, state='ANSWERED', min_reward=ICX)
+        self.assertEqual([1], [question['uid'] for question in answered])
+
+    def test_sync_resumes_from_checkpoint(self):
+        self._record()
+        Indexer(self.read_model, LogFileSource(self.log_path)).sync()
+        checkpoint = self.read_model.checkpoint()
+
+        self._run_scenario()
+        self._record()
+        indexed = Indexer(self.read_model, LogFileSource(self.log_path)).sync()
+        self.assertEqual(len(self.tx_results) - len(self.users), indexed)
+        self.assertLess(checkpoint, self.read_model.checkpoint())
+        self._assert_same_answers()
+
+    def test_legacy_blocks_require_a_start_height(self):
+        # A user account created by SpeakyTo 0.1.1, before the indexed history
+        self.tx_results.insert(0, {
+            'status': '0x1',
+            'blockHeight': hex(0),
+            'eventLogs': [{'scoreAddress': str(self.speakyto),
+                           'indexed': ['UserAccountCreatedEvent(int)', hex(1)], 'data': []}]
+        })
+        self._record()
+
+        with self.assertRaises(LegacyEventLog):
+            Indexer(self.read_model, LogFileSource(self.log_path)).sync()
+        self.assertEqual(-1, self.read_model.checkpoint())
+
+        self.assertEqual(len(self.users), Indexer(self.read_model, LogFileSource(self.log_path)).sync(1))
+        self._assert_same_answers()
+
+    def test_long_data_are_read_by_chunks(self):
+        asker, answerer = self.users[:2]
+        data = ''.join(chr(ord('a') + index % 26) for index in range(5000))
+        self._success(asker, 'create_question_level1', {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'},
+                      ICX)
+        self._success(answerer, 'answer_question', {'question_uid': 1, 'data': data})
+        self.emulator.advance(ANSWER_COOLDOWN)
+        self._success(answerer, 'answer_question', {'question_uid': 1, 'data': 'salut'})
+        self._record()
+
+        with self.assertRaises(NoNodeToCall):
+            Indexer(self.read_model, LogFileSource(self.log_path)).sync()
+
+        source = LogFileSource(self.log_path, EmulatorSource(self.emulator, self.speakyto))
+        Indexer(self.read_model, source).sync()
+        self.assertEqual(data, self.read_model.get_answer_data(1))
+        self.assertEqual('salut', self.read_model.get_answer_data(2))
+        self._assert_same_answers()
+
+    def test_deleted_long_data_are_not_read(self):
+        data = 'x' * 1000
+        self._success(self.users[0], 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        self._success(self.users[1], 'answer_question', {'question_uid': 1, 'data': data})
+        self._success(self.owner, 'admin_delete_question', {'question_uid': 1})
+        self._record()
+
+        source = LogFileSource(self.log_path, EmulatorSource(self.emulator, self.speakyto))
+        # The answer data can't be read anymore, and the answer is deleted in the same sync
+        self.assertEqual(len(self.tx_results), Indexer(self.read_model, source).sync())
+        self.assertIsNone(self.read_model.get_answer_data(1))
+        self._assert_same_answers()
+
+    def test_bootstrap_from_export(self):
+        self._run_scenario()
+        self._record()
+        source = EmulatorSource(self.emulator, self.speakyto)
+        export_path = path.join(self.directory.name, 'export')
+
+        manifest = export_state(source, export_path, count=2)
+        self.assertEqual({'users': 4, 'questions': 2, 'answers': 1}, manifest['rows'])
+        bootstrap(self.read_model, export_path)
+        self._assert_same_answers()
+
+        # The blocks following the export are indexed on top of it
+        self._success(self.users[2], 'create_question_level1',
+                      {'data': 'again', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        self._record()
+        self.assertEqual(1, Indexer(self.read_model, LogFileSource(self.log_path)).sync())
+        self._assert_same_answers()
+
+        manifest = export_state(source, path.join(self.directory.name, 'columnar'), 'columnar')
+        with open(path.join(self.directory.name, 'columnar', 'questions', 'data.jsonl')) as column_file:
+            self.assertEqual(['hello', 'bye', 'again'], [json.loads(line) for line in column_file])
+
+    def test_export_reads_the_long_data_by_chunks(self):
+        asker, answerer = self.users[:2]
+        data = ''.join(chr(ord('a') + index % 26) for index in range(5000))
+        self._success(asker, 'create_question_level1', {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'},
+                      ICX)
+        self._success(answerer, 'answer_question', {'question_uid': 1, 'data': data})
+        source = EmulatorSource(self.emulator, self.speakyto)
+
+        page = source.call('export_answers', {'cursor': hex(0), 'count': hex(10)})
+        self.assertEqual([data[:256], hex(5000), hex(3)], page['rows'][0][-3:])
+
+        export_path = path.join(self.directory.name, 'export')
+        export_state(source, export_path)
+        bootstrap(self.read_model, export_path)
+        self.assertEqual(data, self.read_model.get_answer_data(1))
+        self.assertEqual('hello', self.read_model.get_question_data(1))
+
+    def test_bootstrap_from_export_during_transactions(self):
+        asker, answerer, other, canceller = self.users
+        self._success(asker, 'create_question_level1', {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'},
+                      ICX)
+        self._success(canceller, 'create_question_level1', {'data': 'bye', 'from_language': 'en', 'to_language': 'fr'},
+                      ICX)
+        self._success(answerer, 'answer_question', {'question_uid': 1, 'data': 'salut'})
+        self._record()
+        source = EmulatorSource(self.emulator, self.speakyto)
+        call = source.call
+
+        def call_between_pages(method: str, params: dict = None):
+            page = call(method, params)
+            if method == 'export_users' and params['cursor'] == hex(0):
+                # The answerer row is already exported, the canceller row is not
+                self._success(asker, 'select_answer', {'answer_uid': 1})
+                self._success(canceller, 'cancel_question', {'question_uid': 2})
+            return page
+
+        source.call = call_between_pages
+        export_path = path.join(self.directory.name, 'export')
+        export_state(source, export_path, count=2)
+        bootstrap(self.read_model, export_path)
+        self._record()
+        self.assertEqual(2, Indexer(self.read_model, LogFileSource(self.log_path)).sync())
+        self._assert_same_answers()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import json
+import unittest
+
+from SpeakyTo.instrumentation import *
+from SpeakyTo.tests.emulator import *
+from SpeakyTo.tests.memory_db import *
+
+SCORE_ADDRESS = Address.from_string('cx' + '0' * 40)
+
+
+class FakeInterface:
+
+    def balanceOf(self, _owner: Address) -> int:
+        return 1
+
+
+class InstrumentedScore:
+    """ Minimal SCORE-like object with instrumented methods """
+
+    def __init__(self, db, hook=None):
+        instrumentation = Instrumentation(db, hook)
+        self._instrumentation = instrumentation
+        self.db = instrumentation.db
+        self._var = VarDB('VAR', self.db, value_type=int)
+        self._dict = DictDB('DICT', self.db, value_type=int)
+        self._array = ArrayDB('ARRAY', self.db, value_type=int)
+
+    @instrument
+    def write(self) -> None:
+        self._var.set(1)
+        self._dict['key'] = 1
+        self._array.put(1)
+        self._dict.remove('key')
+
+    @instrument
+    def read(self) -> int:
+        return self._var.get() + self._dict['key']
+
+    @instrument
+    def nested(self) -> int:
+        self.write()
+        return self.read()
+
+    @instrument
+    def call(self) -> int:
+        return self._instrumentation.interface(FakeInterface()).balanceOf(SCORE_ADDRESS)
+
+    @instrument
+    def fail(self) -> None:
+        self._var.get()
+        raise ValueError
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        push_memory_context()
+        self.calls = []
+        self.score = InstrumentedScore(MemoryDatabase(SCORE_ADDRESS), lambda method, counts: self.calls.append(
+            (method, counts)))
+
+    def tearDown(self):
+        ContextContainer._pop_context()
+
+    def test_operations_are_counted_per_container(self):
+        self.score.write()
+        (method, counts), = self.calls
+        self.assertEqual('write', method)
+        self.assertEqual({'get': 0, 'put': 1, 'delete': 0}, counts['VarDB'])
+        self.assertEqual({'get': 0, 'put': 1, 'delete': 1}, counts['DictDB'])
+        self.assertEqual(0, counts['calls'])
+        # The ArrayDB reads its size, then writes the item and the new size
+        self.assertEqual((1, 2), (counts['ArrayDB']['get'], counts['ArrayDB']['put']))
+
+    def test_nested_calls_are_counted_in_the_outermost_call(self):
+        self.score.nested()
+        (method, counts), = self.calls
+        self.assertEqual('nested', method)
+        self.assertEqual(1, counts['VarDB']['get'])
+        self.assertEqual(1, counts['VarDB']['put'])
+
+    def test_inter_contract_calls_are_counted(self):
+        self.assertEqual(1, self.score.call())
+        self.assertEqual(1, self.calls[-1][1]['calls'])
+
+    def test_failed_calls_are_counted(self):
+        self.assertRaises(ValueError, self.score.fail)
+        self.assertEqual(('fail', 1), (self.calls[-1][0], self.calls[-1][1]['VarDB']['get']))
+        # The next call starts from zero
+        self.score.read()
+        self.assertEqual(1, self.calls[-1][1]['VarDB']['get'])
+
+    def test_instrumentation_of_a_database(self):
+        db = MemoryDatabase(SCORE_ADDRESS)
+        self.assertIsNone(Instrumentation.of(db))
+        instrumentation = Instrumentation(db)
+        self.assertIs(instrumentation, Instrumentation.of(instrumentation.db))
+
+
+class TestEmulatorInstrumentation(EmulatorTestCase):
+    """ The emulator instruments the SCOREs it deploys when it is given a hook """
+
+    USERS = 2
+
+    def _create_emulator(self) -> Emulator:
+        self.calls = []
+        return Emulator(lambda method, counts: self.calls.append((method, counts)))
+
+    def setUp(self):
+        super().setUp()
+        del self.calls[:]
+
+    @staticmethod
+    def _storage_operations(counts: dict, operation: str) -> int:
+        return sum(counts[container][operation] for container in ['VarDB', 'DictDB', 'ArrayDB', 'unknown'])
+
+    def test_every_storage_operation_is_counted(self):
+        self._success(self.users[0], 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        del self.calls[:]
+        gets = self.emulator.storage.counts['get']
+        self._query('get_question', question_uid=1)
+        (method, counts), = self.calls
+        self.assertEqual('get_question', method)
+        self.assertEqual(self.emulator.storage.counts['get'] - gets, self._storage_operations(counts, 'get'))
+
+        # The containers built in the SCORE constructor are counted too
+        self._query('get_experience_contract')
+        self.assertEqual(1, self.calls[-1][1]['VarDB']['get'])
+
+    def test_nested_calls_are_counted_in_the_outermost_call(self):
+        calls = json.dumps([['get_user_level', {'user_uid': 1}], ['get_user_account', {'user_uid': 2}]])
+        self._query('multicall', calls=calls)
+        self.assertEqual(['multicall'], [method for method, _ in self.calls])
+
+    def test_experience_changes_are_settled_in_a_batch_call(self):
+        self._success(self.users[0], 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        self.assertEqual(('create_question_level1', 1), (self.calls[-1][0], self.calls[-1][1]['calls']))
+        self._success(self.users[1], 'answer_question', {'question_uid': 1, 'data': 'salut'})
+        self._success(self.users[0], 'select_answer', {'answer_uid': 1})
+        method, counts = self.calls[-1]
+        # The experience of both users is given in a single call
+        self.assertEqual(('select_answer', 1), (method, counts['calls']))
+        self.assertEqual(500, self._query('get_user_experience', user_uid=1))
+        self.assertEqual(500, self.emulator.query(self.irc2, 'balanceOf', {'_owner': self.users[0]}))
+        self.assertEqual(510, self.emulator.query(self.irc2, 'balanceOf', {'_owner': self.users[1]}))
+
+    def test_instrumentation_is_scoped_to_the_emulator(self):
+        self.emulator.close()
+        with Emulator() as emulator:
+            speakyto, _ = deploy_speakyto(emulator)
+            self.assertIsNone(emulator.score(speakyto)._instrumentation)
+            emulator.query(speakyto, 'get_experience_contract')
+        self.assertEqual([], self.calls)
+        self.emulator = self._create_emulator()
+
+
+if __name__ == '__main__':
+    unittest.main()
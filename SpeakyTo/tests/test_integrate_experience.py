@@ -0,0 +1,98 @@
+from SpeakyTo.speakyto.experience import ExperienceSettlementMode
+from SpeakyTo.tests.icontranslate_utils import *
+
+
+class TestIntegrateExperience(SpeakyToIntegrateTests):
+    """ The experience token balances are mirrored by SpeakyTo """
+
+    USERS = 2
+
+    def setUp(self):
+        super().setUp()
+        self._success(self._users[0], 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'})
+
+    def _user_experience(self, user_uid: int) -> int:
+        return int(self._call('get_user_experience', {'user_uid': user_uid}), 16)
+
+    def _transfer_experience(self, from_: KeyWallet, to_: KeyWallet, value: int) -> None:
+        irc2_transfer(self, from_, self._irc2_address, to_.get_address(), value, self.icon_service)
+
+    def test_experience_is_read_from_the_mirror(self):
+        self.assertEqual(100, self._user_experience(1))
+        self._transfer_experience(self._users[0], self._users[1], 60)
+        self.assertEqual(100, self._user_experience(1))
+        self.assertEqual(0, self._user_experience(2))
+
+        self._success(self._test1, 'reconcile_experience', {'max_users': 10})
+        self.assertEqual(40, self._user_experience(1))
+        self.assertEqual(60, self._user_experience(2))
+
+    def test_removed_experience_is_deposited(self):
+        self._success(self._users[0], 'cancel_question', {'question_uid': 1})
+        self.assertEqual(0, self._user_experience(1))
+        self.assertEqual(0, self._experience(self._users[0]))
+
+    def test_reconciliation_is_bounded(self):
+        self._transfer_experience(self._users[0], self._users[1], 60)
+        self._success(self._test1, 'reconcile_experience', {'max_users': 1})
+        self.assertEqual((40, 0), (self._user_experience(1), self._user_experience(2)))
+
+        # The next pass starts again from the first user
+        self._success(self._test1, 'reconcile_experience', {'max_users': 2})
+        self.assertEqual((40, 60), (self._user_experience(1), self._user_experience(2)))
+        self._transfer_experience(self._users[1], self._users[0], 10)
+        self._success(self._test1, 'reconcile_experience', {'max_users': 1})
+        self.assertEqual((50, 60), (self._user_experience(1), self._user_experience(2)))
+
+    def test_experience_changes_are_logged(self):
+        self._transfer_experience(self._users[0], self._users[1], 60)
+        tx_result = self._success(self._test1, 'reconcile_experience', {'max_users': 10})
+        changes = [(int(log['indexed'][1], 16), int(log['data'][0], 16))
+                   for log in tx_result['eventLogs']
+                   if log['indexed'][0].startswith('ExperienceChangedEvent(')]
+        self.assertEqual([(1, 40), (2, 60)], changes)
+
+    def test_reconciliation_is_reserved_to_the_owner(self):
+        self._error(self._users[0], 'reconcile_experience', {'max_users': 10})
+
+    def test_select_answer_settles_both_users(self):
+        self._success(self._users[1], 'answer_question', {'question_uid': 1, 'data': 'salut'})
+        self._success(self._users[0], 'select_answer', {'answer_uid': 1})
+        for user_uid, user in enumerate(self._users, 1):
+            self.assertEqual(self._experience(user), self._user_experience(user_uid))
+        self.assertEqual((300, 510), (self._user_experience(1), self._user_experience(2)))
+
+    def test_deferred_changes_are_flushed_by_the_operator(self):
+        self._success(self._test1, 'set_experience_settlement_mode', {'mode': ExperienceSettlementMode.DEFERRED})
+        self.assertEqual(hex(ExperienceSettlementMode.DEFERRED), self._call('get_experience_settlement_mode'))
+        self._success(self._users[1], 'answer_question', {'question_uid': 1, 'data': 'salut'})
+        self._success(self._users[0], 'select_answer', {'answer_uid': 1})
+
+        self.assertEqual(510, self._user_experience(2))
+        self.assertEqual(hex(510), self._call('get_pending_experience', {'user_uid': 2}))
+        self.assertEqual(0, self._experience(self._users[1]))
+        self.assertEqual([2, 1], self._call('get_pending_experience_users', {'offset': 0}))
+
+        self._success(self._test1, 'flush_experience', {'max_users': 1})
+        self.assertEqual([1], self._call('get_pending_experience_users', {'offset': 0}))
+        self.assertEqual(510, self._experience(self._users[1]))
+        self._success(self._test1, 'flush_experience', {'max_users': 1})
+        self.assertEqual([], self._call('get_pending_experience_users', {'offset': 0}))
+        self.assertEqual(300, self._experience(self._users[0]))
+
+    def test_deferred_removals_are_flushed_by_the_operator(self):
+        self._success(self._test1, 'set_experience_settlement_mode', {'mode': ExperienceSettlementMode.DEFERRED})
+        self._success(self._users[0], 'cancel_question', {'question_uid': 1})
+        self.assertEqual(0, self._user_experience(1))
+        self.assertEqual(100, self._experience(self._users[0]))
+
+        self._success(self._test1, 'flush_experience', {'max_users': 10})
+        self.assertEqual(hex(0), self._call('get_pending_experience', {'user_uid': 1}))
+        self.assertEqual(0, self._experience(self._users[0]))
+
+    def test_settlement_mode_is_checked(self):
+        tx_result = self._error(self._test1, 'set_experience_settlement_mode', {'mode': 2})
+        self.assertIn('InvalidExperienceSettlementMode', tx_result['failure']['message'])
+        self._error(self._users[0], 'set_experience_settlement_mode', {'mode': ExperienceSettlementMode.DEFERRED})
+        self.assertEqual(hex(ExperienceSettlementMode.IMMEDIATE), self._call('get_experience_settlement_mode'))
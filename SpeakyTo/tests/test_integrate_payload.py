@@ -0,0 +1,36 @@
+from iconservice.base.exception import IconScoreException
+from SpeakyTo.scorelib.consts import BLOB_CHUNK_SIZE
+from SpeakyTo.speakyto.consts import DATA_PREVIEW_LENGTH
+from SpeakyTo.tests.icontranslate_utils import *
+
+
+class TestIntegratePayload(SpeakyToIntegrateTests):
+    """ The question and answer data are served by chunks """
+
+    USERS = 2
+
+    def setUp(self):
+        super().setUp()
+        self._success(self._users[0], 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'})
+
+    def test_long_data_are_read_by_chunks(self):
+        data = ''.join(chr(ord('a') + index % 26) for index in range(2 * BLOB_CHUNK_SIZE + 10))
+        self._success(self._users[1], 'answer_question', {'question_uid': 1, 'data': data})
+
+        answer = self._call('get_answer', {'answer_uid': 1})
+        self.assertEqual(data[:DATA_PREVIEW_LENGTH], answer['data'])
+        self.assertEqual((len(data), 3), (answer['data_length'], answer['data_chunks']))
+        chunks = [self._call('get_answer_data', {'answer_uid': 1, 'chunk': index}) for index in range(3)]
+        self.assertEqual(data, ''.join(chunks))
+
+        with self.assertRaises(IconScoreException) as context:
+            self._call('get_answer_data', {'answer_uid': 1, 'chunk': 3})
+        self.assertIn('BlobChunkNotFound', str(context.exception))
+
+    def test_identical_data_are_shared(self):
+        self._success(self._users[1], 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'de'})
+        self._success(self._test1, 'admin_delete_question', {'question_uid': 1})
+        self.assertEqual('hello', self._call('get_question', {'question_uid': 2})['data'])
+        self.assertEqual('hello', self._call('get_question_data', {'question_uid': 2, 'chunk': 0}))
@@ -0,0 +1,35 @@
+from SpeakyTo.tests.fixtures import *
+
+
+class TestIntegrateQuestion(SpeakyToFixtureTests):
+    """ The questions and answers seeded once, restored before each test """
+
+    DATASET = SeedDataset(users=3, questions=2, answers_per_question=1)
+
+    def test_seeded_state(self):
+        questions = self._call('get_questions', {'offset': 0})
+        self.assertEqual(self._question_uids, [question['uid'] for question in questions])
+        for question_uid, answer_uids in self._answer_uids.items():
+            answers = self._call('get_answers', {'question_uid': question_uid, 'offset': 0})
+            self.assertEqual(answer_uids, [answer['uid'] for answer in answers])
+
+    def test_select_answer(self):
+        question_uid = self._question_uids[0]
+        answer_uid = self._answer_uids[question_uid][0]
+        tx_result = self._success(self._users[0], 'select_answer', {'answer_uid': answer_uid})
+        self.assertEqual(answer_uid, event_uid(tx_result, 'AnswerSelectedEvent'))
+
+        question = self._call('get_question', {'question_uid': question_uid})
+        self.assertEqual('ANSWERED', question['state'])
+        self.assertEqual(answer_uid, question['answer_uid'])
+        self.assertEqual(hex(ICX), self._call('get_claimable_rewards', {'user_uid': 2}))
+
+    def test_state_is_restored_between_tests(self):
+        # Runs after test_select_answer
+        self.assertEqual('OPENED', self._call('get_question', {'question_uid': self._question_uids[0]})['state'])
+        self.assertEqual(hex(0), self._call('get_claimable_rewards', {'user_uid': 2}))
+
+    def test_only_the_asker_selects(self):
+        answer_uid = self._answer_uids[self._question_uids[0]][0]
+        tx_result = self._error(self._users[1], 'select_answer', {'answer_uid': answer_uid})
+        self.assertIn('InvalidUserUid', tx_result['failure']['message'])
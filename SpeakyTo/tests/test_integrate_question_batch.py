@@ -0,0 +1,60 @@
+import json
+
+from SpeakyTo.consts import BATCH_MAX_COUNT
+from SpeakyTo.tests.icontranslate_utils import *
+
+
+class TestIntegrateQuestionBatch(SpeakyToIntegrateTests):
+    """ create_questions creates several questions of any level in a transaction """
+
+    USERS = 2
+
+    def setUp(self):
+        super().setUp()
+        self._user, self._beginner = self._users
+        # Level 3 : up to 5 opened questions, of the levels 1 to 3
+        irc2_transfer(self, self._test1, self._irc2_address, self._user.get_address(), 4000, self.icon_service)
+        self._success(self._test1, 'reconcile_experience', {'max_users': 10})
+
+    @staticmethod
+    def _item(level: int, data: str, reward: int = 0) -> dict:
+        return {'level': level, 'data': data, 'from_language': 'en', 'to_language': 'fr', 'reward': hex(reward)}
+
+    def _params(self, items: list) -> dict:
+        return {'items': json.dumps(items)}
+
+    def test_questions_are_created(self):
+        items = [self._item(1, 'hello', ICX), self._item(2, 'good morning'), self._item(1, 'bye', 2 * ICX)]
+        self._success(self._user, 'create_questions', self._params(items), 3 * ICX)
+
+        questions = self._call('get_user_questions', {'user_uid': 1, 'offset': 0})
+        self.assertEqual(['hello', 'good morning', 'bye'], [question['data'] for question in questions])
+        self.assertEqual([ICX, 0, 2 * ICX], [question['reward'] for question in questions])
+        self.assertEqual([1, 2, 1], [question['level'] for question in questions])
+        self.assertEqual(hex(4300), self._call('get_user_experience', {'user_uid': 1}))
+        self.assertEqual(4300, self._experience(self._user))
+
+    def test_rewards_must_match_the_value(self):
+        balance = self._balance(self._user)
+        tx_result = self._error(self._user, 'create_questions',
+                                self._params([self._item(1, 'hello', ICX), self._item(1, 'bye')]), 2 * ICX)
+        self.assertIn('InvalidCallParameters', tx_result['failure']['message'])
+        self.assertEqual([], self._call('get_questions', {'offset': 0}))
+        self.assertEqual(balance, self._balance(self._user))
+
+    def test_invalid_items_create_nothing(self):
+        for items in [[], [self._item(1, 'x' * 51)], [self._item(4, 'hello')], [{'level': 1, 'data': 'hello'}],
+                      [self._item(1, 'hello')] * (BATCH_MAX_COUNT + 1)]:
+            self._error(self._user, 'create_questions', self._params(items))
+        self.assertEqual([], self._call('get_questions', {'offset': 0}))
+
+    def test_opened_questions_are_limited(self):
+        tx_result = self._error(self._beginner, 'create_questions',
+                                self._params([self._item(1, 'hello'), self._item(1, 'bye')]))
+        self.assertIn('TooMuchOpenedQuestions', tx_result['failure']['message'])
+
+        tx_result = self._error(self._user, 'create_questions',
+                                self._params([self._item(1, f'question {index}') for index in range(6)]))
+        self.assertIn('TooMuchOpenedQuestions', tx_result['failure']['message'])
+        self._success(self._user, 'create_questions',
+                      self._params([self._item(1, f'question {index}') for index in range(5)]))
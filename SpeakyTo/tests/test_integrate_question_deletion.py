@@ -0,0 +1,54 @@
+from SpeakyTo.speakyto.consts import ANSWER_COOLDOWN, QUESTION_DELETION_MAX_ANSWERS
+from SpeakyTo.tests.icontranslate_utils import *
+
+
+class TestIntegrateQuestionDeletion(SpeakyToIntegrateTests):
+    """ The answers of a deleted question are deleted in bounded steps """
+
+    USERS = 3
+
+    def setUp(self):
+        super().setUp()
+        asker, *answerers = self._users
+        self._success(asker, 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        for index in range(QUESTION_DELETION_MAX_ANSWERS // 2 + 1):
+            for answerer in answerers:
+                self._success(answerer, 'answer_question', {'question_uid': 1, 'data': f'answer {index}'})
+            self._clock.skip(ANSWER_COOLDOWN)
+        self._answers_count = len(self._answers())
+
+    def _answers(self) -> list:
+        return self._call('get_answers', {'question_uid': 1, 'offset': 0})
+
+    def _pending(self) -> list:
+        return self._call('get_pending_question_deletions', {'offset': 0})
+
+    def test_answers_are_deleted_in_steps(self):
+        self._success(self._test1, 'admin_delete_question', {'question_uid': 1})
+        self.assertEqual([1], self._pending())
+        self.assertEqual('DELETING', self._call('get_question', {'question_uid': 1})['state'])
+        self.assertEqual(self._answers_count - QUESTION_DELETION_MAX_ANSWERS, len(self._answers()))
+        # The question leaves the lists right away
+        self.assertEqual([], self._call('get_questions', {'offset': 0}))
+        self.assertEqual([], self._call('get_user_questions', {'user_uid': 1, 'offset': 0}))
+
+        self._success(self._test1, 'process_question_deletions', {'max_answers': 1})
+        self.assertEqual(self._answers_count - QUESTION_DELETION_MAX_ANSWERS - 1, len(self._answers()))
+        self.assertEqual([1], self._pending())
+
+        self._success(self._test1, 'process_question_deletions', {'max_answers': 100})
+        self.assertEqual([], self._pending())
+        self.assertEqual('UNINITIALIZED', self._call('get_question', {'question_uid': 1})['state'])
+        for answer_uid in range(1, self._answers_count + 1):
+            self.assertEqual(0, self._call('get_answer', {'answer_uid': answer_uid})['question_uid'])
+
+    def test_deleting_question_is_not_deleted_again(self):
+        self._success(self._test1, 'admin_delete_question', {'question_uid': 1})
+        tx_result = self._error(self._test1, 'admin_delete_question', {'question_uid': 1})
+        self.assertIn('InvalidQuestionState', tx_result['failure']['message'])
+
+    def test_reward_is_refunded_once(self):
+        self._success(self._test1, 'admin_delete_question', {'question_uid': 1})
+        self._success(self._test1, 'process_question_deletions', {'max_answers': 100})
+        self.assertEqual(hex(ICX), self._call('get_claimable_rewards', {'user_uid': 1}))
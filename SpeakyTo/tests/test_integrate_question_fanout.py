@@ -0,0 +1,58 @@
+import json
+
+from SpeakyTo.tests.icontranslate_utils import *
+
+
+class TestIntegrateQuestionFanout(SpeakyToIntegrateTests):
+    """ create_question_fanout asks a question in several target languages """
+
+    USERS = 2
+
+    def setUp(self):
+        super().setUp()
+        self._user, self._beginner = self._users
+        # Level 3 : up to 5 opened questions
+        irc2_transfer(self, self._test1, self._irc2_address, self._user.get_address(), 4000, self.icon_service)
+        self._success(self._test1, 'reconcile_experience', {'max_users': 10})
+
+    @staticmethod
+    def _params(to_languages: list) -> dict:
+        return {'level': 1, 'data': 'hello', 'from_language': 'en', 'to_languages': json.dumps(to_languages)}
+
+    def _fanout_questions(self, question_uid: int) -> list:
+        return self._call('get_fanout_questions', {'question_uid': question_uid})
+
+    def test_a_question_per_target_language(self):
+        self._success(self._user, 'create_question_fanout', self._params(['fr', 'de', 'es']), 3 * ICX)
+
+        questions = self._fanout_questions(2)
+        self.assertEqual(['fr', 'de', 'es'], [question['to_language'] for question in questions])
+        self.assertEqual({(1, ICX, 'hello')},
+                         {(question['fanout_uid'], question['reward'], question['data']) for question in questions})
+        self.assertEqual([2], [question['uid'] for question in self._call(
+            'get_language_pair_questions', {'from_language': 'en', 'to_language': 'de', 'offset': 0})])
+
+    def test_targets_are_cancelled_and_deleted_separately(self):
+        self._success(self._user, 'create_question_fanout', self._params(['fr', 'de']), 2 * ICX)
+        self._success(self._user, 'cancel_question', {'question_uid': 1})
+        self.assertEqual(['CANCELLED', 'OPENED'], [question['state'] for question in self._fanout_questions(2)])
+        self.assertEqual(hex(ICX), self._call('get_claimable_rewards', {'user_uid': 1}))
+
+        self._success(self._test1, 'admin_delete_question', {'question_uid': 2})
+        self.assertEqual([1], [question['uid'] for question in self._fanout_questions(1)])
+        self.assertEqual('hello', self._call('get_question', {'question_uid': 1})['data'])
+        self.assertEqual([], self._call('get_language_pair_questions',
+                                        {'from_language': 'en', 'to_language': 'de', 'offset': 0}))
+
+    def test_invalid_fanouts(self):
+        for to_languages, value in [([], 0), (['fr', 'fr'], 0), (['fr', 'de'], 3), (['fr', 'xx'], 0)]:
+            self._error(self._user, 'create_question_fanout', self._params(to_languages), value)
+        self.assertEqual([], self._call('get_questions', {'offset': 0}))
+
+    def test_each_target_is_an_opened_question(self):
+        tx_result = self._error(self._beginner, 'create_question_fanout', self._params(['fr', 'de']))
+        self.assertIn('TooMuchOpenedQuestions', tx_result['failure']['message'])
+        tx_result = self._error(self._user, 'create_question_fanout',
+                                self._params(['fr', 'de', 'es', 'zh', 'ja', 'ko']))
+        self.assertIn('TooMuchOpenedQuestions', tx_result['failure']['message'])
+        self._success(self._beginner, 'create_question_fanout', self._params(['fr']))
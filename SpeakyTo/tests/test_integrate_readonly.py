@@ -0,0 +1,76 @@
+from iconservice.base.exception import IconScoreException
+import json
+
+from SpeakyTo.consts import BATCH_MAX_COUNT
+from SpeakyTo.tests.icontranslate_utils import *
+
+
+class TestIntegrateReadonly(SpeakyToIntegrateTests):
+    """ The readonly endpoints serving several entities in one query """
+
+    USERS = 2
+
+    def setUp(self):
+        super().setUp()
+        self._success(self._users[0], 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+
+    def test_batch_getters_keep_the_order(self):
+        self._success(self._users[1], 'answer_question', {'question_uid': 1, 'data': 'salut'})
+        questions = self._call('get_questions_by_uids', {'uids': json.dumps([1, 1])})
+        self.assertEqual([self._call('get_question', {'question_uid': 1})] * 2, questions)
+        self.assertEqual(['user1', 'user0'], [account['username'] for account in self._call(
+            'get_user_accounts_by_uids', {'uids': json.dumps([2, 1])})])
+        self.assertEqual(['salut'], [answer['data'] for answer in self._call(
+            'get_answers_by_uids', {'uids': json.dumps([1])})])
+
+    def test_batch_getters_are_bounded(self):
+        for uids in [json.dumps(list(range(1, BATCH_MAX_COUNT + 2))), json.dumps(['1']), '{}']:
+            with self.assertRaises(IconScoreException):
+                self._call('get_questions_by_uids', {'uids': uids})
+
+    def test_multicall(self):
+        calls = [['get_question', {'question_uid': '0x1'}],
+                 ['get_user_level', {'user_uid': 1}],
+                 ['set_user_username', {'username': 'renamed'}],
+                 ['get_question_data', {'question_uid': 1, 'chunk': 1}]]
+        question, level, not_readonly, failure = self._call('multicall', {'calls': json.dumps(calls)})
+        self.assertEqual({'result': self._call('get_question', {'question_uid': 1})}, question)
+        self.assertEqual({'result': 1}, level)
+        self.assertIn('error', not_readonly)
+        self.assertIn('BlobChunkNotFound', failure['error'])
+        self.assertEqual('user0', self._call('get_user_account', {'user_uid': 1})['username'])
+
+    def test_question_lists_embed_the_includes(self):
+        self._success(self._users[1], 'answer_question', {'question_uid': 1, 'data': 'salut'})
+        self._success(self._users[0], 'select_answer', {'answer_uid': 1})
+        self._success(self._users[0], 'create_question_level1',
+                      {'data': 'again', 'from_language': 'en', 'to_language': 'fr'})
+
+        answered, opened = self._call('get_questions', {'offset': 0, 'include': 'author,selected_answer,answer_count'})
+        author = {**self._call('get_user_account', {'user_uid': 1}),
+                  'level': int(self._call('get_user_level', {'user_uid': 1}), 16)}
+        self.assertEqual(author, answered['author'])
+        self.assertEqual(author, opened['author'])
+        self.assertEqual(self._call('get_answer', {'answer_uid': 1}), answered['selected_answer'])
+        self.assertEqual((1, None, 0), (answered['answer_count'], opened['selected_answer'], opened['answer_count']))
+
+        plain = self._call('get_user_questions', {'user_uid': 1, 'offset': 0, 'include': ''})
+        self.assertNotIn('author', plain[0])
+        with self.assertRaises(IconScoreException):
+            self._call('get_questions', {'offset': 0, 'include': 'author,answers'})
+
+    def test_user_profile(self):
+        self._success(self._users[1], 'answer_question', {'question_uid': 1, 'data': 'salut'})
+        self._success(self._users[0], 'select_answer', {'answer_uid': 1})
+        self._success(self._users[0], 'create_question_level1',
+                      {'data': 'again', 'from_language': 'en', 'to_language': 'fr'})
+
+        profile = self._call('get_user_profile', {'user_uid': 1})
+        self.assertEqual(self._call('get_user_account', {'user_uid': 1}), profile['account'])
+        self.assertEqual(int(self._call('get_user_experience', {'user_uid': 1}), 16), profile['experience'])
+        self.assertEqual(int(self._call('get_user_level', {'user_uid': 1}), 16), profile['level'])
+        self.assertEqual((2, 1, 1), (profile['questions_count'], profile['opened_questions_count'],
+                                     profile['answered_questions_count']))
+        # The most recent questions first
+        self.assertEqual([self._call('get_question', {'question_uid': uid}) for uid in (2, 1)], profile['questions'])
@@ -0,0 +1,46 @@
+from SpeakyTo.tests.icontranslate_utils import *
+
+
+class TestIntegrateReward(SpeakyToIntegrateTests):
+    """ The rewards and refunds are credited to a claimable balance """
+
+    USERS = 2
+
+    def setUp(self):
+        super().setUp()
+        self._asker, self._answerer = self._users
+        self._success(self._asker, 'create_question_level1',
+                      {'data': 'hello', 'from_language': 'en', 'to_language': 'fr'}, 2 * ICX)
+
+    def _claimable(self, user_uid: int) -> int:
+        return int(self._call('get_claimable_rewards', {'user_uid': user_uid}), 16)
+
+    def test_reward_is_claimed_by_the_answerer(self):
+        balance = self._balance(self._answerer)
+        self._success(self._answerer, 'answer_question', {'question_uid': 1, 'data': 'salut'})
+        self._success(self._asker, 'select_answer', {'answer_uid': 1})
+        self.assertEqual(2 * ICX, self._claimable(2))
+        self.assertEqual(hex(2 * ICX), self._call('get_total_claimable_rewards'))
+        self.assertEqual(balance, self._balance(self._answerer))
+
+        self._success(self._answerer, 'claim_rewards')
+        self.assertEqual(balance + 2 * ICX, self._balance(self._answerer))
+        self.assertEqual(0, self._claimable(2))
+        self.assertEqual(hex(0), self._call('get_total_claimable_rewards'))
+
+        tx_result = self._error(self._answerer, 'claim_rewards')
+        self.assertIn('NoRewardToClaim', tx_result['failure']['message'])
+        self.assertEqual(balance + 2 * ICX, self._balance(self._answerer))
+
+    def test_refunds_are_claimed_at_once(self):
+        balance = self._balance(self._asker)
+        self._success(self._asker, 'cancel_question', {'question_uid': 1})
+        self._success(self._asker, 'create_question_level1',
+                      {'data': 'again', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        self._success(self._test1, 'admin_delete_question', {'question_uid': 2})
+        self.assertEqual(3 * ICX, self._claimable(1))
+        self.assertEqual(balance - ICX, self._balance(self._asker))
+        self.assertEqual(3 * ICX, self._call('get_user_profile', {'user_uid': 1})['claimable_rewards'])
+
+        self._success(self._asker, 'claim_rewards')
+        self.assertEqual(balance + 2 * ICX, self._balance(self._asker))
@@ -0,0 +1,66 @@
+import unittest
+
+from SpeakyTo.scorelib.linked_list import *
+from SpeakyTo.tests.memory_db import *
+
+SCORE_ADDRESS = Address.from_string('cx' + '0' * 40)
+
+
+class TestLinkedList(unittest.TestCase):
+
+    def setUp(self):
+        push_memory_context()
+        self.db = MemoryDatabase(SCORE_ADDRESS)
+        self.uids = UIDLinkedListDB('TEST', self.db)
+        for uid in range(1, 6):
+            self.uids.append(uid)
+
+    def tearDown(self):
+        ContextContainer._pop_context()
+
+    def test_select_reversed(self):
+        self.assertEqual([5, 4, 3, 2, 1], self.uids.select_reversed(0))
+        self.assertEqual([3, 2, 1], self.uids.select_reversed(2))
+        self.assertEqual([4, 2], self.uids.select_reversed(0, lambda db, uid: uid % 2 == 0))
+        self.assertEqual([], self.uids.select_reversed(5))
+        self.assertRaises(StopIteration, self.uids.select_reversed, 6)
+
+    def test_select_reversed_after_removals(self):
+        for uid in [1, 3, 5]:
+            self.uids.remove(uid)
+        self.assertEqual([4, 2], self.uids.select_reversed(0))
+        self.assertEqual([2, 4], self.uids.select(0))
+
+        self.uids.remove(2)
+        self.uids.remove(4)
+        self.assertEqual([], self.uids.select_reversed(0))
+
+    def test_select_reversed_is_paginated(self):
+        for uid in range(6, MAX_ITERATION_LOOP + 10):
+            self.uids.append(uid)
+        page = self.uids.select_reversed(0)
+        self.assertEqual(MAX_ITERATION_LOOP, len(page))
+        self.assertEqual(MAX_ITERATION_LOOP + 9, page[0])
+
+    def test_compact_removes_the_stored_zeros(self):
+        # Zeros stored by the linked lists of the previous versions
+        self.uids._node(1)._prev.set(0)
+        self.uids._node(5)._next.set(0)
+        keys = len(self.db.storage)
+        self.uids.compact()
+        self.assertEqual(keys - 2, len(self.db.storage))
+        self.assertEqual([1, 2, 3, 4, 5], self.uids.select(0))
+
+        empty = UIDLinkedListDB('EMPTY', self.db)
+        empty._length.set(0)
+        empty.compact()
+        self.assertEqual(keys - 2, len(self.db.storage))
+
+    def test_compact_skips_the_absent_keys(self):
+        self.uids.compact()
+        UIDLinkedListDB('EMPTY', self.db).compact()
+        self.assertEqual(0, self.db.storage.counts['delete'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from SpeakyTo.migration import *
+from SpeakyTo.speakyto.answer import *
+from SpeakyTo.speakyto.payload import *
+from SpeakyTo.speakyto.question import *
+from SpeakyTo.tests.emulator import *
+
+
+class TestMigration(EmulatorTestCase):
+    """ Update from 0.1.1 : the question and answer data stored inline move to the Payloads store """
+
+    USERS = 3
+
+    def setUp(self):
+        super().setUp()
+        for index, user in enumerate(self.users):
+            self._success(user, 'create_question_level1',
+                          {'data': f'question {index}', 'from_language': 'en', 'to_language': 'fr'}, ICX)
+        for question_uid in range(1, 4):
+            self._success(self.users[question_uid % 3], 'answer_question',
+                          {'question_uid': question_uid, 'data': f'answer {question_uid}'})
+
+        # Rewrite the state as stored by 0.1.1
+        for field in self._fields():
+            data = field.get()
+            Payloads(self.db).remove(field.payload_uid())
+            field._payload_uid.remove()
+            field._inline.set(data)
+        Version(self.db).update('0.1.1')
+
+    def _fields(self) -> list:
+        questions = [Question(uid, self.db)._data for uid in range(1, 4)]
+        return questions + [Answer(uid, self.db)._data for uid in range(1, 4)]
+
+    def _migrated(self) -> list:
+        return [bool(field.payload_uid()) for field in self._fields()]
+
+    def test_migrations_run_in_batches(self):
+        self.emulator.update(self.speakyto)
+        status = self._query('get_migration_status')
+        self.assertEqual(['QUESTION_INLINE_PAYLOADS', 'ANSWER_INLINE_PAYLOADS'],
+                         [migration['name'] for migration in status['pending']])
+        self.assertEqual('0.2.0', self._query('version'))
+        self.assertTrue(self._query('maintenance_enabled'))
+
+        # The entities not migrated yet stay readable
+        self.assertEqual('question 1', self._query('get_question', question_uid=2)['data'])
+        result = self.emulator.invoke(self.users[0], self.speakyto, 'claim_rewards')
+        self.assertIn('SCOREInMaintenanceException', result['failure']['message'])
+
+        self._success(self.owner, 'run_migrations', {'max_items': 4})
+        self.assertEqual([True] * 4 + [False] * 2, self._migrated())
+        self.assertTrue(self._query('maintenance_enabled'))
+
+        self._success(self.owner, 'run_migrations', {'max_items': 4})
+        self.assertEqual([True] * 6, self._migrated())
+        self.assertFalse(self._query('maintenance_enabled'))
+        self.assertEqual({'pending': [], 'cursor': 0}, self._query('get_migration_status'))
+        self.assertEqual('answer 3', self._query('get_answer', answer_uid=3)['data'])
+
+    def test_write_repairs_entities_ahead(self):
+        self.emulator.update(self.speakyto)
+        # The operator may reopen the SCORE before the end of the migrations
+        self._success(self.owner, 'set_maintenance_mode', {'mode': SCOREMaintenanceMode.DISABLED})
+        self._success(self.users[2], 'select_answer', {'answer_uid': 3})
+        self.assertEqual([False, False, True, False, False, True], self._migrated())
+
+        self._success(self.owner, 'run_migrations', {'max_items': 100})
+        self.assertEqual([True] * 6, self._migrated())
+        self.assertEqual('question 2', self._query('get_question', question_uid=3)['data'])
+
+    def test_owner_write_repairs_entities_during_maintenance(self):
+        self.emulator.update(self.speakyto)
+        self._success(self.owner, 'admin_cancel_question', {'question_uid': 2})
+        self.assertTrue(self._query('maintenance_enabled'))
+        self.assertEqual([False, True, False, False, False, False], self._migrated())
+        self.assertEqual('question 1', self._query('get_question', question_uid=2)['data'])
+
+    def test_migrations_are_abstract(self):
+        with self.assertRaises(TypeError):
+            Migration(self.db)
+
+    def test_maintenance_mode_is_restored(self):
+        self._success(self.owner, 'set_maintenance_mode', {'mode': SCOREMaintenanceMode.ENABLED})
+        self.emulator.update(self.speakyto)
+        self._success(self.owner, 'run_migrations', {'max_items': 100})
+        self.assertTrue(self._query('maintenance_enabled'))
+
+    def test_update_to_same_version_schedules_nothing(self):
+        Version(self.db).update('0.2.0')
+        self.emulator.update(self.speakyto)
+        self.assertFalse(self._query('maintenance_enabled'))
+        self.assertEqual([False] * 6, self._migrated())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import patch
+
+from SpeakyTo.speakyto.answer import *
+from SpeakyTo.speakyto.question import *
+from SpeakyTo.tests.memory_db import *
+
+SCORE_ADDRESS = Address.from_string('cx' + '0' * 40)
+
+
+class TestPayload(unittest.TestCase):
+    """ The question and answer data are stored once in the Payloads store """
+
+    def setUp(self):
+        push_memory_context()
+        self.db = MemoryDatabase(SCORE_ADDRESS)
+
+    def tearDown(self):
+        ContextContainer._pop_context()
+
+    def _create_question(self, data: str) -> Question:
+        return Question(QuestionFactory(self.db).create(1, data, 'en', 'fr', 0, 1), self.db)
+
+    def _create_answer(self, question_uid: int, data: str) -> Answer:
+        return Answer(AnswerFactory(self.db).create(2, question_uid, data), self.db)
+
+    def test_identical_data_are_stored_once(self):
+        question = self._create_question('hello')
+        other = self._create_question('hello')
+        answer = self._create_answer(question.uid(), 'hello')
+
+        payload_uid = question._data.payload_uid()
+        self.assertEqual(payload_uid, other._data.payload_uid())
+        self.assertEqual(payload_uid, answer._data.payload_uid())
+        self.assertEqual(3, Payloads(self.db).refcount(payload_uid))
+        self.assertEqual('hello', other.serialize()['data'])
+        self.assertEqual('hello', answer.serialize()['data'])
+
+    def test_deleted_entities_release_their_payload(self):
+        question = self._create_question('hello')
+        other = self._create_question('hello')
+        answer = self._create_answer(question.uid(), 'bonjour')
+        question_payload_uid = question._data.payload_uid()
+        answer_payload_uid = answer._data.payload_uid()
+
+        answer.delete()
+        question.delete()
+        self.assertEqual(1, Payloads(self.db).refcount(question_payload_uid))
+        self.assertEqual(0, Payloads(self.db).refcount(answer_payload_uid))
+        self.assertEqual('hello', other.data())
+
+        other.delete()
+        self.assertRaises(PayloadNotFound, Payloads(self.db).check_exists, question_payload_uid)
+
+    def test_inline_data_are_still_read(self):
+        # A question created before the payloads store
+        question = self._create_question('hello')
+        Payloads(self.db).remove(question._data.payload_uid())
+        question._data._payload_uid.remove()
+        question._data._inline.set('inline')
+        self.assertEqual('inline', question.data())
+        self.assertEqual({'data': 'inline', 'data_length': 6, 'data_chunks': 1}, question._data.serialize())
+
+        question.delete()
+        self.assertEqual('', question._data._inline.get())
+
+    def test_long_data_are_read_by_chunks(self):
+        data = ''.join(chr(ord('a') + index % 26) for index in range(2 * BLOB_CHUNK_SIZE + 10))
+        answer = self._create_answer(self._create_question('hello').uid(), data)
+
+        serialized = answer.serialize()
+        self.assertEqual(data[:DATA_PREVIEW_LENGTH], serialized['data'])
+        self.assertEqual((len(data), 3), (serialized['data_length'], serialized['data_chunks']))
+        chunks = [answer.data_chunk(index) for index in range(3)]
+        self.assertEqual([BLOB_CHUNK_SIZE, BLOB_CHUNK_SIZE, 10], [len(chunk) for chunk in chunks])
+        self.assertEqual(data, ''.join(chunks))
+        self.assertRaises(BlobChunkNotFound, answer.data_chunk, 3)
+    def test_fanout_targets_share_the_data(self):
+        uids = QuestionFactory(self.db).create_fanout(1, 'hello', 'en', ['fr', 'de', 'es'], 0, 1)
+        questions = [Question(uid, self.db) for uid in uids]
+
+        payload_uid = questions[0]._data.payload_uid()
+        self.assertEqual({payload_uid}, {question._data.payload_uid() for question in questions})
+        self.assertEqual(3, Payloads(self.db).refcount(payload_uid))
+
+        with patch.object(PayloadCodec, 'decode', side_effect=AssertionError):
+            for question in questions[:2]:
+                question.delete()
+        self.assertEqual('hello', questions[2].data())
+        questions[2].delete()
+        self.assertRaises(PayloadNotFound, Payloads(self.db).check_exists, payload_uid)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch
+
+from SpeakyTo.scorelib.payload_store import *
+from SpeakyTo.tests.memory_db import *
+
+SCORE_ADDRESS = Address.from_string('cx' + '0' * 40)
+
+
+class TestPayloadStore(unittest.TestCase):
+
+    def setUp(self):
+        push_memory_context()
+        self.db = MemoryDatabase(SCORE_ADDRESS)
+        self.payloads = PayloadStoreDB('TEST', self.db)
+
+    def tearDown(self):
+        ContextContainer._pop_context()
+
+    def test_identical_payloads_are_stored_once(self):
+        payload_uid = self.payloads.add('hello')
+        self.assertEqual(payload_uid, self.payloads.add('hello'))
+        self.assertNotEqual(payload_uid, self.payloads.add('world'))
+        self.assertEqual(2, self.payloads.refcount(payload_uid))
+        self.assertEqual('hello', self.payloads.get(payload_uid))
+
+    def test_last_reference_frees_the_payload(self):
+        keys = len(self.db.storage)
+        payload_uid = self.payloads.add('x' * 3 * BLOB_CHUNK_SIZE)
+        self.payloads.add('x' * 3 * BLOB_CHUNK_SIZE)
+
+        self.payloads.remove(payload_uid)
+        self.assertEqual('x' * 3 * BLOB_CHUNK_SIZE, self.payloads.get(payload_uid))
+        self.payloads.remove(payload_uid)
+        self.assertRaises(PayloadNotFound, self.payloads.check_exists, payload_uid)
+        self.assertRaises(PayloadNotFound, self.payloads.remove, payload_uid)
+        # Only the UID counter is left
+        self.assertEqual(keys + 1, len(self.db.storage))
+
+        # The freed payload is stored again under a new UID
+        self.assertEqual(payload_uid + 1, self.payloads.add('x' * 3 * BLOB_CHUNK_SIZE))
+
+    def test_remove_does_not_read_the_payload(self):
+        payload_uid = self.payloads.add('hello ' * BLOB_CHUNK_SIZE)
+        with patch.object(PayloadCodec, 'decode', side_effect=AssertionError('payload read')):
+            self.payloads.remove(payload_uid)
+        self.assertEqual(0, self.payloads.refcount(payload_uid))
+
+    def test_missing_hash_is_an_error(self):
+        payload_uid = self.payloads.add('hello')
+        self.payloads._uid_to_hash.remove(payload_uid)
+        self.assertRaises(PayloadNotFound, self.payloads.remove, payload_uid)
+
+
+if __name__ == '__main__':
+    unittest.main()
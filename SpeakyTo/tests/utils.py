@@ -196,12 +196,38 @@ def transaction_call_error(icon_integrate_test_base: IconIntegrateTestBase,
     :param icon_service: IconService
     :return: transaction result as dict
     """
+    signed_transaction = sign_call_transaction(from_, to_, method, params, value)
+
+    # Sends the transaction to the network
+    tx_result = icon_integrate_test_base.process_transaction(signed_transaction, icon_service)
+
+    return tx_result
+
+
+def sign_call_transaction(from_: KeyWallet,
+                          to_: str,
+                          method: str,
+                          params: dict = None,
+                          value: int = 0,
+                          step_limit: int = 10_000_000,
+                          nid: int = 3) -> SignedTransaction:
+    """Builds and signs a call transaction, without sending it
+
+    :param from_: wallet address making a transaction
+    :param to_: SCORE address to receive a transaction
+    :param method: name of an external function
+    :param params: parameters as dict passed on the SCORE methods (optional)
+    :param value: amount of ICX to be sent (Optional)
+    :param step_limit: maximum steps of the transaction (Optional)
+    :param nid: network ID (Optional)
+    :return: signed transaction
+    """
     # Generates an instance of transaction for calling method in SCORE.
     transaction = CallTransactionBuilder() \
         .from_(from_.get_address()) \
         .to(to_) \
-        .step_limit(10_000_000) \
-        .nid(3) \
+        .step_limit(step_limit) \
+        .nid(nid) \
         .nonce(100) \
         .method(method) \
         .params(params) \
@@ -209,12 +235,34 @@ def transaction_call_error(icon_integrate_test_base: IconIntegrateTestBase,
         .build()
 
     # Returns the signed transaction object having a signature
-    signed_transaction = SignedTransaction(transaction, from_)
+    return SignedTransaction(transaction, from_)
 
-    # Sends the transaction to the network
-    tx_result = icon_integrate_test_base.process_transaction(signed_transaction, icon_service)
 
-    return tx_result
+def sign_transfer_transaction(from_: KeyWallet,
+                              to_: str,
+                              value: int,
+                              step_limit: int = 10_000_000,
+                              nid: int = 3) -> SignedTransaction:
+    """Builds and signs a transaction sending ICX, without sending it
+
+    :param from_: wallet address making a transaction
+    :param to_: wallet address to receive coin
+    :param value: amount of ICX to be sent
+    :param step_limit: maximum steps of the transaction (Optional)
+    :param nid: network ID (Optional)
+    :return: signed transaction
+    """
+    transaction = TransactionBuilder() \
+        .from_(from_.get_address()) \
+        .to(to_) \
+        .step_limit(step_limit) \
+        .nid(nid) \
+        .nonce(100) \
+        .value(value) \
+        .build()
+
+    # Returns the signed transaction object having a signature
+    return SignedTransaction(transaction, from_)
 
 
 def icx_transfer_call(icon_integrate_test_base: IconIntegrateTestBase,
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+"""
+Off-chain indexer of SpeakyTo.
+
+Follows the blocks of a node, or a recorded log file as a local stand-in, and
+decodes the SpeakyTo eventlogs into a SQLite read model. The read model answers
+the same queries as the readonly endpoints of the SCORE (get_questions,
+get_answers, get_user_profile...) without calling the node, and the filtered
+queries the SCORE can't answer (by language, state, user or reward).
+The eventlogs only carry a preview of the data : the longer data are read by
+chunks from the readonly endpoints of the SCORE.
+
+Usage :
+    python -m indexer --db speakyto.sqlite --score cx... --uri http://127.0.0.1:9000/api/v3 [--follow]
+    python -m indexer --db speakyto.sqlite --score cx... --log transactions.jsonl [--uri ...]
+
+A new read model can be bootstrapped from an export of the SCORE state instead
+of indexing every block since the deployment (see indexer/export.py).
+
+The eventlogs of SpeakyTo before 0.2.0 only carried the UIDs of the entities
+created, and can't be indexed : on a SCORE updated from a previous version,
+bootstrap the read model from an export, or start after the update with
+--from-height.
+"""
+
+from .events import *
+from .indexer import *
+from .sources import *
+from .store import *
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+
+import argparse
+
+from . import __doc__
+from .indexer import *
+from .sources import *
+from .store import *
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', type=str, required=True, help='SQLite read model path')
+    parser.add_argument('--score', type=str, required=True, help='SpeakyTo address')
+    parser.add_argument('--uri', type=str, help='Node JSON-RPC endpoint')
+    parser.add_argument('--log', type=str,
+                        help='Recorded transaction results (JSON lines), the long data are still read from --uri')
+    parser.add_argument('--from-height', type=int, default=0,
+                        help='First block of a new read model, after the update to SpeakyTo 0.2.0')
+    parser.add_argument('--batch-blocks', type=int, default=BATCH_BLOCKS)
+    parser.add_argument('--follow', action='store_true', help='Keep indexing the new blocks')
+    args = parser.parse_args()
+    if not args.uri and not args.log:
+        parser.error('one of the arguments --uri --log is required')
+
+    read_model = ReadModel(args.db, args.score)
+    node = NodeSource(args.uri, args.score) if args.uri else None
+    source = LogFileSource(args.log, node) if args.log else node
+    indexer = Indexer(read_model, source, args.batch_blocks)
+    try:
+        if args.follow:
+            indexer.follow(args.from_height)
+        else:
+            indexed = indexer.sync(args.from_height)
+            print(f'{indexed} blocks indexed, checkpoint at block {read_model.checkpoint()}')
+    except KeyboardInterrupt:
+        pass
+    except (LegacyEventLog, NoNodeToCall) as e:
+        parser.exit(1, f'{e}\n')
+    finally:
+        source.close()
+        read_model.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+
+# Fields of the SpeakyTo eventlogs, in the order of their signature (indexed first).
+# The other eventlogs (ShowException, InstrumentationEvent) aren't state changes.
+EVENT_FIELDS = {
+    'QuestionCreatedEvent': ['uid', 'user_uid', 'language_pair', 'level', 'reward', 'fanout_uid', 'data', 'data_length'],
+    'QuestionCancelledEvent': ['uid', 'user_uid', 'refund'],
+    'QuestionDeletedEvent': ['uid', 'user_uid', 'refund'],
+    'AnswerCreatedEvent': ['uid', 'question_uid', 'user_uid', 'data', 'data_length'],
+    'AnswerSelectedEvent': ['uid', 'question_uid', 'user_uid', 'reward'],
+    'UserAccountCreatedEvent': ['uid', 'address', 'username', 'avatar_uid'],
+    'UserAccountUpdatedEvent': ['uid', 'username', 'avatar_uid'],
+    'ExperienceChangedEvent': ['user_uid', 'experience', 'level'],
+    'RewardClaimedEvent': ['user_uid', 'amount'],
+}
+
+# Eventlogs of SpeakyTo before 0.2.0, which only carried the UID of the entity created.
+# The state they created can't be indexed from them, see LegacyEventLog
+LEGACY_SIGNATURES = {
+    'QuestionCreatedEvent(int)',
+    'AnswerCreatedEvent(int)',
+    'UserAccountCreatedEvent(int)',
+}
+
+
+class InvalidEventLog(Exception):
+    pass
+
+
+class LegacyEventLog(InvalidEventLog):
+    """ An eventlog of SpeakyTo before 0.2.0 : the blocks before the update must be
+        loaded from a state export instead (see indexer/export.py) """
+    pass
+
+
+class Event(object):
+    """ A decoded SpeakyTo eventlog """
+
+    def __init__(self, name: str, fields: dict):
+        self.name = name
+        self.fields = fields
+
+    def __getitem__(self, field: str):
+        return self.fields[field]
+
+    def __repr__(self) -> str:
+        return f'{self.name}({self.fields})'
+
+
+def _decode_value(value_type: str, value):
+    """ Decodes a value the way the node serializes it : the integers are hex strings """
+    if value is None:
+        return None
+    if value_type == 'int':
+        return int(value, 16)
+    if value_type == 'bool':
+        return int(value, 16) != 0
+    if value_type == 'bytes':
+        return bytes.fromhex(value[2:])
+    # str and Address
+    return value
+
+
+def decode_event(eventlog: dict):
+    """ Returns the Event of a SpeakyTo eventlog, or None for the eventlogs without state change """
+    signature = eventlog['indexed'][0]
+    name, _, types = signature.partition('(')
+    if name not in EVENT_FIELDS:
+        return None
+    if signature in LEGACY_SIGNATURES:
+        raise LegacyEventLog(signature)
+
+    types = types.rstrip(')').split(',')
+    values = eventlog['indexed'][1:] + eventlog['data']
+    fields = EVENT_FIELDS[name]
+    if len(types) != len(fields) or len(values) != len(fields):
+        raise InvalidEventLog(signature)
+
+    return Event(name, {
+        field: _decode_value(value_type, value)
+        for field, value_type, value in zip(fields, types, values)
+    })
+
+
+def decode_events(score_address: str, tx_result: dict) -> list:
+    """ Returns the Events emitted by the SCORE in a transaction result.
+        A failed transaction has no eventlogs """
+    if int(str(tx_result.get('status', '0x1')), 0) != 1:
+        return []
+
+    events = []
+    for eventlog in tx_result.get('eventLogs', []):
+        if eventlog['scoreAddress'] != score_address:
+            continue
+        event = decode_event(eventlog)
+        if event is not None:
+            events.append(event)
+    return events
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+"""
+Export of the SpeakyTo state, through the export_users, export_questions and
+export_answers readonly methods of the SCORE.
+
+Every entity is streamed in pages of up to 500 UIDs, instead of paging the
+lists 100 items at a time and querying the answers question by question.
+The pages carry a preview of the question and answer data : the longer data
+are read chunk by chunk with get_question_data and get_answer_data, and
+written in full.
+The `lists` column is a bitmask of the lists containing the entity (see
+ExportList in speakyto/export.py).
+
+Formats :
+ - jsonl    : <output>/<entity>.jsonl, one JSON object per row
+ - columnar : <output>/<entity>/<column>.jsonl, one JSON value per row
+
+<output>/manifest.json records the block heights at the start and the end of
+the export, and every row its `block_height`, the height it was read at.
+A JSON lines export bootstraps a new read model, which then indexes the blocks
+following the start of the export : the changes made during the export are
+applied again, except the rewards credited to a user at or below the height of
+its row.
+
+Usage :
+    python -m indexer.export --uri http://127.0.0.1:9000/api/v3 --score cx... --output export [--format columnar]
+    python -m indexer.export --bootstrap export --db speakyto.sqlite --score cx...
+"""
+
+import argparse
+import json
+from os import makedirs, path
+
+from .sources import *
+from .store import *
+
+ENTITIES = ['users', 'questions', 'answers']
+
+# The other columns are integers, serialized as hex strings by the node
+STRING_COLUMNS = {'address', 'username', 'from_language', 'to_language', 'data'}
+
+# UIDs scanned per page, up to EXPORT_MAX_COUNT of the SCORE
+EXPORT_COUNT = 500
+
+# Readonly method returning a chunk of the data, by entity
+DATA_CHUNK_METHODS = {
+    'questions': ('get_question_data', 'question_uid'),
+    'answers': ('get_answer_data', 'answer_uid')
+}
+
+
+class UnknownExportFormat(Exception):
+    pass
+
+
+def decode_row(columns: list, row: list) -> dict:
+    return {
+        column: value if column in STRING_COLUMNS or value is None else int(value, 16)
+        for column, value in zip(columns, row)
+    }
+
+
+class StateExporter(object):
+    """ Streams the rows of an entity, page after page """
+
+    def __init__(self, source: NodeSource, count: int = EXPORT_COUNT):
+        self._source = source
+        self._count = count
+
+    def _data(self, entity: str, row: dict) -> str:
+        """ The full data of a row, from its preview """
+        data = row.pop('data')
+        length, chunks = row.pop('data_length'), row.pop('data_chunks')
+        if len(data) == length:
+            return data
+        method, uid_param = DATA_CHUNK_METHODS[entity]
+        return read_data(self._source, method, uid_param, row['uid'], chunks)
+
+    def rows(self, entity: str):
+        cursor, last_uid = 0, None
+        while last_uid is None or cursor < last_uid:
+            page = self._source.call(f'export_{entity}', {'cursor': hex(cursor), 'count': hex(self._count)})
+            block_height = int(page['block_height'], 16)
+            for row in page['rows']:
+                row = decode_row(page['columns'], row)
+                if 'data' in row:
+                    row['data'] = self._data(entity, row)
+                yield {**row, 'block_height': block_height}
+            cursor, last_uid = int(page['cursor'], 16), int(page['last_uid'], 16)
+
+
+class JsonLinesWriter(object):
+
+    def __init__(self, directory: str, entity: str):
+        self._file = open(path.join(directory, f'{entity}.jsonl'), 'w')
+
+    def write(self, row: dict) -> None:
+        self._file.write(json.dumps(row) + '\n')
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ColumnarWriter(object):
+
+    def __init__(self, directory: str, entity: str):
+        self._directory = path.join(directory, entity)
+        makedirs(self._directory, exist_ok=True)
+        self._files = {}
+
+    def write(self, row: dict) -> None:
+        for column, value in row.items():
+            if column not in self._files:
+                self._files[column] = open(path.join(self._directory, f'{column}.jsonl'), 'w')
+            self._files[column].write(json.dumps(value) + '\n')
+
+    def close(self) -> None:
+        for column_file in self._files.values():
+            column_file.close()
+
+
+WRITERS = {
+    'jsonl': JsonLinesWriter,
+    'columnar': ColumnarWriter
+}
+
+
+def export_state(source: NodeSource, directory: str, export_format: str = 'jsonl',
+                 count: int = EXPORT_COUNT) -> dict:
+    """ Writes the export of every entity in `directory`, and returns its manifest """
+    if export_format not in WRITERS:
+        raise UnknownExportFormat(export_format)
+    makedirs(directory, exist_ok=True)
+
+    exporter = StateExporter(source, count)
+    manifest = {'format': export_format, 'start_height': source.last_height(), 'rows': {}}
+    for entity in ENTITIES:
+        writer = WRITERS[export_format](directory, entity)
+        rows = 0
+        try:
+            for row in exporter.rows(entity):
+                writer.write(row)
+                rows += 1
+        finally:
+            writer.close()
+        manifest['rows'][entity] = rows
+    manifest['end_height'] = source.last_height()
+
+    with open(path.join(directory, 'manifest.json'), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+
+def _read_rows(directory: str, entity: str):
+    with open(path.join(directory, f'{entity}.jsonl')) as rows_file:
+        for line in rows_file:
+            yield json.loads(line)
+
+
+def bootstrap(read_model: ReadModel, directory: str) -> dict:
+    """ Loads a JSON lines export in an empty read model """
+    with open(path.join(directory, 'manifest.json')) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest['format'] != 'jsonl':
+        raise UnknownExportFormat(manifest['format'])
+
+    read_model.load_snapshot(_read_rows(directory, 'users'),
+                             _read_rows(directory, 'questions'),
+                             _read_rows(directory, 'answers'),
+                             manifest['start_height'])
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--score', type=str, required=True, help='SpeakyTo address')
+    parser.add_argument('--uri', type=str, help='Node JSON-RPC endpoint')
+    parser.add_argument('--output', type=str, help='Export directory')
+    parser.add_argument('--format', type=str, default='jsonl', choices=sorted(WRITERS))
+    parser.add_argument('--count', type=int, default=EXPORT_COUNT, help='UIDs scanned per page')
+    parser.add_argument('--bootstrap', type=str, help='Export directory to load in a new read model')
+    parser.add_argument('--db', type=str, help='SQLite read model path')
+    args = parser.parse_args()
+
+    if args.bootstrap:
+        if not args.db:
+            parser.error('--bootstrap requires --db')
+        read_model = ReadModel(args.db, args.score)
+        try:
+            manifest = bootstrap(read_model, args.bootstrap)
+        finally:
+            read_model.close()
+        print(f'{manifest["rows"]} loaded, indexing resumes after block {manifest["start_height"]}')
+        return
+
+    if not args.uri or not args.output:
+        parser.error('an export requires --uri and --output')
+    source = NodeSource(args.uri, args.score)
+    try:
+        manifest = export_state(source, args.output, args.format, args.count)
+    finally:
+        source.close()
+    print(json.dumps(manifest))
+
+
+if __name__ == '__main__':
+    main()
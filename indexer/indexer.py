@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+
+import time
+from math import ceil
+
+from .events import *
+from .sources import *
+from .store import *
+
+# Count of blocks written in a single read model transaction
+BATCH_BLOCKS = 500
+
+# Seconds between two polls of the source, once synchronized
+POLL_INTERVAL = 2
+
+# Readonly method returning a chunk of the data, by event logging a data preview
+DATA_CHUNK_METHODS = {
+    'QuestionCreatedEvent': ('get_question_data', 'question_uid'),
+    'AnswerCreatedEvent': ('get_answer_data', 'answer_uid')
+}
+
+
+class Indexer(object):
+    """ Applies the SpeakyTo eventlogs of a source (NodeSource, LogFileSource) to a ReadModel.
+        The checkpoint is the last block written : a stopped indexer resumes from the next block.
+        The eventlogs only carry a preview of the data : the longer data are read from the source """
+
+    def __init__(self, read_model: ReadModel, source, batch_blocks: int = BATCH_BLOCKS):
+        self._read_model = read_model
+        self._source = source
+        self._batch_blocks = batch_blocks
+
+    def _read_data(self, event: Event) -> None:
+        """ Replaces the data preview of an event by the full data, read by chunks.
+            The data of an entity deleted since can't be read anymore : the preview is kept,
+            until the deletion eventlog is applied """
+        if len(event['data']) == event['data_length']:
+            return
+        method, uid_param = DATA_CHUNK_METHODS[event.name]
+        try:
+            event.fields['data'] = read_data(self._source, method, uid_param, event['uid'],
+                                             ceil(event['data_length'] / BLOB_CHUNK_SIZE))
+        except NodeRequestError:
+            pass
+
+    def sync(self, start_height: int = 0) -> int:
+        """ Indexes the blocks from the checkpoint (or `start_height` for a new read model)
+            up to the last block of the source. Returns the count of blocks indexed.
+            Raises LegacyEventLog on the blocks before SpeakyTo 0.2.0 """
+        score_address = self._read_model.score_address
+        height = max(self._read_model.checkpoint() + 1, start_height)
+        batch, indexed = [], 0
+
+        for block_height, tx_results in self._source.blocks(height):
+            try:
+                events = [event for tx_result in tx_results for event in decode_events(score_address, tx_result)]
+            except LegacyEventLog as e:
+                raise LegacyEventLog(f'Block {block_height} was produced before SpeakyTo 0.2.0 ({e}) : '
+                                     f'bootstrap the read model from a state export, or start after the update')
+            for event in events:
+                if event.name in DATA_CHUNK_METHODS:
+                    self._read_data(event)
+            batch.append((block_height, events))
+            if len(batch) >= self._batch_blocks:
+                self._read_model.apply_blocks(batch)
+                indexed += len(batch)
+                batch = []
+
+        self._read_model.apply_blocks(batch)
+        return indexed + len(batch)
+
+    def follow(self, start_height: int = 0, poll_interval: float = POLL_INTERVAL) -> None:
+        """ Keeps indexing the new blocks, until interrupted """
+        while True:
+            self.sync(start_height)
+            time.sleep(poll_interval)
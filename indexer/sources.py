@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+
+import json
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+class NodeRequestError(Exception):
+    pass
+
+
+class NoNodeToCall(Exception):
+    pass
+
+
+def read_data(source, method: str, uid_param: str, uid: int, chunks: int) -> str:
+    """ Reads the full data of a question or an answer by chunks, through a readonly method of the SCORE """
+    return ''.join(source.call(method, {uid_param: hex(uid), 'chunk': hex(chunk)}) for chunk in range(chunks))
+
+
+class NodeSource(object):
+    """ Follows the blocks of a node through its JSON-RPC API.
+        Only the results of the transactions sent to the SCORE are fetched """
+
+    def __init__(self, uri: str, score_address: str, workers: int = 8, timeout: float = 10):
+        self._uri = uri
+        self._score_address = score_address
+        self._executor = ThreadPoolExecutor(workers)
+        self._timeout = timeout
+        self._request_id = 0
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    # ================================================
+    #  Private Methods
+    # ================================================
+    def _request(self, method: str, params: dict = None):
+        self._request_id += 1
+        body = {'jsonrpc': '2.0', 'id': self._request_id, 'method': method}
+        if params is not None:
+            body['params'] = params
+        request = urllib.request.Request(self._uri, json.dumps(body).encode(),
+                                         {'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            result = json.load(response)
+        if 'error' in result:
+            raise NodeRequestError(f'{method}: {result["error"]}')
+        return result['result']
+
+    @staticmethod
+    def _tx_hash(transaction: dict) -> str:
+        # The blocks list the v2 transactions hashes without prefix
+        tx_hash = transaction.get('txHash') or transaction.get('tx_hash')
+        return tx_hash if tx_hash.startswith('0x') else f'0x{tx_hash}'
+
+    def _transaction_result(self, tx_hash: str) -> dict:
+        return self._request('icx_getTransactionResult', {'txHash': tx_hash})
+
+    # ================================================
+    #  Public Methods
+    # ================================================
+    def last_height(self) -> int:
+        return self._request('icx_getLastBlock')['height']
+
+    def call(self, method: str, params: dict = None):
+        """ Calls a readonly method of the SCORE """
+        return self._request('icx_call', {
+            'to': self._score_address,
+            'dataType': 'call',
+            'data': {'method': method, 'params': params or {}}
+        })
+
+    def blocks(self, start_height: int):
+        """ Yields the (height, transaction results) of the blocks from `start_height` to the last block """
+        for height in range(start_height, self.last_height() + 1):
+            block = self._request('icx_getBlockByHeight', {'height': hex(height)})
+            tx_hashes = [self._tx_hash(transaction) for transaction in block['confirmed_transaction_list']
+                         if transaction.get('to') == self._score_address]
+            yield height, list(self._executor.map(self._transaction_result, tx_hashes))
+
+
+class LogFileSource(object):
+    """ Local stand-in for a node : a JSON lines file of recorded transaction results,
+        in the node format and in the blocks order. Each result has its `blockHeight`.
+        The readonly calls are sent to `reader` (a NodeSource), as the log only holds the results """
+
+    def __init__(self, path: str, reader=None):
+        self._path = path
+        self._reader = reader
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+
+    def _results(self):
+        with open(self._path) as log_file:
+            for line in log_file:
+                if line.strip():
+                    yield json.loads(line)
+
+    def last_height(self) -> int:
+        height = -1
+        for tx_result in self._results():
+            height = int(tx_result['blockHeight'], 16)
+        return height
+
+    def call(self, method: str, params: dict = None):
+        if self._reader is None:
+            raise NoNodeToCall(f'{method}: the long data are read from a node, see --uri')
+        return self._reader.call(method, params)
+
+    def blocks(self, start_height: int):
+        """ Yields the (height, transaction results) of the recorded blocks from `start_height` """
+        height, tx_results = None, []
+        for tx_result in self._results():
+            tx_height = int(tx_result['blockHeight'], 16)
+            if tx_height < start_height:
+                continue
+            if tx_height != height and tx_results:
+                yield height, tx_results
+                tx_results = []
+            height = tx_height
+            tx_results.append(tx_result)
+
+        if tx_results:
+            yield height, tx_results
@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+
+
+import sqlite3
+from math import ceil
+
+from .events import *
+
+# Same values as the SCORE (speakyto/consts.py, scorelib/consts.py)
+PAGE_SIZE = 100
+DATA_PREVIEW_LENGTH = 256
+BLOB_CHUNK_SIZE = 2048
+QUESTION_INCLUDES = ['author', 'selected_answer', 'answer_count']
+
+
+class QuestionState:
+    UNINITIALIZED = 0
+    CLOSED = 1
+    OPENED = 2
+    ANSWERED = 3
+    CANCELLED = 4
+    DELETING = 5
+
+
+QUESTION_STATE_NAMES = {value: name for name, value in vars(QuestionState).items() if not name.startswith('_')}
+
+# The ICX amounts don't fit in a SQLite integer : they are stored as fixed width
+# decimal strings, so their text order is their numeric order
+AMOUNT_DIGITS = 40
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    uid INTEGER PRIMARY KEY,
+    address TEXT UNIQUE,
+    username TEXT NOT NULL DEFAULT '',
+    avatar_uid INTEGER NOT NULL DEFAULT 0,
+    experience INTEGER NOT NULL DEFAULT 0,
+    level INTEGER NOT NULL DEFAULT 1,
+    claimable TEXT NOT NULL DEFAULT '0',
+    claimable_height INTEGER NOT NULL DEFAULT -1
+);
+
+CREATE TABLE IF NOT EXISTS questions (
+    uid INTEGER PRIMARY KEY,
+    user_uid INTEGER NOT NULL,
+    from_language TEXT NOT NULL,
+    to_language TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    reward TEXT NOT NULL,
+    fanout_uid INTEGER NOT NULL,
+    state INTEGER NOT NULL,
+    answer_uid INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS questions_language_pair ON questions (from_language, to_language, uid);
+CREATE INDEX IF NOT EXISTS questions_state ON questions (state, uid);
+CREATE INDEX IF NOT EXISTS questions_user ON questions (user_uid, uid);
+CREATE INDEX IF NOT EXISTS questions_reward ON questions (reward, uid);
+CREATE INDEX IF NOT EXISTS questions_fanout ON questions (fanout_uid) WHERE fanout_uid != 0;
+
+CREATE TABLE IF NOT EXISTS answers (
+    uid INTEGER PRIMARY KEY,
+    question_uid INTEGER NOT NULL,
+    user_uid INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS answers_question ON answers (question_uid, uid);
+CREATE INDEX IF NOT EXISTS answers_user ON answers (user_uid, uid);
+"""
+
+
+class ReadModelScoreMismatch(Exception):
+    pass
+
+
+class InvalidInclude(Exception):
+    pass
+
+
+class ReadModelNotEmpty(Exception):
+    pass
+
+
+def encode_amount(amount: int) -> str:
+    return f'{amount:0{AMOUNT_DIGITS}d}'
+
+
+def decode_amount(amount: str) -> int:
+    return int(amount)
+
+
+def serialize_data(data: str) -> dict:
+    """ Same preview as the SCORE payloads """
+    return {
+        'data': data[:DATA_PREVIEW_LENGTH],
+        'data_length': len(data),
+        'data_chunks': max(1, ceil(len(data) / BLOB_CHUNK_SIZE))
+    }
+
+
+class ReadModel(object):
+    """
+        SQLite read model of a SpeakyTo SCORE, built from its eventlogs.
+
+        The queries answer the same way as the readonly endpoints of the SCORE :
+         - the lists are sorted in creation order, and paginated by PAGE_SIZE
+         - a cancelled question stays in the questions and language pair lists,
+           and leaves the lists of its user
+         - a deleted question and its answers leave every list right away
+    """
+
+    _QUESTION_COLUMNS = 'uid, user_uid, answer_uid, state, data, from_language, to_language, reward, level, fanout_uid'
+    _ANSWER_COLUMNS = 'uid, user_uid, question_uid, data'
+
+    def __init__(self, path: str, score_address: str):
+        self._connection = sqlite3.connect(path)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(SCHEMA)
+        self._pending = {'users': [], 'questions': [], 'answers': []}
+
+        stored = self._meta('score_address')
+        if stored is None:
+            with self._connection:
+                self._set_meta('score_address', score_address)
+        elif stored != score_address:
+            raise ReadModelScoreMismatch(f'{path} indexes {stored}')
+        self.score_address = score_address
+
+    def close(self) -> None:
+        self._connection.close()
+
+    # ================================================
+    #  Private Methods
+    # ================================================
+    def _meta(self, key: str):
+        row = self._connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def _flush(self) -> None:
+        """ Writes the buffered rows : the creations are inserted in bulk,
+            until an update needs the rows to exist """
+        pending = self._pending
+        if pending['users']:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO users (uid, address, username, avatar_uid) VALUES (?, ?, ?, ?)',
+                pending['users'])
+        if pending['questions']:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO questions '
+                '(uid, user_uid, from_language, to_language, level, reward, fanout_uid, state, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                pending['questions'])
+        if pending['answers']:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO answers (uid, question_uid, user_uid, data) VALUES (?, ?, ?, ?)',
+                pending['answers'])
+        self._pending = {'users': [], 'questions': [], 'answers': []}
+
+    def _credit(self, user_uid: int, amount: int, block_height: int) -> None:
+        """ The claimable rewards loaded from a snapshot already contain the credits
+            up to the height the row was exported at. A user created again by a replayed
+            creation starts over from its events """
+        self._connection.execute('INSERT OR IGNORE INTO users (uid) VALUES (?)', (user_uid,))
+        row = self._connection.execute(
+            'SELECT claimable, claimable_height FROM users WHERE uid = ?', (user_uid,)).fetchone()
+        if block_height <= row['claimable_height']:
+            return
+        self._connection.execute('UPDATE users SET claimable = ? WHERE uid = ?',
+                                 (encode_amount(decode_amount(row['claimable']) + amount), user_uid))
+
+    def _apply(self, event: Event, block_height: int) -> None:
+        name = event.name
+
+        # Creations
+        if name == 'UserAccountCreatedEvent':
+            self._pending['users'].append((event['uid'], event['address'], event['username'], event['avatar_uid']))
+            return
+        if name == 'QuestionCreatedEvent':
+            from_language, to_language = event['language_pair'].split('-')
+            self._pending['questions'].append((
+                event['uid'], event['user_uid'], from_language, to_language, event['level'],
+                encode_amount(event['reward']), event['fanout_uid'], QuestionState.OPENED, event['data']))
+            return
+        if name == 'AnswerCreatedEvent':
+            self._pending['answers'].append((event['uid'], event['question_uid'], event['user_uid'], event['data']))
+            return
+
+        # Updates
+        self._flush()
+        execute = self._connection.execute
+
+        if name == 'QuestionCancelledEvent':
+            execute('UPDATE questions SET state = ? WHERE uid = ?', (QuestionState.CANCELLED, event['uid']))
+            self._credit(event['user_uid'], event['refund'], block_height)
+
+        elif name == 'QuestionDeletedEvent':
+            execute('DELETE FROM answers WHERE question_uid = ?', (event['uid'],))
+            execute('DELETE FROM questions WHERE uid = ?', (event['uid'],))
+            self._credit(event['user_uid'], event['refund'], block_height)
+
+        elif name == 'AnswerSelectedEvent':
+            execute('UPDATE questions SET state = ?, answer_uid = ? WHERE uid = ?',
+                    (QuestionState.ANSWERED, event['uid'], event['question_uid']))
+            self._credit(event['user_uid'], event['reward'], block_height)
+
+        elif name == 'UserAccountUpdatedEvent':
+            execute('UPDATE users SET username = ?, avatar_uid = ? WHERE uid = ?',
+                    (event['username'], event['avatar_uid'], event['uid']))
+
+        elif name == 'ExperienceChangedEvent':
+            execute('INSERT OR IGNORE INTO users (uid) VALUES (?)', (event['user_uid'],))
+            execute('UPDATE users SET experience = ?, level = ? WHERE uid = ?',
+                    (event['experience'], event['level'], event['user_uid']))
+
+        elif name == 'RewardClaimedEvent':
+            self._credit(event['user_uid'], -event['amount'], block_height)
+
+    @staticmethod
+    def _parse_includes(include: str) -> list:
+        includes = [name.strip() for name in include.split(',') if name.strip()]
+        for name in includes:
+            if name not in QUESTION_INCLUDES:
+                raise InvalidInclude(name)
+        return includes
+
+    @staticmethod
+    def _serialize_question(row: sqlite3.Row) -> dict:
+        return {
+            'uid': row['uid'],
+            'user_uid': row['user_uid'],
+            'answer_uid': row['answer_uid'],
+            'state': QUESTION_STATE_NAMES[row['state']],
+            **serialize_data(row['data']),
+            'from_language': row['from_language'],
+            'to_language': row['to_language'],
+            'reward': decode_amount(row['reward']),
+            'level': row['level'],
+            'fanout_uid': row['fanout_uid']
+        }
+
+    @staticmethod
+    def _serialize_answer(row: sqlite3.Row) -> dict:
+        return {
+            'uid': row['uid'],
+            'user_uid': row['user_uid'],
+            'question_uid': row['question_uid'],
+            **serialize_data(row['data'])
+        }
+
+    @staticmethod
+    def _serialize_user(row: sqlite3.Row) -> dict:
+        return {
+            'uid': row['uid'],
+            'address': row['address'],
+            'avatar_uid': row['avatar_uid'],
+            'username': row['username'],
+        }
+
+    def _user_row(self, user_uid: int):
+        return self._connection.execute(
+            'SELECT * FROM users WHERE uid = ?', (user_uid,)).fetchone()
+
+    def _select_questions(self, where: str, params: tuple, offset: int, include: str = '',
+                          order: str = 'uid') -> list:
+        includes = self._parse_includes(include)
+        rows = self._connection.execute(
+            f'SELECT {self._QUESTION_COLUMNS} FROM questions WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?',
+            params + (PAGE_SIZE, offset)).fetchall()
+
+        authors = {}
+        result = []
+        for row in rows:
+            serialized = self._serialize_question(row)
+
+            if 'author' in includes:
+                user_uid = row['user_uid']
+                if user_uid not in authors:
+                    authors[user_uid] = {**self.get_user_account(user_uid), 'level': self.get_user_level(user_uid)}
+                serialized['author'] = authors[user_uid]
+
+            if 'selected_answer' in includes:
+                answer_uid = row['answer_uid']
+                serialized['selected_answer'] = self.get_answer(answer_uid) if answer_uid else None
+
+            if 'answer_count' in includes:
+                serialized['answer_count'] = self._connection.execute(
+                    'SELECT COUNT(*) FROM answers WHERE question_uid = ?', (row['uid'],)).fetchone()[0]
+
+            result.append(serialized)
+        return result
+
+    # ================================================
+    #  Public Methods
+    # ================================================
+    def checkpoint(self) -> int:
+        """ Returns the height of the last indexed block, -1 if none """
+        height = self._meta('block_height')
+        return int(height) if height is not None else -1
+
+    def apply_blocks(self, blocks: list) -> None:
+        """ Applies the events of a batch of (height, events) blocks, and moves the checkpoint
+            after the last one. The batch is written in a single transaction """
+        if not blocks:
+            return
+        # Nothing is left buffered by a batch rolled back
+        self._pending = {'users': [], 'questions': [], 'answers': []}
+        with self._connection:
+            for block_height, events in blocks:
+                for event in events:
+                    self._apply(event, block_height)
+            self._flush()
+            self._set_meta('block_height', str(blocks[-1][0]))
+
+    def load_snapshot(self, users, questions, answers, block_height: int) -> None:
+        """ Bootstraps an empty read model from an export of the SCORE state (rows as dicts),
+            the indexing then resumes after `block_height`. The `block_height` of a user row
+            is the height it was exported at, `block_height` if missing """
+        if self.checkpoint() != -1:
+            raise ReadModelNotEmpty(self.score_address)
+
+        # The questions pending deletion and their answers are already out of the lists
+        deleting = set()
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO users (uid, address, username, avatar_uid, experience, level, claimable, '
+                'claimable_height) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                ((user['uid'], user['address'], user['username'], user['avatar_uid'], user['experience'],
+                  user['level'], encode_amount(user['claimable_rewards']), user.get('block_height', block_height))
+                 for user in users))
+
+            rows = []
+            for question in questions:
+                if question['state'] == QuestionState.DELETING:
+                    deleting.add(question['uid'])
+                    continue
+                rows.append((question['uid'], question['user_uid'], question['from_language'],
+                             question['to_language'], question['level'], encode_amount(question['reward']),
+                             question['fanout_uid'], question['state'], question['answer_uid'], question['data']))
+            self._connection.executemany(
+                'INSERT INTO questions '
+                '(uid, user_uid, from_language, to_language, level, reward, fanout_uid, state, answer_uid, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+            self._connection.executemany(
+                'INSERT INTO answers (uid, question_uid, user_uid, data) VALUES (?, ?, ?, ?)',
+                ((answer['uid'], answer['question_uid'], answer['user_uid'], answer['data'])
+                 for answer in answers if answer['question_uid'] not in deleting))
+
+            self._set_meta('block_height', str(block_height))
+
+    # ------ Q&A System ------
+    def get_question(self, question_uid: int):
+        row = self._connection.execute(
+            f'SELECT {self._QUESTION_COLUMNS} FROM questions WHERE uid = ?', (question_uid,)).fetchone()
+        return self._serialize_question(row) if row else None
+
+    def get_question_data(self, question_uid: int) -> str:
+        row = self._connection.execute('SELECT data FROM questions WHERE uid = ?', (question_uid,)).fetchone()
+        return row['data'] if row else None
+
+    def get_questions(self, offset: int, include: str = '') -> list:
+        return self._select_questions('1', (), offset, include)
+
+    def get_questions_by_uids(self, uids: list, include: str = '') -> list:
+        questions = {
+            question['uid']: question
+            for question in self._select_questions(
+                f'uid IN ({",".join("?" * len(uids))})', tuple(uids), 0, include)
+        }
+        return [questions.get(uid) for uid in uids]
+
+    def get_fanout_questions(self, question_uid: int) -> list:
+        question = self.get_question(question_uid)
+        if question is None or not question['fanout_uid']:
+            return [question] if question else []
+        return self._select_questions('fanout_uid = ?', (question['fanout_uid'],), 0)
+
+    def get_language_pair_questions(self, from_language: str, to_language: str, offset: int,
+                                    include: str = '') -> list:
+        return self._select_questions('from_language = ? AND to_language = ?',
+                                      (from_language, to_language), offset, include)
+
+    def find_questions(self,
+                       offset: int,
+                       from_language: str = None,
+                       to_language: str = None,
+                       state: str = None,
+                       user_uid: int = None,
+                       min_reward: int = None,
+                       sort_by_reward: bool = False,
+                       include: str = '') -> list:
+        """ Questions matching every given filter, which the SCORE can't answer.
+            `state` is a QuestionState name. The highest rewards come first if sort_by_reward """
+        conditions, params = [], []
+        if from_language is not None:
+            conditions.append('from_language = ?')
+            params.append(from_language)
+        if to_language is not None:
+            conditions.append('to_language = ?')
+            params.append(to_language)
+        if state is not None:
+            conditions.append('state = ?')
+            params.append(getattr(QuestionState, state))
+        if user_uid is not None:
+            conditions.append('user_uid = ?')
+            params.append(user_uid)
+        if min_reward is not None:
+            conditions.append('reward >= ?')
+            params.append(encode_amount(min_reward))
+
+        return self._select_questions(' AND '.join(conditions) or '1', tuple(params), offset, include,
+                                      'reward DESC, uid' if sort_by_reward else 'uid')
+
+    def get_answer(self, answer_uid: int):
+        row = self._connection.execute(
+            f'SELECT {self._ANSWER_COLUMNS} FROM answers WHERE uid = ?', (answer_uid,)).fetchone()
+        return self._serialize_answer(row) if row else None
+
+    def get_answer_data(self, answer_uid: int) -> str:
+        row = self._connection.execute('SELECT data FROM answers WHERE uid = ?', (answer_uid,)).fetchone()
+        return row['data'] if row else None
+
+    def get_answers(self, question_uid: int, offset: int) -> list:
+        rows = self._connection.execute(
+            f'SELECT {self._ANSWER_COLUMNS} FROM answers WHERE question_uid = ? ORDER BY uid LIMIT ? OFFSET ?',
+            (question_uid, PAGE_SIZE, offset)).fetchall()
+        return [self._serialize_answer(row) for row in rows]
+
+    def get_answers_by_uids(self, uids: list) -> list:
+        return [self.get_answer(uid) for uid in uids]
+
+    # ------ User System ------
+    def get_user_uid(self, user_address: str) -> int:
+        row = self._connection.execute('SELECT uid FROM users WHERE address = ?', (user_address,)).fetchone()
+        return row['uid'] if row else 0
+
+    def get_user_account(self, user_uid: int) -> dict:
+        row = self._user_row(user_uid)
+        if row is None:
+            return {'uid': user_uid, 'address': None, 'avatar_uid': 0, 'username': ''}
+        return self._serialize_user(row)
+
+    def get_user_accounts_by_uids(self, uids: list) -> list:
+        return [self.get_user_account(uid) for uid in uids]
+
+    def get_user_level(self, user_uid: int) -> int:
+        row = self._user_row(user_uid)
+        return row['level'] if row else 1
+
+    def get_user_levels(self, uids: list) -> list:
+        return [self.get_user_level(uid) for uid in uids]
+
+    def get_user_experience(self, user_uid: int) -> int:
+        row = self._user_row(user_uid)
+        return row['experience'] if row else 0
+
+    def get_claimable_rewards(self, user_uid: int) -> int:
+        row = self._user_row(user_uid)
+        return decode_amount(row['claimable']) if row else 0
+
+    def get_total_claimable_rewards(self) -> int:
+        return sum(decode_amount(row['claimable'])
+                   for row in self._connection.execute('SELECT claimable FROM users'))
+
+    def get_user_questions(self, user_uid: int, offset: int, include: str = '') -> list:
+        return self._select_questions('user_uid = ? AND state != ?',
+                                      (user_uid, QuestionState.CANCELLED), offset, include)
+
+    def get_user_profile(self, user_uid: int) -> dict:
+        """ The questions are sorted from the most recent """
+        counts = self._connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(state = ?), 0) FROM questions WHERE user_uid = ? AND state != ?',
+            (QuestionState.OPENED, user_uid, QuestionState.CANCELLED)).fetchone()
+        questions_count, opened_questions_count = counts[0], counts[1]
+
+        return {
+            'account': self.get_user_account(user_uid),
+            'experience': self.get_user_experience(user_uid),
+            'level': self.get_user_level(user_uid),
+            'questions_count': questions_count,
+            'opened_questions_count': opened_questions_count,
+            'answered_questions_count': questions_count - opened_questions_count,
+            'claimable_rewards': self.get_claimable_rewards(user_uid),
+            'questions': self._select_questions('user_uid = ? AND state != ?',
+                                                (user_uid, QuestionState.CANCELLED), 0, order='uid DESC')
+        }